@@ -71,6 +71,7 @@ def ai_chat(req: ChatRequest, background_tasks: BackgroundTasks):
         messages=msgs,
         system=enhanced_system,
         max_tokens=req.max_tokens,
+        feature="chat",
     )
     
     # 4. Diagnostic: Prepend a visible tag so the user (and I) can confirm it's working
@@ -1,15 +1,26 @@
 """
 Career API — personalized plan + skill gap detection.
 POST /career/plan
+POST /career/plan/async  → 202 + task id (see /tasks)
+GET  /career/plan/{plan_id}/weeks?start=5  → next page of weeks, generated on first request
 POST /career/skill-gap
 """
 import json
 import re
-from fastapi import APIRouter, HTTPException
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from fastapi import APIRouter, HTTPException, Query
 from app.utils import clean_json_str
-from pydantic import BaseModel
-from app.services.groq_service import json_completion
+from pydantic import BaseModel, Field
+from app.core.config import settings
+from app.core.local_db import get_local_db
+from app.core import metrics
+from app.services.groq_service import CircuitOpenError, json_completion
 from app.services.memory_service import retain_memory, recall_memories
+from app.services.task_service import submit_task, TaskAccepted
+from app.services import skill_taxonomy
 
 router = APIRouter(prefix="/career", tags=["career"])
 
@@ -18,7 +29,7 @@ class CareerPlanRequest(BaseModel):
     resume_text: str
     target_role: str
     quiz_scores: dict = {}     # { "domain": score }
-    timeline_weeks: int = 12
+    timeline_weeks: int = Field(12, ge=1, le=settings.career_plan_max_weeks)
 
 
 class WeekPlan(BaseModel):
@@ -35,6 +46,15 @@ class CareerPlanResponse(BaseModel):
     weekly_plan: list[WeekPlan]
     key_milestones: list[str]
     top_resources: list[str]
+    plan_id: str = ""
+    next_week: int | None = None     # first week not generated yet (fetch via /plan/{plan_id}/weeks)
+
+
+class PlanWeeksResponse(BaseModel):
+    plan_id: str
+    timeline_weeks: int
+    weeks: list[WeekPlan]
+    next_week: int | None = None     # where to continue; before `start` if earlier weeks still need generating
 
 
 class SkillGapRequest(BaseModel):
@@ -50,6 +70,8 @@ class SkillGapResponse(BaseModel):
     missing_skills: list[str]
     priority_skills: list[str]    # top 3 to learn first
     estimated_weeks: int
+    source: str = "taxonomy"      # taxonomy | llm (role was learned on this request)
+    taxonomy_version: str = ""
 
 
 @router.post("/plan", response_model=CareerPlanResponse)
@@ -77,25 +99,31 @@ Return JSON:
   "top_resources": ["<resource with URL>", "<resource 2>", "<resource 3>"]
 }}
 
-Include only first 4 weeks in weekly_plan for brevity.
+Include only the first {min(settings.career_plan_page_weeks, req.timeline_weeks)} weeks in weekly_plan; later weeks are generated on request.
 """
     try:
-        raw = json_completion(prompt, max_tokens=2000)
+        raw = json_completion(prompt, max_tokens=2000, feature="career")
         clean = clean_json_str(raw)
         data = json.loads(clean)
+        weeks = [WeekPlan(**w) for w in data.get("weekly_plan", [])]
+        weeks = [w for w in weeks if 1 <= w.week <= req.timeline_weeks]
+        plan_id = _save_plan(req, data.get("key_milestones", []), weeks)
         res = CareerPlanResponse(
             target_role=req.target_role,
             timeline_weeks=req.timeline_weeks,
-            weekly_plan=[WeekPlan(**w) for w in data.get("weekly_plan", [])],
+            weekly_plan=weeks,
             readiness_score=data.get("readiness_score", 50),
             key_milestones=data.get("key_milestones", []),
             top_resources=data.get("top_resources", []),
+            plan_id=plan_id,
+            next_week=_next_week(plan_id, req.timeline_weeks),
         )
         # Hindsight: Retain plan
         retain_memory(f"Created a {req.timeline_weeks}-week career plan for {req.target_role}.")
         return res
     except Exception as e:
         # Fallback static data
+        metrics.record_fallback("career")
         return CareerPlanResponse(
             target_role=req.target_role or "Software Engineer",
             readiness_score=45,
@@ -113,27 +141,168 @@ Include only first 4 weeks in weekly_plan for brevity.
         )
 
 
-@router.post("/skill-gap", response_model=SkillGapResponse)
-def skill_gap(req: SkillGapRequest):
+@router.post("/plan/async", response_model=TaskAccepted, status_code=202)
+def career_plan_async(req: CareerPlanRequest):
+    return submit_task("career_plan", req.model_dump(), lambda report: career_plan(req))
+
+
+# ── Paginated weeks ─────────────────────────────────────────────────────────
+# A plan is stored once with the context needed to continue it; each week is
+# stored as it is generated, so a later page is conditioned on the earlier
+# weeks and no week is ever generated twice.
+
+_plan_locks: dict[str, list] = {}      # plan_id -> [lock, holders + waiters]
+_plan_locks_guard = threading.Lock()
+
+
+@contextmanager
+def _plan_lock(plan_id: str):
+    """Per-plan lock, dropped from the table once nobody holds or waits for it."""
+    with _plan_locks_guard:
+        entry = _plan_locks.setdefault(plan_id, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _plan_locks_guard:
+            entry[1] -= 1
+            if not entry[1]:
+                del _plan_locks[plan_id]
+
+
+def _save_plan(req: CareerPlanRequest, milestones: list[str], weeks: list[WeekPlan]) -> str:
+    plan_id = uuid.uuid4().hex
+    now = time.time()
+    context = {"resume_text": req.resume_text[:1500], "quiz_scores": req.quiz_scores, "key_milestones": milestones}
+    conn = get_local_db()
+    conn.execute(
+        "INSERT INTO career_plans (id, target_role, timeline_weeks, context_json, created_at) VALUES (?, ?, ?, ?, ?)",
+        (plan_id, req.target_role, req.timeline_weeks, json.dumps(context), now),
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO career_plan_weeks (plan_id, week, week_json) VALUES (?, ?, ?)",
+        [(plan_id, w.week, w.model_dump_json()) for w in weeks],
+    )
+    expired = now - settings.career_plan_ttl_days * 86400
+    conn.execute(
+        "DELETE FROM career_plan_weeks WHERE plan_id IN (SELECT id FROM career_plans WHERE created_at < ?)",
+        (expired,),
+    )
+    conn.execute("DELETE FROM career_plans WHERE created_at < ?", (expired,))
+    conn.commit()
+    return plan_id
+
+
+def _stored_weeks(plan_id: str) -> dict[int, WeekPlan]:
+    rows = get_local_db().execute(
+        "SELECT week_json FROM career_plan_weeks WHERE plan_id = ? ORDER BY week", (plan_id,)
+    ).fetchall()
+    weeks = [WeekPlan(**json.loads(r["week_json"])) for r in rows]
+    return {w.week: w for w in weeks}
+
+
+def _next_week(plan_id: str, timeline_weeks: int) -> int | None:
+    stored = _stored_weeks(plan_id)
+    return next((n for n in range(1, timeline_weeks + 1) if n not in stored), None)
+
+
+def _generate_weeks(plan: dict, earlier: list[WeekPlan], start: int, end: int) -> list[WeekPlan]:
+    """Generate weeks start..end, continuing from the weeks already in the plan."""
+    context = json.loads(plan["context_json"])
+    history = "\n".join(f"Week {w.week}: {w.focus}" for w in earlier) or "(none yet)"
     prompt = f"""
-Perform a skill gap analysis.
-Target Role: {req.target_role}
-Current Skills: {json.dumps(req.current_skills)}
+Continue a {plan["timeline_weeks"]}-week personalized career roadmap.
+Target Role: {plan["target_role"]}
+Resume Summary: {context["resume_text"]}
+Quiz Scores: {json.dumps(context["quiz_scores"])}
+Milestones: {json.dumps(context["key_milestones"])}
+
+Weeks so far:
+{history}
 
+Plan weeks {start} to {end} only. Build on the weeks so far without repeating their focus.
 Return JSON:
 {{
-  "match_percentage": <0-100>,
-  "required_skills": ["<skill 1>", ...],
-  "present_skills": ["<matched skill>", ...],
-  "missing_skills": ["<missing skill>", ...],
-  "priority_skills": ["<top 1>", "<top 2>", "<top 3>"],
-  "estimated_weeks": <integer weeks to close gap>
+  "weekly_plan": [
+    {{
+      "week": {start},
+      "focus": "<topic focus>",
+      "tasks": ["<task 1>", "<task 2>"],
+      "resources": ["<resource 1>"]
+    }}
+  ]
 }}
 """
+    raw = json_completion(prompt, max_tokens=450 * (end - start + 1) + 200, feature="career")
+    data = json.loads(clean_json_str(raw))
+    weeks = [WeekPlan(**w) for w in data.get("weekly_plan", [])]
+    return [w for w in weeks if start <= w.week <= end]
+
+
+@router.get("/plan/{plan_id}/weeks", response_model=PlanWeeksResponse)
+def plan_weeks(plan_id: str, start: int = Query(1, ge=1), count: int | None = Query(None, ge=1)):
+    count = min(count or settings.career_plan_page_weeks, settings.career_plan_page_weeks)
+    plan = get_local_db().execute("SELECT * FROM career_plans WHERE id = ?", (plan_id,)).fetchone()
+    if not plan or plan["created_at"] < time.time() - settings.career_plan_ttl_days * 86400:
+        raise HTTPException(status_code=404, detail="Plan not found or expired")
+    total = plan["timeline_weeks"]
+    if start > total:
+        raise HTTPException(status_code=400, detail=f"Plan only has {total} weeks")
+    end = min(start + count - 1, total)
+
+    # One generator per plan at a time: concurrent requests for the same page
+    # wait and then read the stored weeks instead of generating them again.
+    with _plan_lock(plan_id):
+        stored = _stored_weeks(plan_id)
+        missing = [n for n in range(1, end + 1) if n not in stored]
+        pages = 0
+        try:
+            # Fill any gap before `start` first so every page is conditioned on the weeks before it,
+            # but only a few pages per request; the client continues from next_week
+            while missing and pages < settings.career_plan_max_pages:
+                pages += 1
+                page_start = missing[0]
+                page_end = min(page_start + settings.career_plan_page_weeks - 1, end)
+                earlier = [stored[n] for n in sorted(stored) if n < page_start]
+                generated = _generate_weeks(plan, earlier, page_start, page_end)
+                if not generated:
+                    raise ValueError(f"no weeks returned for {page_start}-{page_end}")
+                conn = get_local_db()
+                conn.executemany(
+                    "INSERT OR IGNORE INTO career_plan_weeks (plan_id, week, week_json) VALUES (?, ?, ?)",
+                    [(plan_id, w.week, w.model_dump_json()) for w in generated],
+                )
+                conn.commit()
+                stored.update({w.week: w for w in generated})
+                # Weeks the model skipped are left out rather than retried forever
+                missing = [n for n in missing if n > page_end]
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to generate weeks: {e}")
+
+    return PlanWeeksResponse(
+        plan_id=plan_id,
+        timeline_weeks=total,
+        weeks=[stored[n] for n in range(start, end + 1) if n in stored],
+        next_week=missing[0] if missing else end + 1 if end < total else None,
+    )
+
+
+@router.post("/skill-gap", response_model=SkillGapResponse)
+def skill_gap(req: SkillGapRequest):
+    # Set arithmetic against the local taxonomy index — the LLM is asked only once per unknown role
     try:
-        raw = json_completion(prompt, max_tokens=800)
-        clean = clean_json_str(raw)
-        data = json.loads(clean)
-        return SkillGapResponse(target_role=req.target_role, **data)
+        required, source = skill_taxonomy.resolve_role_skills(req.target_role)
+    except CircuitOpenError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to parse gap: {e}")
+    gap = skill_taxonomy.compare_skills(req.current_skills, required)
+    return SkillGapResponse(
+        target_role=req.target_role,
+        source=source,
+        taxonomy_version=skill_taxonomy.taxonomy_version(),
+        **gap,
+    )
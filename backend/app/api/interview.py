@@ -1,14 +1,25 @@
 """
 Interview API — question generation + answer scoring.
 POST /interview/question
+POST /interview/questions  → batch prefetch
 POST /interview/score
+POST /interview/score-session  → score all answers of a mock interview at once
+WS   /interview/ws             → full mock interview over one connection
 """
+import asyncio
 import json
 import re
-from fastapi import APIRouter, HTTPException
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel
-from app.services.groq_service import json_completion, chat_completion
-from app.utils import clean_json_str
+from app.core.config import settings
+from app.core.security import get_known_client_id, get_user_id
+from app.core import metrics
+from app.services import question_cache
+from app.services.groq_service import CircuitOpenError, json_completion, chat_completion, stream_completion
+from app.utils import clean_json_str, aiter_in_thread
 from app.services.memory_service import retain_memory
 
 router = APIRouter(prefix="/interview", tags=["interview"])
@@ -18,6 +29,11 @@ class QuestionRequest(BaseModel):
     role: str
     mode: str = "behavioral"  # "behavioral" | "technical"
     difficulty: str = "medium"
+    session_id: str = ""      # optional override for the seen-question scope (defaults to the client id)
+
+
+class BatchQuestionRequest(QuestionRequest):
+    count: int = 5
 
 
 class QuestionResponse(BaseModel):
@@ -41,36 +57,127 @@ class ScoreResponse(BaseModel):
     model_answer_hint: str
 
 
-@router.post("/question", response_model=QuestionResponse)
-def generate_question(req: QuestionRequest):
+class SessionScoreRequest(BaseModel):
+    role: str = ""
+    answers: list[ScoreRequest]
+
+
+class SessionScoreResponse(BaseModel):
+    role: str
+    average_score: int
+    grade: str
+    scores: list[ScoreResponse]     # same order as the submitted answers
+    failed_indexes: list[int] = []  # answers that could not be scored (excluded from the average)
+    top_strengths: list[str]
+    top_improvements: list[str]
+    summary: str
+
+
+_UNSCORED = ScoreResponse(
+    score=0,
+    grade="N/A",
+    strengths=[],
+    improvements=["This answer could not be scored. Please retry."],
+    star_feedback="",
+    model_answer_hint="",
+)
+
+
+def _generate_questions(req: QuestionRequest, count: int) -> list[QuestionResponse]:
+    """Generate `count` questions in one LLM call; invalid items are dropped individually."""
     prompt = f"""
-Generate 1 interview question for the following role and mode.
+Generate {count} distinct interview questions for the following role and mode.
 Role: {req.role}
 Mode: {req.mode} (behavioral, technical, or situational)
 Difficulty: {req.difficulty}
 
 Target Indian tech industry standards (top startups and FAANG).
+Each question must test a different skill or scenario.
 
 CRITICAL: DO NOT USE ANY EMOJIS IN ANY FIELD.
 
 Return JSON:
 {{
-  "question": "<the question text>",
-  "tips": ["<tip 1>", "<tip 2>", "<tip 3>"],
-  "follow_ups": ["<follow-up question 1>", "<follow-up question 2>"]
+  "questions": [
+    {{
+      "question": "<the question text>",
+      "tips": ["<tip 1>", "<tip 2>", "<tip 3>"],
+      "follow_ups": ["<follow-up question 1>", "<follow-up question 2>"]
+    }}
+  ]
 }}
 """
-    raw = json_completion(prompt, max_tokens=600)
+    raw = json_completion(prompt, max_tokens=min(350 * count + 200, 4000), feature="interview")
+    data = json.loads(clean_json_str(raw))
+    items = data.get("questions", [data]) if isinstance(data, dict) else data
+    questions = []
+    for item in items:
+        try:
+            questions.append(QuestionResponse(**item))
+        except Exception:
+            continue
+    return questions
+
+
+def _refill(req: QuestionRequest, key: tuple):
     try:
-        clean = clean_json_str(raw)
-        data = json.loads(clean)
-        return QuestionResponse(**data)
+        question_cache.add_questions(
+            key, [q.model_dump() for q in _generate_questions(req, settings.interview_batch_size)]
+        )
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to parse: {e}")
+        print(f"Interview question refill failed for {key}: {e}")
+    finally:
+        question_cache.finish_refill(key)
 
 
-@router.post("/score", response_model=ScoreResponse)
-def score_answer(req: ScoreRequest):
+def _serve_questions(req: QuestionRequest, count: int, viewer: str | None,
+                     background_tasks: BackgroundTasks) -> list[QuestionResponse]:
+    """
+    Serve `count` unseen questions for this viewer from the (role, mode, difficulty)
+    pool. Only the missing questions are generated synchronously (cold pool); the
+    pool is topped up in the background so the next request needs no LLM wait.
+    A viewer of None (no stable identity) can't have seen questions tracked, so it
+    always gets freshly generated ones rather than the same pool head every time.
+    """
+    key = question_cache.pool_key(req.role, req.mode, req.difficulty)
+    picked = question_cache.take_unseen(key, viewer, count) if viewer else []
+    if len(picked) < count:
+        try:
+            fresh = [q.model_dump() for q in _generate_questions(req, count - len(picked))]
+        except Exception as e:
+            if not picked:
+                if isinstance(e, CircuitOpenError):
+                    raise
+                raise HTTPException(status_code=500, detail=f"Failed to parse: {e}")
+            fresh = []
+        question_cache.add_questions(key, fresh)
+        if viewer:
+            picked += question_cache.take_unseen(key, viewer, count - len(picked))
+        else:
+            picked = fresh[:count]
+    if not picked:
+        raise HTTPException(status_code=500, detail="Failed to parse: no valid questions returned")
+
+    if viewer and question_cache.unseen_count(key, viewer) < settings.interview_refill_threshold \
+            and question_cache.start_refill(key):
+        background_tasks.add_task(_refill, req, key)
+    return [QuestionResponse(**q) for q in picked]
+
+
+@router.post("/question", response_model=QuestionResponse)
+def generate_question(req: QuestionRequest, request: Request, background_tasks: BackgroundTasks):
+    viewer = req.session_id or get_known_client_id(request)
+    return _serve_questions(req, 1, viewer, background_tasks)[0]
+
+
+@router.post("/questions", response_model=list[QuestionResponse])
+def generate_questions(req: BatchQuestionRequest, request: Request, background_tasks: BackgroundTasks):
+    """Batch mode: prefetch several questions for a mock interview in one go."""
+    viewer = req.session_id or get_known_client_id(request)
+    return _serve_questions(req, min(max(req.count, 1), 10), viewer, background_tasks)
+
+
+def _score(req: ScoreRequest) -> ScoreResponse:
     prompt = f"""
 Score the user's interview answer based on the question and mode.
 Question: {req.question}
@@ -89,15 +196,260 @@ Return JSON:
   "model_answer_hint": "<brief hint of a great answer>"
 }}
 """
-    raw = json_completion(prompt, max_tokens=800)
+    raw = json_completion(prompt, max_tokens=800, feature="interview")
     try:
         clean = clean_json_str(raw)
         data = json.loads(clean)
-        
-        # Hindsight: Retain the score
-        score_res = ScoreResponse(**data)
-        retain_memory(f"Interview session for role '{req.mode}' (evaluating '{req.question}'): Scored {score_res.score}% ({score_res.grade}). Improvements recommended: {', '.join(score_res.improvements[:3])}")
-        
-        return score_res
+        return ScoreResponse(**data)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to parse: {e}")
+
+
+@router.post("/score", response_model=ScoreResponse)
+def score_answer(req: ScoreRequest):
+    score_res = _score(req)
+    # Hindsight: Retain the score
+    retain_memory(f"Interview session for role '{req.mode}' (evaluating '{req.question}'): Scored {score_res.score}% ({score_res.grade}). Improvements recommended: {', '.join(score_res.improvements[:3])}")
+    return score_res
+
+
+def _top(items: list[str], n: int = 3) -> list[str]:
+    """Most frequently mentioned items across answers, first mention wins ties."""
+    counts = Counter(i.strip() for i in items if i.strip())
+    return [item for item, _ in counts.most_common(n)]
+
+
+def summarize_session(role: str, scores: list[ScoreResponse], failed: list[int]) -> SessionScoreResponse:
+    """Aggregate per-answer scores into a session summary without another LLM call."""
+    scored = [s for i, s in enumerate(scores) if i not in failed]
+    average = round(sum(s.score for s in scored) / len(scored)) if scored else 0
+    grade = "A" if average >= 85 else "B" if average >= 70 else "C" if average >= 50 else "D"
+    strongest = max(range(len(scores)), key=lambda i: scores[i].score if i not in failed else -1, default=None)
+    weakest = min(range(len(scores)), key=lambda i: scores[i].score if i not in failed else 101, default=None)
+    summary = f"Scored {average}% ({grade}) across {len(scored)} answer(s)"
+    if len(scored) > 1 and scores[strongest].score != scores[weakest].score:
+        summary += f"; strongest answer was Q{strongest + 1} ({scores[strongest].score}%), weakest was Q{weakest + 1} ({scores[weakest].score}%)"
+    if failed:
+        summary += f"; {len(failed)} answer(s) could not be scored"
+    return SessionScoreResponse(
+        role=role,
+        average_score=average,
+        grade=grade,
+        scores=scores,
+        failed_indexes=failed,
+        top_strengths=_top([x for s in scored for x in s.strengths]),
+        top_improvements=_top([x for s in scored for x in s.improvements]),
+        summary=summary + ".",
+    )
+
+
+def retain_session(summary: SessionScoreResponse, mode: str):
+    # Hindsight: one consolidated record per session instead of one per answer
+    retain_memory(f"Mock interview session for role '{summary.role or mode}' ({len(summary.scores)} answers, {mode}): Average {summary.average_score}% ({summary.grade}). Improvements recommended: {', '.join(summary.top_improvements)}")
+
+
+@router.post("/score-session", response_model=SessionScoreResponse)
+def score_session(req: SessionScoreRequest):
+    """Score every answer of a mock interview concurrently and summarize the session."""
+    if not req.answers:
+        raise HTTPException(status_code=400, detail="No answers to score")
+
+    def score_one(item: ScoreRequest) -> ScoreResponse | None:
+        try:
+            return _score(item)
+        except Exception as e:
+            print(f"Interview session scoring failed for '{item.question[:60]}': {e}")
+            metrics.record_fallback("interview")
+            return None
+
+    workers = max(min(settings.interview_score_concurrency, len(req.answers)), 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(score_one, req.answers))
+
+    failed = [i for i, r in enumerate(results) if r is None]
+    if len(failed) == len(results):
+        raise HTTPException(status_code=500, detail="Failed to score any answer")
+    scores = [r or _UNSCORED for r in results]
+
+    summary = summarize_session(req.role, scores, failed)
+    retain_session(summary, req.answers[0].mode)
+    return summary
+
+
+# ── WebSocket mock interview ─────────────────────────
+#
+# Client → server:
+#   {"type": "start", "role": "...", "mode": "behavioral", "difficulty": "medium", "count": 5}
+#   {"type": "answer", "answer": "..."}
+#   {"type": "end"}                      (optional: finish early)
+# Server → client:
+#   {"type": "question", "index": i, "total": n, "question": ..., "tips": [...], "follow_ups": [...]}
+#   {"type": "feedback_delta", "index": i, "text": "..."}   (streamed while scoring runs)
+#   {"type": "score", "index": i, ...ScoreResponse}
+#   {"type": "summary", ...SessionScoreResponse}
+#   {"type": "error", "detail": "..."}
+
+_background: set[asyncio.Task] = set()     # strong refs so refill tasks aren't GC'd mid-run
+
+
+class InterviewSession:
+    """Server-held state for one WebSocket mock interview."""
+
+    def __init__(self, req: QuestionRequest, total: int, viewer: str):
+        self.req = req
+        self.total = total
+        self.viewer = viewer
+        self.questions: list[QuestionResponse] = []
+        self.scores: list[ScoreResponse] = []
+        self.failed: list[int] = []
+        self._next: asyncio.Task | None = None
+
+    def prefetch(self):
+        """Start generating the next question while the user answers the current one."""
+        if self._next is None and len(self.questions) < self.total:
+            self._next = asyncio.create_task(self._fetch())
+
+    async def _fetch(self) -> QuestionResponse:
+        background_tasks = BackgroundTasks()
+        question = (await asyncio.to_thread(_serve_questions, self.req, 1, self.viewer, background_tasks))[0]
+        task = asyncio.create_task(background_tasks())
+        _background.add(task)
+        task.add_done_callback(_background.discard)
+        return question
+
+    async def next_question(self) -> QuestionResponse:
+        task, self._next = self._next or asyncio.create_task(self._fetch()), None
+        question = await task
+        self.questions.append(question)
+        return question
+
+    def cancel(self):
+        if self._next:
+            self._next.cancel()
+
+
+def _feedback_stream(question: str, answer: str, mode: str):
+    return stream_completion(
+        messages=[{"role": "user", "content": f"""
+Interview question ({mode}): {question}
+Candidate's answer: {answer}
+
+Give 2-3 sentences of immediate, spoken-style coaching on this answer.
+CRITICAL: DO NOT USE ANY EMOJIS.
+"""}],
+        system="You are a supportive but honest interview coach for Indian tech candidates.",
+        max_tokens=200,
+        feature="interview",
+    )
+
+
+async def _score_turn(ws: WebSocket, session: InterviewSession, answer: str):
+    index = len(session.scores)
+    question = session.questions[index].question
+    score_task = asyncio.create_task(
+        asyncio.to_thread(_score, ScoreRequest(question=question, answer=answer, mode=session.req.mode))
+    )
+    try:
+        async for text in aiter_in_thread(_feedback_stream(question, answer, session.req.mode)):
+            await ws.send_json({"type": "feedback_delta", "index": index, "text": text})
+    except Exception as e:
+        print(f"Interview feedback stream failed: {e}")
+
+    try:
+        score = await score_task
+    except Exception as e:
+        print(f"Interview scoring failed: {e}")
+        metrics.record_fallback("interview")
+        session.failed.append(index)
+        score = _UNSCORED
+    session.scores.append(score)
+    await ws.send_json({"type": "score", "index": index, **score.model_dump()})
+
+
+async def _finish(ws: WebSocket, session: InterviewSession):
+    if session.scores and len(session.failed) < len(session.scores):
+        summary = summarize_session(session.req.role, session.scores, session.failed)
+        await asyncio.to_thread(retain_session, summary, session.req.mode)
+        await ws.send_json({"type": "summary", **summary.model_dump()})
+    await ws.close()
+
+
+class _BadMessage(Exception):
+    pass
+
+
+async def _receive(ws: WebSocket) -> dict:
+    """Next client message as a JSON object; _BadMessage for non-JSON or non-object frames."""
+    try:
+        msg = await ws.receive_json()
+    except (ValueError, TypeError, KeyError):
+        raise _BadMessage("Messages must be JSON objects")
+    if not isinstance(msg, dict):
+        raise _BadMessage("Messages must be JSON objects")
+    return msg
+
+
+def _start_request(start: dict) -> tuple[QuestionRequest, int]:
+    if start.get("type") != "start" or not isinstance(start.get("role"), str) or not start["role"].strip():
+        raise _BadMessage("First message must be {type: start, role: ...}")
+    try:
+        count = int(start.get("count", 5))
+        req = QuestionRequest(
+            role=start["role"],
+            mode=start.get("mode", "behavioral"),
+            difficulty=start.get("difficulty", "medium"),
+        )
+    except (ValueError, TypeError):
+        raise _BadMessage("Invalid start message: count must be an integer, mode/difficulty strings")
+    return req, min(max(count, 1), 10)
+
+
+@router.websocket("/ws")
+async def interview_ws(ws: WebSocket):
+    await ws.accept()
+    session: InterviewSession | None = None
+    try:
+        req, count = _start_request(await _receive(ws))
+        user = get_user_id(ws)
+        viewer = user if user != "anonymous" else f"ws:{uuid.uuid4().hex}"
+        session = InterviewSession(req, count, viewer)
+
+        while len(session.scores) < session.total:
+            question = await session.next_question()
+            session.prefetch()
+            await ws.send_json({
+                "type": "question",
+                "index": len(session.questions) - 1,
+                "total": session.total,
+                **question.model_dump(),
+            })
+
+            msg = await _receive(ws)
+            if msg.get("type") == "end":
+                break
+            if msg.get("type") != "answer":
+                await ws.send_json({"type": "error", "detail": "Expected {type: answer, answer: ...}"})
+                break
+            await _score_turn(ws, session, str(msg.get("answer", "")))
+
+        session.cancel()
+        await _finish(ws, session)
+    except WebSocketDisconnect:
+        pass
+    except _BadMessage as e:
+        await ws.send_json({"type": "error", "detail": str(e)})
+        await ws.close()
+    except HTTPException as e:
+        await ws.send_json({"type": "error", "detail": e.detail})
+        await ws.close()
+    except CircuitOpenError as e:
+        # App exception handlers don't cover WebSockets, so mirror the HTTP 503 here
+        await ws.send_json({
+            "type": "error",
+            "detail": "AI service temporarily unavailable, please retry shortly",
+            "retry_after": int(e.retry_after),
+        })
+        await ws.close(code=1013)   # Try Again Later
+    finally:
+        if session:
+            session.cancel()
@@ -1,16 +1,20 @@
 """
 Jobs API — curated job listings + market trends.
-GET /jobs/list
-GET /jobs/trends
+GET  /jobs/list    → synced local listings (filters + pagination), else live Adzuna, else AI
+GET  /jobs/trends
+POST /jobs/sync    → run the listing sync now (X-Admin-Token)
 """
+import asyncio
 import json
 import re
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from app.utils import clean_json_str
 from app.services.memory_service import retain_memory, recall_memories
 from app.services.groq_service import json_completion
-import httpx
+from app.services import adzuna_service, job_listings
+from app.core.security import require_admin
+from app.core import metrics
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
@@ -29,6 +33,8 @@ class Job(BaseModel):
 class JobsResponse(BaseModel):
     jobs: list[Job]
     total: int
+    page: int = 1
+    source: str = ""     # local | adzuna | ai
 
 
 class TrendsResponse(BaseModel):
@@ -39,53 +45,37 @@ class TrendsResponse(BaseModel):
 
 
 @router.get("/list", response_model=JobsResponse)
-async def list_jobs(role: str = "", location: str = "India"):
+async def list_jobs(
+    role: str = "",
+    location: str = "India",
+    page: int = Query(1, ge=1),
+    page_size: int = Query(6, ge=1, le=50),
+    skills: str = "",                 # comma-separated, all required (local listings only)
+    min_salary: float | None = None,  # local listings only
+    type: str = "",                   # "Full Time" | "Remote" (local listings only)
+    experience: str = Query("", pattern="^(|entry|mid|senior)$"),   # level (local listings only)
+    max_years: int | None = Query(None, ge=0, le=50),               # required years at most (local listings only)
+):
     """
-    Returns REAL job listings from Adzuna API with an AI fallback.
+    Returns REAL job listings: the synced local store first (filters +
+    pagination), then Adzuna live (cached, stale-while-revalidate), with an AI
+    fallback when nothing is cached and Adzuna can't be reached.
     """
-    from app.core.config import settings
-    
-    app_id = settings.adzuna_app_id
-    app_key = settings.adzuna_app_key
-    
-    if app_id and app_key:
-        try:
-            # Adzuna API Search (India = 'in')
-            url = f"https://api.adzuna.com/v1/api/jobs/in/search/1"
-            params = {
-                "app_id": app_id,
-                "app_key": app_key,
-                "results_per_page": 6,
-                "what": role or "software engineer",
-                "content-type": "application/json"
-            }
-            if location and location.lower() != "india":
-                params["where"] = location
-
-            async with httpx.AsyncClient() as client:
-                res = await client.get(url, params=params, timeout=10.0)
-                res.raise_for_status()
-                data = res.json()
-                
-                results = data.get("results", [])
-                jobs = []
-                for r in results:
-                    jobs.append(Job(
-                        title=r.get("title", "Untitled Role").replace("<strong>", "").replace("</strong>", ""),
-                        company=r.get("company", {}).get("display_name", "Unknown Company"),
-                        location=r.get("location", {}).get("display_name", "Remote / India"),
-                        salary=f"₹{r.get('salary_min', 'N/A')} - {r.get('salary_max', '')}",
-                        experience="Verified listing",
-                        skills=[c.get("label", "") for c in r.get("category", {}).get("tag", []) if c][:3],
-                        type="Remote" if "remote" in r.get("title", "").lower() else "Full Time",
-                        url=r.get("redirect_url", "")
-                    ))
-                if jobs:
-                    # Hindsight: Retain Search
-                    retain_memory(f"User searched for jobs: {role} in {location}. Found {len(jobs)} results.")
-                    return JobsResponse(jobs=jobs, total=len(jobs))
-        except Exception:
-            pass
+    skill_list = [s.strip() for s in skills.split(",") if s.strip()]
+    local, total = await asyncio.to_thread(
+        job_listings.search, role, location, skill_list, min_salary, type, page, page_size, experience, max_years
+    )
+    if local:
+        retain_memory(f"User searched for jobs: {role} in {location}. Found {total} results.")
+        return JobsResponse(jobs=[Job(**j) for j in local], total=total, page=page, source="local")
+
+    found = await adzuna_service.search(role, location, page)
+    if found:
+        jobs = [Job(**j) for j in found[0]]
+        if jobs:
+            # Hindsight: Retain Search
+            retain_memory(f"User searched for jobs: {role} in {location}. Found {len(jobs)} results.")
+            return JobsResponse(jobs=jobs, total=len(jobs), page=page, source="adzuna")
 
     # fallback AI logic
     prompt = f"""
@@ -116,13 +106,14 @@ Return JSON:
 }}
 """
     try:
-        raw = json_completion(prompt, max_tokens=1500)
+        raw = json_completion(prompt, max_tokens=1500, feature="jobs")
         clean = clean_json_str(raw)
         data = json.loads(clean)
         jobs = [Job(**j) for j in data.get("jobs", [])]
-        return JobsResponse(jobs=jobs, total=len(jobs))
+        return JobsResponse(jobs=jobs, total=len(jobs), source="ai")
     except Exception:
         # Fallback static data
+        metrics.record_fallback("jobs")
         return JobsResponse(
             jobs=[
                 Job(title="Senior SDE", company="Razorpay", location="Bengaluru", salary="₹28–38 LPA", experience="4–6 YOE", skills=["React", "Node.js", "PostgreSQL"], url="https://www.linkedin.com/jobs/search/?keywords=Razorpay+SDE"),
@@ -133,6 +124,14 @@ Return JSON:
         )
 
 
+@router.post("/sync", dependencies=[Depends(require_admin)])
+async def sync_jobs():
+    """Run the scheduled listing sync immediately and report what was stored."""
+    if not adzuna_service.is_configured():
+        raise HTTPException(status_code=400, detail="Adzuna is not configured")
+    return await job_listings.sync()
+
+
 @router.get("/trends", response_model=TrendsResponse)
 def job_trends():
     prompt = """
@@ -151,11 +150,12 @@ Return JSON:
 }
 """
     try:
-        raw = json_completion(prompt, max_tokens=600)
+        raw = json_completion(prompt, max_tokens=600, feature="jobs")
         clean = clean_json_str(raw)
         data = json.loads(clean)
         return TrendsResponse(**data)
     except Exception:
+        metrics.record_fallback("jobs")
         return TrendsResponse(
             hot_roles=["AI/ML Engineer", "Full Stack Developer", "DevOps Engineer", "Data Scientist", "Cloud Architect"],
             top_skills=["Python", "React", "Kubernetes", "LLM Fine-tuning", "System Design"],
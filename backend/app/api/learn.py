@@ -1,19 +1,31 @@
 """
 Learning Journey API — AI-guided adaptive path based on quiz scores.
-POST /learn/generate   → generate full learning path
-POST /learn/adapt      → re-adapt path after new quiz score
-GET  /learn/resources  → get curated YouTube/Coursera resources for a topic
+POST /learn/generate   → generate full learning path (reuses the stored path if inputs are unchanged)
+GET  /learn/path       → the signed-in user's stored path
+GET  /learn/verification/{id}         → link check results so far (resources start out "pending")
+GET  /learn/verification/{id}/events  → SSE: one `link` event per checked URL, then `done`
+POST /learn/adapt      → re-rank path locally after a new quiz score (returns a diff)
+POST /learn/generate/async, /learn/adapt/async → 202 + task id (see /tasks)
+POST /learn/resources  → curated resources for a topic (local catalog first, LLM only on a miss)
+POST /learn/resources/import → bulk-import catalog entries (X-Admin-Token)
 """
+import asyncio
 import json
 import re
+import time
 import logging
-import httpx
-import asyncio
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from app.services.groq_service import json_completion
+from app.core.security import get_user_id, require_admin
+from app.core import metrics
+from app.services.groq_service import CircuitOpenError, json_completion
 from app.utils import clean_json_str
 from app.services.memory_service import retain_memory, recall_memories
+from app.services.task_service import submit_task, TaskAccepted
+from app.services import learning_store
+from app.services import link_verifier, resource_catalog
+from app.services.link_verifier import verify_urls
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -46,6 +58,7 @@ class Resource(BaseModel):
     duration: str      # e.g. "4h 30m" or "6 weeks"
     difficulty: str    # "beginner" | "intermediate" | "advanced"
     why: str           # why this is recommended for this user
+    verification: str = ""  # "pending" | "verified" | "failed"; empty if the URL isn't checked
 
 
 class Module(BaseModel):
@@ -61,6 +74,23 @@ class Module(BaseModel):
     milestone: str     # what they can do after completing this
 
 
+class ModuleChange(BaseModel):
+    module_id: int
+    title: str
+    action: str                   # "updated" | "added" | "removed"
+    old_score: int | None = None
+    new_score: int | None = None
+    old_priority: str | None = None
+    new_priority: str | None = None
+
+
+class AdaptDiff(BaseModel):
+    quiz: QuizScore
+    changes: list[ModuleChange]
+    order_before: list[int]       # module ids, in path order
+    order_after: list[int]
+
+
 class LearningPath(BaseModel):
     target_role: str
     overall_readiness: int        # 0-100
@@ -69,64 +99,216 @@ class LearningPath(BaseModel):
     modules: list[Module]
     next_action: str              # single most important thing to do right now
     motivational_note: str
+    version: int = 0              # stored path version (0 = not stored, e.g. anonymous user)
+    diff: AdaptDiff | None = None     # set by /learn/adapt
+    verification_id: str = ""     # follow /learn/verification/{id} while resources are pending
 
 
 class AdaptRequest(BaseModel):
-    current_path: dict
+    current_path: dict = {}       # empty → adapt the signed-in user's stored path
     new_quiz: QuizScore
+    rewrite_reasons: bool = True  # refresh why_this_now for changed modules in the background
+
+
+class VerificationStatus(BaseModel):
+    verification_id: str
+    status: str                   # "pending" | "done"
+    total: int
+    checked: int
+    results: dict[str, bool]      # url → reachable
 
 
 class ResourceRequest(BaseModel):
     topic: str
     level: str = "intermediate"
     count: int = 4
+    platform: str = ""            # optional filter: youtube | coursera | web
 
 
-# ── Link Verification Utility ────────────────────────
-async def verify_url(url: str) -> bool:
-    """True if URL returns 200 OK within 3 seconds."""
-    if not url or not url.startswith("http"):
-        return False
-    try:
-        async with httpx.AsyncClient(follow_redirects=True, timeout=3.0) as client:
-            # Mask user-agent to avoid simple bot blocks
-            headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"}
-            r = await client.get(url, headers=headers)
-            # YouTube/Coursera might return 429 or 403 to bots, but usually 200 if valid
-            return r.status_code == 200
-    except Exception:
-        return False
+class CatalogEntry(Resource):
+    topics: list[str] = []        # extra topics to index it under (title is always indexed)
 
-async def verify_modules_links(modules: list[Module]):
-    """Parallel verify all is_verified resources."""
-    tasks = []
-    resources_to_check = []
-    
+
+class CatalogImportRequest(BaseModel):
+    resources: list[CatalogEntry]
+
+
+# ── Link Verification ────────────────────────────
+# Paths are returned before their links are checked: resources the model is
+# confident about start out "pending" (or get their cached outcome right away),
+# and a background job records results for polling / SSE and folds them into
+# the stored path.
+
+def _mark_pending(modules: list[Module]) -> list[str]:
+    """Apply cached outcomes and mark the rest pending; returns the URLs still to check."""
+    pending = []
+    for r in (r for m in modules for r in m.resources if r.is_verified and not r.verification):
+        hit = link_verifier.cached(r.url)
+        if hit is None:
+            r.verification = "pending"
+            pending.append(r.url)
+        else:
+            _apply_result(r, hit)
+    return pending
+
+
+def _apply_result(r: Resource, ok: bool):
+    r.verification = "verified" if ok else "failed"
+    if not ok:
+        logger.info(f"Link verification failed for: {r.url}. Downgrading to search fallback.")
+        r.is_verified = False
+
+
+def _apply_results(modules: list[Module], results: dict[str, bool]):
+    for r in (r for m in modules for r in m.resources):
+        if r.verification == "pending" and r.url in results:
+            _apply_result(r, results[r.url])
+
+
+def _catalog_verified(modules: list[Module]):
+    """Seed the resource catalog with every verified resource, under its module's topics."""
     for m in modules:
-        for r in m.resources:
-            if r.is_verified:
-                resources_to_check.append(r)
-                tasks.append(verify_url(r.url))
-                
-    if not tasks:
+        verified = [r.model_dump() for r in m.resources if r.verification == "verified"]
+        if verified:
+            resource_catalog.add(verified, [m.domain, m.title], source="path")
+
+
+async def verify_modules_links(modules: list[Module]):
+    """Verify all is_verified resources concurrently and wait for the results."""
+    _apply_results(modules, await verify_urls(_mark_pending(modules)))
+    _catalog_verified(modules)
+
+
+def _start_verification(path: LearningPath, background_tasks: BackgroundTasks, user_id: str):
+    urls = _mark_pending(path.modules)
+    if urls:
+        path.verification_id = link_verifier.start_job(urls)
+        modules = [m.model_copy(deep=True) for m in path.modules]
+        background_tasks.add_task(_verify_in_background, path.verification_id, user_id, modules)
+    else:
+        _catalog_verified(path.modules)
+
+
+async def _verify_in_background(verification_id: str, user_id: str, modules: list[Module]):
+    results = await link_verifier.run_job(verification_id)
+    _apply_results(modules, results)
+    _catalog_verified(modules)
+    if user_id == "anonymous":
         return
-        
-    results = await asyncio.gather(*tasks)
-    for r, ok in zip(resources_to_check, results):
-        if not ok:
-            logger.info(f"Link verification failed for: {r.url}. Downgrading to search fallback.")
-            r.is_verified = False
+
+    def apply(stored: dict) -> dict:
+        path = LearningPath(**stored)
+        _apply_results(path.modules, results)
+        return path.model_dump(exclude={"version", "diff"})
+
+    # Applies to whatever version is current: outcomes are per URL, not per path
+    learning_store.modify(user_id, apply)
+
+
+@router.get("/verification/{verification_id}", response_model=VerificationStatus)
+def verification_status(verification_id: str):
+    job = link_verifier.get_job(verification_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Verification not found")
+    return VerificationStatus(
+        verification_id=verification_id,
+        status=job["status"],
+        total=len(job["urls"]),
+        checked=len(job["results"]),
+        results=job["results"],
+    )
+
+
+@router.get("/verification/{verification_id}/events")
+async def verification_events(verification_id: str):
+    """SSE alternative to polling: a `link` event per URL as it is checked, then `done`."""
+    if await asyncio.to_thread(link_verifier.get_job, verification_id) is None:
+        raise HTTPException(status_code=404, detail="Verification not found")
+
+    async def events():
+        # Async so a waiting subscriber holds no threadpool thread
+        sent = set()
+        deadline = time.time() + 60
+        while True:
+            job = await asyncio.to_thread(link_verifier.get_job, verification_id)
+            if job is None:     # expired and cleaned up while we waited
+                yield 'event: error\ndata: {"detail": "Verification not found"}\n\n'
+                return
+            for url, ok in job["results"].items():
+                if url not in sent:
+                    sent.add(url)
+                    yield f"event: link\ndata: {json.dumps({'url': url, 'ok': ok})}\n\n"
+            if job["status"] == "done" or time.time() > deadline:
+                yield f"event: done\ndata: {json.dumps({'checked': len(sent), 'total': len(job['urls'])})}\n\n"
+                return
+            await asyncio.sleep(0.25)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
 
 
 # ── Routes ───────────────────────────────────────────
 
-@router.post("/generate", response_model=LearningPath)
-async def generate_learning_path(req: LearningGenerateRequest):
-    path = generate_learning_path_logic(req)
-    await verify_modules_links(path.modules)
+# ── Stored paths ─────────────────────────────────────
+
+def _stored_path(user_id: str, inputs: dict | None = None) -> LearningPath | None:
+    """The user's stored path; if `inputs` is given, only when it was generated from the same inputs."""
+    if user_id == "anonymous":
+        return None
+    stored = learning_store.get(user_id)
+    if not stored or (inputs is not None and stored["fingerprint"] != learning_store.fingerprint(inputs)):
+        return None
+    return LearningPath(**{**stored["path"], "version": stored["version"]})
+
+
+def _store_path(user_id: str, inputs: dict, path: LearningPath) -> LearningPath:
+    if user_id != "anonymous":
+        path.version = learning_store.save(user_id, inputs, path.model_dump(exclude={"version", "diff"}))
     return path
 
-def generate_learning_path_logic(req: LearningGenerateRequest):
+
+@router.get("/path", response_model=LearningPath)
+def get_learning_path(request: Request):
+    path = _stored_path(get_user_id(request))
+    if not path:
+        raise HTTPException(status_code=404, detail="No stored learning path")
+    return path
+
+
+@router.post("/generate", response_model=LearningPath)
+def generate_learning_path(req: LearningGenerateRequest, request: Request, background_tasks: BackgroundTasks):
+    user_id = get_user_id(request)
+    stored = _stored_path(user_id, req.model_dump())
+    if stored:
+        return stored
+    try:
+        path = generate_learning_path_logic(req, fallback=False)
+    except Exception:
+        return _fallback_path(req)     # not stored, so the next visit retries
+    # Mark links pending (and get the verification id) before storing; the job
+    # itself runs after the response, when the stored path is there to update
+    _start_verification(path, background_tasks, user_id)
+    return _store_path(user_id, req.model_dump(), path)
+
+@router.post("/generate/async", response_model=TaskAccepted, status_code=202)
+def generate_learning_path_async(req: LearningGenerateRequest, request: Request):
+    user_id = get_user_id(request)
+
+    def run(report):
+        stored = _stored_path(user_id, req.model_dump())
+        if stored:
+            return stored
+        try:
+            path = generate_learning_path_logic(req, fallback=False)
+        except Exception:
+            return _fallback_path(req)
+        report("verifying links")
+        link_verifier.run_sync(verify_modules_links(path.modules))
+        return _store_path(user_id, req.model_dump(), path)
+
+    return submit_task("learn_generate", {"user": user_id, **req.model_dump()}, run)
+
+
+def generate_learning_path_logic(req: LearningGenerateRequest, fallback: bool = True):
     scores_text = ""
     if req.quiz_scores:
         scores_text = "Quiz scores: " + ", ".join(
@@ -207,7 +389,7 @@ Include 3-5 modules total, ordered by priority. Keep it realistic and actionable
 """
 
     try:
-        raw = json_completion(prompt, max_tokens=2500)
+        raw = json_completion(prompt, max_tokens=2500, feature="learn")
         clean = clean_json_str(raw)
         data = json.loads(clean)
         
@@ -259,92 +441,238 @@ Include 3-5 modules total, ordered by priority. Keep it realistic and actionable
         return res
     except Exception as e:
         logger.error(f"Learning Path Generation Error: {str(e)}")
-        # Fallback static data
-        return LearningPath(
-            target_role=req.target_role or "Software Engineer",
-            overall_readiness=45,
-            total_weeks=6,
-            adapted_from_scores=False,
-            next_action="Start with the core fundamentals module today.",
-            motivational_note="You've got this! Start small and stay consistent.",
-            modules=[
-                Module(
-                    id=1,
-                    title="Core Fundamentals",
-                    domain="Basics",
-                    priority="critical",
-                    current_score=0,
-                    target_score=80,
-                    estimated_weeks=2,
-                    why_this_now="Solid foundations are required for all advanced topics.",
-                    milestone="Build a basic CRUD application.",
-                    resources=[
-                        Resource(
-                            title="Crash Course for Beginners",
-                            type="youtube",
-                            url="https://www.youtube.com/watch?v=zOjov-2OZ0E",
-                            is_verified=True,
-                            platform="youtube",
-                            search_query="full course for beginners",
-                            duration="4h",
-                            difficulty="beginner",
-                            why="Highly rated standard community course."
-                        )
-                    ]
-                )
-            ]
-        )
+        if not fallback:
+            raise
+        return _fallback_path(req)
+
+
+def _fallback_path(req: LearningGenerateRequest) -> LearningPath:
+    # Fallback static data
+    metrics.record_fallback("learn")
+    return LearningPath(
+        target_role=req.target_role or "Software Engineer",
+        overall_readiness=45,
+        total_weeks=6,
+        adapted_from_scores=False,
+        next_action="Start with the core fundamentals module today.",
+        motivational_note="You've got this! Start small and stay consistent.",
+        modules=[
+            Module(
+                id=1,
+                title="Core Fundamentals",
+                domain="Basics",
+                priority="critical",
+                current_score=0,
+                target_score=80,
+                estimated_weeks=2,
+                why_this_now="Solid foundations are required for all advanced topics.",
+                milestone="Build a basic CRUD application.",
+                resources=[
+                    Resource(
+                        title="Crash Course for Beginners",
+                        type="youtube",
+                        url="https://www.youtube.com/watch?v=zOjov-2OZ0E",
+                        is_verified=True,
+                        platform="youtube",
+                        search_query="full course for beginners",
+                        duration="4h",
+                        difficulty="beginner",
+                        why="Highly rated standard community course."
+                    )
+                ]
+            )
+        ]
+    )
+
+
+def _adapted_inputs(user_id: str, req: AdaptRequest) -> dict:
+    """The stored generation inputs with the new quiz score folded in."""
+    stored = learning_store.get(user_id) if user_id != "anonymous" else None
+    inputs = stored["inputs"] if stored else LearningGenerateRequest(
+        target_role=req.current_path.get("target_role", "")
+    ).model_dump()
+    domain = req.new_quiz.domain.strip().lower()
+    inputs["quiz_scores"] = [q for q in inputs["quiz_scores"] if q["domain"].strip().lower() != domain]
+    inputs["quiz_scores"].append(req.new_quiz.model_dump())
+    return inputs
+
+
 @router.post("/adapt", response_model=LearningPath)
-async def adapt_learning_path(req: AdaptRequest):
+def adapt_learning_path(req: AdaptRequest, request: Request, background_tasks: BackgroundTasks):
     """Re-prioritize the existing path based on a new quiz result."""
-    path = await adapt_learning_path_logic(req)
-    await verify_modules_links(path.modules)
+    user_id = get_user_id(request)
+    path = adapt_learning_path_logic(req, _stored_path(user_id))
+    path = _store_path(user_id, _adapted_inputs(user_id, req), path)
+    if req.rewrite_reasons:
+        background_tasks.add_task(_rewrite_and_store, user_id, path.model_copy(deep=True))
     return path
 
-async def adapt_learning_path_logic(req: AdaptRequest):
-    prompt = f"""
-A user just completed a quiz and their path needs adapting.
+@router.post("/adapt/async", response_model=TaskAccepted, status_code=202)
+def adapt_learning_path_async(req: AdaptRequest, request: Request):
+    user_id = get_user_id(request)
+
+    def run(report):
+        path = adapt_learning_path_logic(req, _stored_path(user_id))
+        path = _store_path(user_id, _adapted_inputs(user_id, req), path)
+        if req.rewrite_reasons:
+            report("rewriting reasons")
+            _rewrite_and_store(user_id, path)
+        return path
+
+    return submit_task("learn_adapt", {"user": user_id, **req.model_dump()}, run)
+
+
+PRIORITY_ORDER = {"critical": 0, "high": 1, "medium": 2}
+MASTERED_SCORE = 80     # at or above this a module is demoted, or dropped once its target is met
+
+
+def priority_for(score: int) -> str:
+    """Same rules the generator prompt uses: <50 critical, 50-70 high, >70 medium."""
+    if score < 50:
+        return "critical"
+    if score <= 70:
+        return "high"
+    return "medium"
+
+
+def _parse_path(data: dict) -> LearningPath:
+    modules = []
+    for m in data.get("modules", []):
+        try:
+            modules.append(Module(**m))
+        except Exception as mod_err:
+            logger.warning(f"Skipping unparseable module while adapting: {mod_err}")
+    return LearningPath(
+        target_role=data.get("target_role", ""),
+        overall_readiness=data.get("overall_readiness", 50),
+        total_weeks=data.get("total_weeks", sum(m.estimated_weeks for m in modules)),
+        adapted_from_scores=True,
+        modules=modules,
+        next_action=data.get("next_action", "Continue with updated priorities"),
+        motivational_note=data.get("motivational_note", "Great progress!"),
+    )
+
+
+def adapt_learning_path_logic(req: AdaptRequest, stored: LearningPath | None = None) -> LearningPath:
+    """
+    Apply a new quiz score to a path in-process: update the matching module's
+    score and priority, drop it once mastered, add a module for an uncovered
+    weak domain, and re-sort by priority. The changes are returned in `diff`.
+    """
+    path = _parse_path(req.current_path) if req.current_path else stored
+    if not path or not path.modules:
+        raise HTTPException(status_code=400, detail="Failed to adapt path: no current path with modules")
+
+    score = req.new_quiz.score
+    domain = " ".join(req.new_quiz.domain.lower().split())
+    before = [m.id for m in path.modules]
+    changes = []
+
+    matched = [m for m in path.modules if domain in (" ".join(m.domain.lower().split()), " ".join(m.title.lower().split()))]
+    for m in matched:
+        change = ModuleChange(module_id=m.id, title=m.title, action="updated",
+                              old_score=m.current_score, new_score=score,
+                              old_priority=m.priority, new_priority=priority_for(score))
+        if score >= MASTERED_SCORE and score >= m.target_score:
+            change.action = "removed"
+            path.modules.remove(m)
+        m.current_score, m.priority = score, priority_for(score)
+        changes.append(change)
+
+    if not matched and score <= 70:
+        new_id = max(before) + 1
+        path.modules.append(Module(
+            id=new_id,
+            title=req.new_quiz.domain.strip(),
+            domain=req.new_quiz.domain.strip(),
+            priority=priority_for(score),
+            current_score=score,
+            target_score=max(MASTERED_SCORE, score + 20),
+            estimated_weeks=2 if score >= 50 else 3,
+            why_this_now=f"Your latest {req.new_quiz.domain.strip()} quiz score ({score}%) shows a gap to close.",
+            resources=[],
+            milestone=f"Score {MASTERED_SCORE}%+ on a {req.new_quiz.domain.strip()} quiz.",
+        ))
+        changes.append(ModuleChange(module_id=new_id, title=req.new_quiz.domain.strip(), action="added",
+                                    new_score=score, new_priority=priority_for(score)))
+
+    # Stable sort: modules keep their relative order within a priority band
+    path.modules.sort(key=lambda m: PRIORITY_ORDER.get(m.priority, len(PRIORITY_ORDER)))
+    after = [m.id for m in path.modules]
+    if not path.modules:
+        path.next_action = f"You've covered every module for {path.target_role} - take a mock interview next."
+    elif after[:1] != before[:1]:
+        path.next_action = f"Start with \"{path.modules[0].title}\" - it is now your top priority."
+    path.total_weeks = sum(m.estimated_weeks for m in path.modules)
+    path.adapted_from_scores = True
+    path.diff = AdaptDiff(quiz=req.new_quiz, changes=changes, order_before=before, order_after=after)
+    return path
 
-New quiz result: {req.new_quiz.domain} = {req.new_quiz.score}%
-Current path summary: {json.dumps(req.current_path, indent=2)[:2000]}
 
+def rewrite_reasons(path: LearningPath, module_ids: list[int]) -> dict[int, str]:
+    """Ask the LLM for fresh `why_this_now` lines for the changed modules; returns the applied ones by id."""
+    modules = [m for m in path.modules if m.id in module_ids]
+    if not modules:
+        return {}
+    summary = [{"id": m.id, "title": m.title, "priority": m.priority, "current_score": m.current_score,
+                "target_score": m.target_score} for m in modules]
+    prompt = f"""
+A learner's path for {path.target_role} was just re-prioritized after a quiz.
 CRITICAL: DO NOT USE ANY EMOJIS IN ANY FIELD.
 
-Re-generate the learning path with updated priorities.
-If score >= 80, mark that module as "medium" or remove it.
-If score < 50, escalate to "critical".
-Keep the same JSON structure as before.
+For each module below write a 1-sentence reason why it is prioritized now.
+Modules: {json.dumps(summary)}
 
-Return ONLY valid JSON with the same structure as the original path.
+Return ONLY valid JSON:
+{{"reasons": {{"<module id>": "<reason>"}}}}
 """
     try:
-        raw = json_completion(prompt, max_tokens=3000)
-        clean = clean_json_str(raw)
-        data = json.loads(clean)
-        modules = [Module(**m) for m in data["modules"]]
-        return LearningPath(
-            target_role=req.current_path.get("target_role", ""),
-            overall_readiness=data.get("overall_readiness", 50),
-            total_weeks=data.get("total_weeks", 10),
-            adapted_from_scores=True,
-            modules=modules,
-            next_action=data.get("next_action", "Continue with updated priorities"),
-            motivational_note=data.get("motivational_note", "Great progress!"),
-        )
+        raw = json_completion(prompt, max_tokens=80 * len(modules) + 100, feature="learn", timeout=10)
+        reasons = json.loads(clean_json_str(raw)).get("reasons", {})
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to adapt path: {e}")
+        logger.warning(f"why_this_now rewrite failed: {e}")
+        return {}
+    applied = {}
+    for m in modules:
+        reason = reasons.get(str(m.id))
+        if isinstance(reason, str) and reason.strip():
+            m.why_this_now = applied[m.id] = reason.strip()
+    return applied
+
+
+def _rewrite_and_store(user_id: str, path: LearningPath):
+    """Background step after /adapt: refresh reasons, then update the stored version in place."""
+    ids = [c.module_id for c in path.diff.changes if c.action != "removed"] if path.diff else []
+    applied = rewrite_reasons(path, ids)
+    if not applied or not path.version:
+        return
+
+    def apply(stored: dict) -> dict:
+        for m in stored["modules"]:
+            m["why_this_now"] = applied.get(m["id"], m["why_this_now"])
+        return stored
+
+    learning_store.modify(user_id, apply, version=path.version)
 
 
 @router.post("/resources", response_model=list[Resource])
 async def get_resources(req: ResourceRequest):
     """Get curated YouTube/Coursera resources for a specific topic."""
+    found = [Resource(**r, is_verified=True, verification="verified")
+             for r in resource_catalog.search(req.topic, req.level, req.platform, req.count)]
+    if len(found) >= req.count:
+        return found
+
+    # Catalog miss: ask the LLM for the shortfall, then keep what verifies
+    known = ", ".join(r.title for r in found)
     prompt = f"""
-Recommend {req.count} real learning resources for: "{req.topic}" at {req.level} level.
+Recommend {req.count - len(found)} real learning resources for: "{req.topic}" at {req.level} level.
 Target audience: Indian tech professionals.
+{f"Already recommended (do not repeat): {known}" if known else ""}
 
 CRITICAL: DO NOT USE ANY EMOJIS IN ANY FIELD.
 
-Include a mix of YouTube playlists/channels AND Coursera courses where applicable.
+{f'Only recommend resources on {req.platform}.' if req.platform else "Include a mix of YouTube playlists/channels AND Coursera courses where applicable."}
 Use real, existing resources with accurate URLs.
 
 Return ONLY a JSON array:
@@ -353,6 +681,7 @@ Return ONLY a JSON array:
     "title": "<resource title>",
     "type": "<youtube|coursera|article|practice>",
     "url": "<real URL>",
+    "platform": "<youtube|coursera|web>",
     "search_query": "<high-intent search query for this specific resource>",
     "duration": "<time>",
     "difficulty": "<beginner|intermediate|advanced>",
@@ -361,17 +690,30 @@ Return ONLY a JSON array:
 ]
 """
     try:
-        raw = json_completion(prompt, max_tokens=1000)
+        raw = json_completion(prompt, max_tokens=1000, feature="learn")
         clean = raw.strip().lstrip("```json").lstrip("```").rstrip("```").strip()
         data = json.loads(clean)
-        resources = [Resource(**r) for r in data]
-        
+        seen = {r.url for r in found}
+        resources = [Resource(**r) for r in data if r.get("url") not in seen]
+
         # Verify resources too
-        tasks = [verify_url(r.url) for r in resources]
-        results = await asyncio.gather(*tasks)
-        for r, ok in zip(resources, results):
-            r.is_verified = ok
-            
-        return resources
+        results = await verify_urls([r.url for r in resources])
+        for r in resources:
+            r.is_verified = results[r.url]
+            r.verification = "verified" if r.is_verified else "failed"
+        resource_catalog.add([r.model_dump() for r in resources if r.is_verified], [req.topic], source="llm")
+
+        return found + resources
     except Exception as e:
+        if found:
+            return found
+        if isinstance(e, CircuitOpenError):
+            raise
         raise HTTPException(status_code=500, detail=f"Failed to get resources: {e}")
+
+
+@router.post("/resources/import", dependencies=[Depends(require_admin)])
+def import_resources(req: CatalogImportRequest):
+    """Bulk-load curated resources into the catalog (trusted; not link-checked)."""
+    imported = resource_catalog.add([r.model_dump() for r in req.resources], [], source="import")
+    return {"imported": imported, "catalog_size": resource_catalog.size()}
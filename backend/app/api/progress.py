@@ -6,9 +6,8 @@ POST /progress
 import json
 from fastapi import APIRouter, Request
 from pydantic import BaseModel
-from jose import jwt, JWTError
-from app.core.config import settings
 from app.core.database import get_db, get_db_cursor
+from app.core.security import get_user_id
 
 router = APIRouter(prefix="/progress", tags=["progress"])
 
@@ -56,26 +55,9 @@ class ProgressUpdate(BaseModel):
     value: int | dict | list | str | None
 
 
-def _get_user_id(request: Request) -> str:
-    """Extract user email (sub) from JWT, or return 'anonymous'."""
-    auth = request.headers.get("Authorization", "")
-    if auth.startswith("Bearer "):
-        token = auth[7:]
-        try:
-            payload = jwt.decode(
-                token,
-                settings.jwt_secret,
-                algorithms=[settings.jwt_algorithm],
-            )
-            return payload.get("sub", "anonymous")
-        except JWTError:
-            pass
-    return "anonymous"
-
-
 @router.get("", response_model=ProgressData)
 def get_progress(request: Request):
-    uid = _get_user_id(request)
+    uid = get_user_id(request)
     if uid == "anonymous":
         return ProgressData(**DEFAULT_PROGRESS)
     
@@ -92,7 +74,7 @@ def get_progress(request: Request):
 
 @router.post("", response_model=ProgressData)
 def update_progress(request: Request, update: ProgressUpdate):
-    uid = _get_user_id(request)
+    uid = get_user_id(request)
     if uid == "anonymous":
         return ProgressData(**DEFAULT_PROGRESS)
 
@@ -1,13 +1,26 @@
 """
 Quiz API — AI quiz generation + grading.
 POST /quiz/generate
+POST /quiz/generate/stream  → NDJSON, one question per line as it is generated
+POST /quiz/check            → reveal one question's answer after the user picks an option
 POST /quiz/submit
+GET  /quiz/feedback/{id}          → AI feedback for a submission (poll)
+GET  /quiz/feedback/{id}/stream   → same, as a single SSE event
 """
+import asyncio
 import json
-from fastapi import APIRouter, HTTPException
+import re
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from app.services.groq_service import json_completion
-from app.utils import clean_json_str
+from app.core.config import settings
+from app.core.local_db import get_local_db
+from app.core import metrics
+from app.services.groq_service import CircuitOpenError, json_completion, json_stream_completion
+from app.utils import clean_json_str, iter_json_array_items
 from app.services.memory_service import retain_memory
 
 router = APIRouter(prefix="/quiz", tags=["quiz"])
@@ -17,6 +30,7 @@ class QuizGenerateRequest(BaseModel):
     domain: str           # e.g. "Machine Learning", "React", "System Design"
     difficulty: str = "medium"   # easy | medium | hard
     count: int = 8
+    parallel: bool = False       # fan out into several smaller concurrent LLM calls
 
 
 class QuizQuestion(BaseModel):
@@ -27,17 +41,40 @@ class QuizQuestion(BaseModel):
     explanation: str
 
 
+class ClientQuizQuestion(BaseModel):
+    """A question as sent to the client — the answer key stays in the quiz session."""
+    id: int
+    question: str
+    options: list[str]
+
+
 class QuizGenerateResponse(BaseModel):
     domain: str
     difficulty: str
-    questions: list[QuizQuestion]
+    questions: list[ClientQuizQuestion]
+    quiz_id: str            # server-side session holding the answer key
 
 
 class QuizSubmitRequest(BaseModel):
-    questions: list[dict]   # [{id, question, options, correct_index}]
+    quiz_id: str = ""       # grade against the stored answer key
+    questions: list[dict] = []   # legacy, only with quiz_legacy_submit: [{id, question, options, correct_index}]
     answers: list[int]      # user's chosen option index per question
 
 
+class QuizCheckRequest(BaseModel):
+    quiz_id: str
+    question_id: int
+    answer: int             # chosen option index, -1 if the timer ran out
+
+
+class QuestionReview(BaseModel):
+    id: int
+    chosen_index: int
+    correct_index: int
+    is_correct: bool
+    explanation: str = ""
+
+
 class QuizResult(BaseModel):
     score: int              # percentage
     correct: int
@@ -46,15 +83,29 @@ class QuizResult(BaseModel):
     feedback: str
     weak_areas: list[str]
     recommendations: list[str]
+    feedback_id: str = ""        # poll /quiz/feedback/{id} for the AI feedback
+    feedback_status: str = "ready"   # pending | ready | failed
+    review: list[QuestionReview] = []   # the answer key, revealed only after submission
 
 
-@router.post("/generate", response_model=QuizGenerateResponse)
-def generate_quiz(req: QuizGenerateRequest):
-    count = min(max(req.count, 2), 15)
-    prompt = f"""
-Create {count} multiple-choice quiz questions on the topic "{req.domain}" at {req.difficulty} difficulty.
-Target audience: Indian tech students/professionals.
+class QuizFeedback(BaseModel):
+    status: str             # pending | ready | failed
+    feedback: str
+    weak_areas: list[str]
+    recommendations: list[str]
+
 
+def _quiz_prompt(domain: str, difficulty: str, count: int, part: int = 1, parts: int = 1) -> str:
+    variety = ""
+    if parts > 1:
+        variety = f"""
+This is batch {part} of {parts} for the same quiz. Cover a different sub-topic of
+"{domain}" than the other batches would — vary concepts, not just wording.
+"""
+    return f"""
+Create {count} multiple-choice quiz questions on the topic "{domain}" at {difficulty} difficulty.
+Target audience: Indian tech students/professionals.
+{variety}
 CRITICAL: DO NOT USE ANY EMOJIS IN ANY FIELD.
 
 Return JSON:
@@ -70,42 +121,319 @@ Return JSON:
   ]
 }}
 """
-    raw = json_completion(prompt, max_tokens=3000)
+
+
+def _validate_question(q: dict) -> QuizQuestion | None:
+    """Validate one question on its own so a single bad item can't sink the quiz."""
     try:
-        clean = clean_json_str(raw)
-        data = json.loads(clean)
-        questions = [QuizQuestion(**q) for q in data["questions"]]
-        return QuizGenerateResponse(
-            domain=req.domain,
-            difficulty=req.difficulty,
-            questions=questions,
-        )
+        question = QuizQuestion(**q)
+    except Exception:
+        return None
+    if not question.question.strip() or len(question.options) < 2:
+        return None
+    if not 0 <= question.correct_index < len(question.options):
+        return None
+    return question
+
+
+def _parse_questions(raw: str) -> list[QuizQuestion]:
+    data = json.loads(clean_json_str(raw))
+    items = data.get("questions", []) if isinstance(data, dict) else data
+    return [q for q in (_validate_question(i) for i in items if isinstance(i, dict)) if q]
+
+
+def _question_key(q: QuizQuestion) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", q.question.lower()).strip()
+
+
+def _dedupe_questions(questions: list[QuizQuestion], limit: int) -> list[QuizQuestion]:
+    """Drop near-identical questions (case/punctuation-insensitive) and renumber ids from 1."""
+    seen = set()
+    unique = []
+    for q in questions:
+        key = _question_key(q)
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(q.model_copy(update={"id": len(unique) + 1}))
+        if len(unique) >= limit:
+            break
+    return unique
+
+
+def _save_session(domain: str, difficulty: str, questions: list[QuizQuestion]) -> str:
+    """Persist the quiz (answer key included) and return its session id."""
+    quiz_id = uuid.uuid4().hex
+    now = time.time()
+    conn = get_local_db()
+    conn.execute(
+        "INSERT INTO quiz_sessions (id, domain, difficulty, questions_json, created_at) VALUES (?, ?, ?, ?, ?)",
+        (quiz_id, domain, difficulty, json.dumps([q.model_dump() for q in questions]), now),
+    )
+    conn.execute(
+        "DELETE FROM quiz_sessions WHERE created_at < ?",
+        (now - settings.quiz_session_ttl_hours * 3600,),
+    )
+    conn.commit()
+    return quiz_id
+
+
+def _load_session(quiz_id: str) -> tuple[str, list[dict]] | None:
+    """Return (domain, questions) for a live session, or None if unknown/expired."""
+    row = get_local_db().execute(
+        "SELECT domain, questions_json, created_at FROM quiz_sessions WHERE id = ?", (quiz_id,)
+    ).fetchone()
+    if not row or row["created_at"] < time.time() - settings.quiz_session_ttl_hours * 3600:
+        return None
+    return row["domain"], json.loads(row["questions_json"])
+
+
+def _generate_chunk(domain: str, difficulty: str, count: int, part: int, parts: int) -> list[QuizQuestion]:
+    try:
+        raw = json_completion(_quiz_prompt(domain, difficulty, count, part, parts), max_tokens=250 * count + 200, feature="quiz")
+        return _parse_questions(raw)
+    except CircuitOpenError:
+        raise
+    except Exception as e:
+        print(f"Quiz chunk {part}/{parts} failed: {e}")
+        return []
+
+
+def _generate_parallel(domain: str, difficulty: str, count: int) -> list[QuizQuestion]:
+    """
+    Split the quiz into chunks of `quiz_chunk_size` questions and generate them concurrently.
+    Wall-clock time is bounded by the slowest chunk rather than the total output length.
+    Chunks that succeeded are kept if others hit an open circuit; CircuitOpenError is
+    raised only when no chunk returned anything.
+    """
+    size = max(settings.quiz_chunk_size, 1)
+    sizes = [min(size, count - i) for i in range(0, count, size)]
+    workers = max(min(settings.quiz_max_concurrency, len(sizes)), 1)
+    questions: list[QuizQuestion] = []
+    circuit_open: CircuitOpenError | None = None
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_generate_chunk, domain, difficulty, n, part + 1, len(sizes))
+            for part, n in enumerate(sizes)
+        ]
+        for future in futures:
+            try:
+                questions.extend(future.result())
+            except CircuitOpenError as e:
+                circuit_open = e
+    if circuit_open and not questions:
+        raise circuit_open
+    return questions
+
+
+def _quiz_response(req: QuizGenerateRequest, questions: list[QuizQuestion]) -> QuizGenerateResponse:
+    return QuizGenerateResponse(
+        domain=req.domain,
+        difficulty=req.difficulty,
+        questions=[ClientQuizQuestion(**q.model_dump()) for q in questions],
+        quiz_id=_save_session(req.domain, req.difficulty, questions),
+    )
+
+
+@router.post("/generate", response_model=QuizGenerateResponse)
+def generate_quiz(req: QuizGenerateRequest):
+    count = min(max(req.count, 2), 15)
+    if req.parallel:
+        questions = _dedupe_questions(_generate_parallel(req.domain, req.difficulty, count), count)
+        if 0 < len(questions) < count:
+            # One top-up round for chunks that failed or collided with each other
+            try:
+                extra = _generate_parallel(req.domain, req.difficulty, count - len(questions))
+            except CircuitOpenError:
+                extra = []      # serve the partial quiz rather than a 503
+            questions = _dedupe_questions(questions + extra, count)
+        if not questions:
+            raise HTTPException(status_code=500, detail="Failed to generate quiz: no valid questions returned")
+        return _quiz_response(req, questions)
+
+    raw = json_completion(_quiz_prompt(req.domain, req.difficulty, count), max_tokens=3000, feature="quiz")
+    try:
+        questions = _dedupe_questions(_parse_questions(raw), count)
+        if not questions:
+            raise ValueError("no valid questions returned")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to parse quiz: {e}")
+    return _quiz_response(req, questions)
+
+
+@router.post("/generate/stream")
+def generate_quiz_stream(req: QuizGenerateRequest):
+    """
+    Stream questions as NDJSON while Groq is still generating the rest,
+    so the UI can render question 1 long before question 15 exists.
+    Lines carry no answer key; the last line is {"quiz_id": ...} once the
+    session has been stored.
+    """
+    count = min(max(req.count, 2), 15)
+
+    def ndjson():
+        seen = set()
+        emitted = 0
+        questions = []
+        try:
+            chunks = json_stream_completion(_quiz_prompt(req.domain, req.difficulty, count), max_tokens=3000, feature="quiz")
+            for item in iter_json_array_items(chunks):
+                question = _validate_question(item)
+                if not question:
+                    continue
+                key = _question_key(question)
+                if key in seen:
+                    continue
+                seen.add(key)
+                emitted += 1
+                question = question.model_copy(update={"id": emitted})
+                questions.append(question)
+                yield ClientQuizQuestion(**question.model_dump()).model_dump_json() + "\n"
+                if emitted >= count:
+                    break
+            if questions:
+                yield json.dumps({"quiz_id": _save_session(req.domain, req.difficulty, questions)}) + "\n"
+        except Exception as e:
+            print(f"Quiz stream failed after {emitted} questions: {e}")
+            yield json.dumps({"error": f"Quiz generation interrupted: {e}"}) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+@router.post("/check", response_model=QuestionReview)
+def check_answer(req: QuizCheckRequest):
+    """Per-question reveal (correct option + explanation) for UIs that show it as the user goes."""
+    session = _load_session(req.quiz_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Quiz session not found or expired")
+    question = next((q for q in session[1] if q.get("id") == req.question_id), None)
+    if question is None:
+        raise HTTPException(status_code=404, detail="Question not found in this quiz")
+    return QuestionReview(
+        id=req.question_id,
+        chosen_index=req.answer,
+        correct_index=question["correct_index"],
+        is_correct=req.answer == question["correct_index"],
+        explanation=question.get("explanation", ""),
+    )
 
 
 @router.post("/submit", response_model=QuizResult)
-def submit_quiz(req: QuizSubmitRequest):
-    if len(req.questions) != len(req.answers):
+def submit_quiz(req: QuizSubmitRequest, background_tasks: BackgroundTasks):
+    if req.quiz_id:
+        session = _load_session(req.quiz_id)
+        if session is None:
+            raise HTTPException(status_code=404, detail="Quiz session not found or expired")
+        domain, questions = session
+    elif settings.quiz_legacy_submit:
+        # Legacy clients post the full question list back, answer key included
+        questions = req.questions
+        domain = questions[0].get("domain", "general") if questions else "unknown"
+    else:
+        raise HTTPException(status_code=400, detail="quiz_id is required")
+
+    if len(questions) != len(req.answers):
         raise HTTPException(status_code=400, detail="Questions and answers length mismatch")
 
-    correct = sum(
-        1 for q, a in zip(req.questions, req.answers)
-        if a == q.get("correct_index", -1)
-    )
-    total = len(req.questions)
+    review = [
+        QuestionReview(
+            id=q.get("id", i + 1),
+            chosen_index=a,
+            correct_index=q.get("correct_index", -1),
+            is_correct=a == q.get("correct_index", -1),
+            explanation=q.get("explanation", ""),
+        )
+        for i, (q, a) in enumerate(zip(questions, req.answers))
+    ]
+    wrong = [q.get("question", "") for q, r in zip(questions, review) if not r.is_correct]
+    total = len(questions)
+    correct = total - len(wrong)
     score = round(correct / total * 100) if total else 0
     grade = "A" if score >= 85 else "B" if score >= 70 else "C" if score >= 50 else "D"
 
-    # Build prompt for AI feedback
-    wrong = [
-        req.questions[i]["question"]
-        for i, (q, a) in enumerate(zip(req.questions, req.answers))
-        if a != q.get("correct_index", -1)
-    ]
+    # Respond now with a locally derived stub; the AI feedback follows in the background
+    feedback_id = uuid.uuid4().hex
+    stub = _local_feedback(domain, score, correct, total)
+    conn = get_local_db()
+    conn.execute(
+        "INSERT INTO quiz_feedback (id, status, result_json, created_at) VALUES (?, 'pending', ?, ?)",
+        (feedback_id, json.dumps(stub), time.time()),
+    )
+    conn.commit()
+    background_tasks.add_task(_generate_feedback, feedback_id, domain, score, correct, total, grade, wrong)
+
+    return QuizResult(
+        score=score,
+        correct=correct,
+        total=total,
+        grade=grade,
+        feedback_id=feedback_id,
+        feedback_status="pending",
+        review=review,
+        **stub,
+    )
+
+
+@router.get("/feedback/{feedback_id}", response_model=QuizFeedback)
+def get_feedback(feedback_id: str):
+    """Poll for the AI feedback of a submitted quiz."""
+    feedback = _load_feedback(feedback_id)
+    if feedback is None:
+        raise HTTPException(status_code=404, detail="Feedback not found")
+    return feedback
+
+
+@router.get("/feedback/{feedback_id}/stream")
+async def stream_feedback(feedback_id: str):
+    """SSE alternative to polling: a single `feedback` event once the AI feedback is ready."""
+    if await asyncio.to_thread(_load_feedback, feedback_id) is None:
+        raise HTTPException(status_code=404, detail="Feedback not found")
+
+    async def events():
+        # Async so a waiting subscriber holds no threadpool thread
+        deadline = time.time() + 60
+        while True:
+            feedback = await asyncio.to_thread(_load_feedback, feedback_id)
+            if feedback is None:    # expired and cleaned up while we waited
+                yield 'event: error\ndata: {"detail": "Feedback not found"}\n\n'
+                return
+            if feedback.status != "pending" or time.time() > deadline:
+                yield f"event: feedback\ndata: {feedback.model_dump_json()}\n\n"
+                return
+            await asyncio.sleep(0.25)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
 
+def _local_feedback(domain: str, score: int, correct: int, total: int) -> dict:
+    if score >= 85:
+        feedback = f"Excellent work: {correct}/{total} correct ({score}%)."
+        recommendations = ["Try the next difficulty level", "Attempt a timed quiz to build speed"]
+    elif score >= 50:
+        feedback = f"Good effort: {correct}/{total} correct ({score}%)."
+        recommendations = ["Review the questions you missed", "Practice more questions on this topic"]
+    else:
+        feedback = f"You scored {score}% ({correct}/{total}). Keep practicing!"
+        recommendations = ["Revisit the fundamentals of this topic", "Review the questions you missed"]
+    return {
+        "feedback": feedback,
+        "weak_areas": [domain] if score < 70 else [],
+        "recommendations": recommendations,
+    }
+
+
+def _load_feedback(feedback_id: str) -> QuizFeedback | None:
+    row = get_local_db().execute(
+        "SELECT status, result_json FROM quiz_feedback WHERE id = ?", (feedback_id,)
+    ).fetchone()
+    if not row:
+        return None
+    return QuizFeedback(status=row["status"], **json.loads(row["result_json"]))
+
+
+def _generate_feedback(feedback_id: str, domain: str, score: int, correct: int, total: int, grade: str, wrong: list[str]):
     prompt = f"""
-A student scored {score}% ({correct}/{total}) on a quiz.
+A student scored {score}% ({correct}/{total}) on a quiz about "{domain}".
 Wrong questions: {json.dumps(wrong[:5])}
 
 CRITICAL: DO NOT USE ANY EMOJIS IN ANY FIELD.
@@ -117,26 +445,28 @@ Return JSON:
   "recommendations": ["<recommendation 1>", "<recommendation 2>", "<recommendation 3>"]
 }}
 """
-    raw = json_completion(prompt, max_tokens=500)
+    status = "ready"
     try:
-        clean = clean_json_str(raw)
-        ai_data = json.loads(clean)
-    except Exception:
+        raw = json_completion(prompt, max_tokens=500, feature="quiz")
+        data = json.loads(clean_json_str(raw))
         ai_data = {
-            "feedback": f"You scored {score}%. Keep practicing!",
-            "weak_areas": [],
-            "recommendations": ["Review the topics you missed", "Practice more questions"],
+            "feedback": str(data["feedback"]),
+            "weak_areas": list(data.get("weak_areas", [])),
+            "recommendations": list(data.get("recommendations", [])),
         }
+    except Exception as e:
+        print(f"Quiz feedback generation failed: {e}")
+        status = "failed"
+        metrics.record_fallback("quiz")
+        ai_data = _local_feedback(domain, score, correct, total)
 
-    res = QuizResult(
-        score=score,
-        correct=correct,
-        total=total,
-        grade=grade,
-        **ai_data,
+    conn = get_local_db()
+    conn.execute(
+        "UPDATE quiz_feedback SET status = ?, result_json = ? WHERE id = ?",
+        (status, json.dumps(ai_data), feedback_id),
     )
-    
+    conn.execute("DELETE FROM quiz_feedback WHERE created_at < ?", (time.time() - settings.quiz_session_ttl_hours * 3600,))
+    conn.commit()
+
     # Hindsight: Retain quiz performance
-    retain_memory(f"Quiz on topic '{req.questions[0].get('domain', 'general') if req.questions else 'unknown'}' completed: Score {res.score}% ({res.grade}). Feedback: {res.feedback}")
-    
-    return res
+    retain_memory(f"Quiz on topic '{domain}' completed: Score {score}% ({grade}). Feedback: {ai_data['feedback']}")
@@ -1,13 +1,31 @@
 """
 Resume API — ATS analysis with structured JSON output.
 POST /resume/analyze
+POST /resume/analyze/async  → 202 + task id (see /tasks)
+POST /resume/analyze/batch         → NDJSON per resume + ranked summary
+POST /resume/analyze/batch/upload  → same, from a .zip of resumes
+POST /resume/upload                → analyze an uploaded PDF/DOCX/TXT file
 """
+import asyncio
 import json
-from fastapi import APIRouter, HTTPException
+import os
+import tempfile
+import zipfile
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FuturesTimeout
+from typing import Iterable
+from fastapi import APIRouter, File, Form, HTTPException, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from app.services.groq_service import json_completion
+from app.core.config import settings
+from app.core.security import get_client_id
+from app.services.groq_service import CircuitOpenError, json_completion
 from app.utils import clean_json_str
 from app.services.memory_service import retain_memory
+from app.services import resume_analyzer, resume_cache, skill_taxonomy, text_extraction
+from app.services.task_service import submit_task, TaskAccepted
 
 router = APIRouter(prefix="/resume", tags=["resume"])
 
@@ -17,6 +35,16 @@ class ResumeRequest(BaseModel):
     target_role: str = ""
 
 
+class BatchResumeItem(BaseModel):
+    id: str = ""            # caller's reference (roll number, file name, ...)
+    resume_text: str
+
+
+class BatchResumeRequest(BaseModel):
+    target_role: str = ""
+    resumes: list[BatchResumeItem]
+
+
 class ATSResult(BaseModel):
     ats_score: int
     keyword_score: int
@@ -28,25 +56,45 @@ class ATSResult(BaseModel):
     overall_feedback: str
 
 
-@router.post("/analyze", response_model=ATSResult)
-def analyze_resume(req: ResumeRequest):
-    if len(req.resume_text.strip()) < 50:
-        raise HTTPException(status_code=400, detail="Resume text too short")
+# Which section score a resume section feeds into (header/contact info feeds none,
+# so it is also left out of version matching)
+SCORED_SECTIONS = {
+    "experience": "experience",
+    "projects": "experience",
+    "education": "education",
+    "certifications": "education",
+    "skills": "skills",
+    "summary": "summary",
+}
+
+
+def _keyword_fields(digest: resume_analyzer.ResumeDigest) -> dict:
+    return {
+        "keyword_score": digest.keyword_score,
+        "missing_keywords": digest.missing_keywords,
+        "present_keywords": digest.present_keywords,
+    }
+
+
+def _score_full(req: ResumeRequest, digest: resume_analyzer.ResumeDigest, sections: dict[str, str]) -> ATSResult:
+    # Keyword detection, sections and bullet stats are computed locally and exactly;
+    # the LLM only sees a compact digest and judges the subjective scores.
+    facts = digest.model_dump(exclude={"skills_found"})
 
     prompt = f"""
-Analyze this resume for ATS compatibility{f' for the role: {req.target_role}' if req.target_role else ''}.
+Score this resume for ATS compatibility{f' for the role: {req.target_role}' if req.target_role else ''}.
 CRITICAL: NO EMOJIS.
 
-Resume:
-{req.resume_text[:4000]}
+Pre-computed facts (exact, do not contradict):
+{json.dumps(facts)}
+
+Representative excerpt:
+{resume_analyzer.excerpt(sections)}
 
 Return a JSON object with EXACTLY these fields:
 {{
   "ats_score": <integer 0-100>,
-  "keyword_score": <integer 0-100>,
   "impact_score": <integer 0-100>,
-  "missing_keywords": [<list of missing important keywords>],
-  "present_keywords": [<list of found keywords>],
   "suggestions": [<list of 5 actionable improvement suggestions>],
   "section_scores": {{
     "experience": <0-100>,
@@ -58,17 +106,345 @@ Return a JSON object with EXACTLY these fields:
 }}
 """
 
-    raw = json_completion(prompt, max_tokens=1500)
+    raw = json_completion(prompt, max_tokens=700, feature="resume")
     try:
         # Strip any accidental markdown
         clean = clean_json_str(raw)
         data = json.loads(clean)
-        
+        return ATSResult(
+            ats_score=data["ats_score"],
+            impact_score=data["impact_score"],
+            suggestions=data.get("suggestions", []),
+            section_scores=data.get("section_scores", {}),
+            overall_feedback=data.get("overall_feedback", ""),
+            **_keyword_fields(digest),
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to parse AI response: {e}")
+
+
+def _rescore_changed(
+    req: ResumeRequest,
+    digest: resume_analyzer.ResumeDigest,
+    sections: dict[str, str],
+    hashes: dict[str, str],
+    previous: dict,
+    previous_hashes: dict[str, str],
+) -> ATSResult:
+    """Re-score only the sections that changed since a cached analysis and merge the rest."""
+    changed = [name for name, h in hashes.items() if previous_hashes.get(name) != h]
+    removed = [name for name in previous_hashes if name not in hashes]
+    affected = sorted({SCORED_SECTIONS[n] for n in changed + removed if n in SCORED_SECTIONS})
+    if not affected:
+        return ATSResult(**{**previous, **_keyword_fields(digest)})
+
+    changed_text = "\n\n".join(
+        f"[{name}]\n{sections[name][:800]}" for name in changed if name in SCORED_SECTIONS
+    ) or "(sections removed: " + ", ".join(removed) + ")"
+    prompt = f"""
+A resume{f' for the role: {req.target_role}' if req.target_role else ''} was edited after an ATS review.
+CRITICAL: NO EMOJIS.
+
+Previous review: {json.dumps({k: previous[k] for k in ("ats_score", "impact_score", "section_scores")})}
+Pre-computed facts for the edited resume (exact, do not contradict):
+{json.dumps(digest.model_dump(exclude={"skills_found"}))}
+
+Edited sections:
+{changed_text}
+
+Re-score ONLY these section scores: {json.dumps(affected)}. Adjust the overall scores for the edit.
+Return JSON:
+{{
+  "section_scores": {{{", ".join(f'"{name}": <0-100>' for name in affected)}}},
+  "ats_score": <integer 0-100>,
+  "impact_score": <integer 0-100>,
+  "suggestions": [<list of 5 actionable improvement suggestions>],
+  "overall_feedback": "<2-3 sentence summary>"
+}}
+"""
+    raw = json_completion(prompt, max_tokens=500, feature="resume")
+    try:
+        data = json.loads(clean_json_str(raw))
+        section_scores = dict(previous.get("section_scores", {}))
+        section_scores.update({k: v for k, v in data.get("section_scores", {}).items() if k in affected})
+        return ATSResult(
+            ats_score=data.get("ats_score", previous["ats_score"]),
+            impact_score=data.get("impact_score", previous["impact_score"]),
+            suggestions=data.get("suggestions", previous["suggestions"]),
+            section_scores=section_scores,
+            overall_feedback=data.get("overall_feedback", previous["overall_feedback"]),
+            **_keyword_fields(digest),
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to parse AI response: {e}")
+
+
+def _required_skills(role: str) -> list[str]:
+    """Keywords for the target role; roles the taxonomy doesn't know are learned from the LLM once."""
+    if not role.strip():
+        return []
+    try:
+        return skill_taxonomy.resolve_role_skills(role, feature="resume")[0]
+    except CircuitOpenError:
+        raise
+    except Exception as e:
+        print(f"WARNING: could not resolve skills for role {role!r}: {e}")
+        return []
+
+
+def _analyze(req: ResumeRequest, owner: str | None = None) -> tuple[ATSResult, bool]:
+    """
+    Analyze via the cache; returns (result, served_from_cache). Only with an
+    `owner` (the submitting client) is an edit matched to their previous version.
+    """
+    # Identical resubmits are answered straight from the content-addressed cache
+    key = resume_cache.cache_key(req.resume_text, req.target_role)
+    cached = resume_cache.get(key)
+    if cached:
+        return ATSResult(**cached), True
+
+    digest, sections = resume_analyzer.analyze(req.resume_text, req.target_role, _required_skills(req.target_role))
+    hashes = resume_cache.section_hashes({n: body for n, body in sections.items() if n in SCORED_SECTIONS})
+    previous = resume_cache.find_previous_version(owner, req.target_role, hashes) if owner else None
+    if previous:
+        res = _rescore_changed(req, digest, sections, hashes, *previous)
+    else:
+        res = _score_full(req, digest, sections)
+    resume_cache.put(key, req.target_role, hashes, res.model_dump(), owner)
+    return res, False
+
+
+@router.post("/analyze", response_model=ATSResult)
+def analyze_resume(req: ResumeRequest, request: Request):
+    return _analyze_for(req, get_client_id(request))
+
+
+def _analyze_for(req: ResumeRequest, owner: str) -> ATSResult:
+    if len(req.resume_text.strip()) < 50:
+        raise HTTPException(status_code=400, detail="Resume text too short")
+
+    res, cached = _analyze(req, owner)
+    if not cached:
         # Hindsight: Retain the analysis result
-        res = ATSResult(**data)
         role_label = f" (Target: {req.target_role})" if req.target_role else ""
         retain_memory(f"Resume ATS Analysis{role_label}: Score {res.ats_score}%. Feedback: {res.overall_feedback}. Missing Keywords: {', '.join(res.missing_keywords[:5])}")
-        
-        return res
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to parse AI response: {e}")
+
+    return res
+
+
+@router.post("/analyze/async", response_model=TaskAccepted, status_code=202)
+def analyze_resume_async(req: ResumeRequest, request: Request):
+    if len(req.resume_text.strip()) < 50:
+        raise HTTPException(status_code=400, detail="Resume text too short")
+    owner = get_client_id(request)
+    return submit_task(
+        "resume_analyze", {**req.model_dump(), "owner": owner}, lambda report: _analyze_for(req, owner)
+    )
+
+
+# ── Bulk screening ───────────────────────────────────
+
+def _stream_batch(target_role: str, items: Iterable[BatchResumeItem | tuple[str, str]]):
+    """
+    Analyze resumes concurrently (bounded by resume_batch_workers) and yield one NDJSON
+    line per resume as it finishes, then a ranked summary line. `items` may be lazy and
+    is consumed only a window ahead of the analyses; an (id, detail) tuple is a resume
+    that already failed upstream (e.g. text extraction). Bulk screening does not write
+    to the personal memory store.
+    """
+    def run(item: BatchResumeItem) -> ATSResult:
+        if len(item.resume_text.strip()) < 50:
+            raise ValueError("Resume text too short")
+        return _analyze(ResumeRequest(resume_text=item.resume_text, target_role=target_role))[0]
+
+    def error_line(item_id: str, detail: str) -> str:
+        return json.dumps({"type": "error", "id": item_id, "detail": detail}) + "\n"
+
+    results: list[tuple[str, ATSResult]] = []
+    total = failed = 0
+    workers = max(settings.resume_batch_workers, 1)
+    source = iter(items)
+    exhausted = False
+    pending: dict = {}      # future -> item id
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        while True:
+            while not exhausted and len(pending) < workers * 2:
+                item = next(source, None)
+                if item is None:
+                    exhausted = True
+                elif isinstance(item, tuple):
+                    total += 1
+                    failed += 1
+                    yield error_line(*item)
+                else:
+                    total += 1
+                    pending[pool.submit(run, item)] = item.id
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item_id = pending.pop(future)
+                try:
+                    res = future.result()
+                except Exception as e:
+                    failed += 1
+                    yield error_line(item_id, e.detail if isinstance(e, HTTPException) else str(e))
+                    continue
+                results.append((item_id, res))
+                yield json.dumps({"type": "result", "id": item_id, **res.model_dump()}) + "\n"
+    finally:
+        # If the client disconnects (GeneratorExit), drop the queued resumes instead of
+        # waiting for LLM calls nobody will read; only the in-flight ones finish
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    ranked = sorted(results, key=lambda kv: (kv[1].ats_score, kv[1].keyword_score), reverse=True)
+    yield json.dumps({
+        "type": "summary",
+        "target_role": target_role,
+        "total": total,
+        "analyzed": len(results),
+        "failed": failed,
+        "ranking": [
+            {
+                "rank": i + 1,
+                "id": item_id,
+                "ats_score": res.ats_score,
+                "keyword_score": res.keyword_score,
+                "missing_keywords": res.missing_keywords,
+            }
+            for i, (item_id, res) in enumerate(ranked)
+        ],
+    }) + "\n"
+
+
+def _size_label(size: int) -> str:
+    return f"{size // (1024 * 1024)} MB" if size >= 1024 * 1024 else f"{size // 1024} KB"
+
+
+def _check_batch_size(count: int):
+    if count == 0:
+        raise HTTPException(status_code=400, detail="No resumes provided")
+    if count > settings.resume_batch_max:
+        raise HTTPException(status_code=413, detail=f"At most {settings.resume_batch_max} resumes per batch")
+
+
+@router.post("/analyze/batch")
+def analyze_batch(req: BatchResumeRequest):
+    """Screen many resumes against one role; streams NDJSON results then a ranked summary."""
+    _check_batch_size(len(req.resumes))
+    items = [item if item.id else item.model_copy(update={"id": str(i + 1)}) for i, item in enumerate(req.resumes)]
+    return StreamingResponse(_stream_batch(req.target_role, items), media_type="application/x-ndjson")
+
+
+def _extract_members(zf: zipfile.ZipFile, members: list[zipfile.ZipInfo]):
+    """
+    Lazily extract archive members in the extraction pool, keeping at most a small
+    window of documents (and their bytes) in flight; yields BatchResumeItem or
+    (name, error). A member that times out gets the pool recycled so a stuck
+    worker can't pin it; the window's other documents are resubmitted.
+    """
+    cap = settings.resume_upload_max_bytes
+    window = max(settings.extract_workers, 1) * 2
+    queue: deque = deque()      # [name, kind, data, future]
+    remaining = iter(members)
+
+    def submit(entry: list):
+        entry[3] = text_extraction.get_pool().submit(text_extraction.extract_bytes, entry[2], entry[1])
+
+    while True:
+        while len(queue) < window:
+            m = next(remaining, None)
+            if m is None:
+                break
+            if m.file_size > cap:
+                queue.append([m.filename, None, None, f"File larger than {_size_label(cap)}"])
+                continue
+            with zf.open(m) as f:
+                entry = [m.filename, text_extraction.file_type(m.filename), f.read(cap), None]
+            submit(entry)
+            queue.append(entry)
+        if not queue:
+            return
+        name, kind, data, future = queue.popleft()
+        if kind is None:
+            yield name, future      # size error
+            continue
+        try:
+            yield BatchResumeItem(id=name, resume_text=future.result(timeout=settings.extract_timeout_seconds))
+        except FuturesTimeout:
+            text_extraction.reset_pool()
+            for entry in queue:
+                if entry[1] is not None:
+                    submit(entry)
+            yield name, "Text extraction took too long"
+        except Exception as e:
+            yield name, str(e) or "Text extraction failed"
+
+
+@router.post("/analyze/batch/upload")
+def analyze_batch_upload(archive: UploadFile = File(...), target_role: str = Form("")):
+    """
+    Same as /analyze/batch, but takes a .zip of PDF/DOCX/TXT resumes (path inside the
+    archive = id). Members are extracted lazily in the extraction process pool while
+    results stream, so memory stays bounded by the in-flight window.
+    """
+    try:
+        zf = zipfile.ZipFile(archive.file)
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail="Upload must be a .zip archive of PDF/DOCX/TXT resumes")
+    members = [m for m in zf.infolist() if not m.is_dir() and text_extraction.file_type(m.filename)]
+    try:
+        _check_batch_size(len(members))
+    except HTTPException:
+        zf.close()
+        raise
+
+    def stream():
+        with zf:
+            yield from _stream_batch(target_role, _extract_members(zf, members))
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.post("/upload", response_model=ATSResult)
+async def upload_resume(request: Request, file: UploadFile = File(...), target_role: str = Form("")):
+    """
+    Analyze an uploaded PDF/DOCX/TXT resume. The upload is copied to a temp file in
+    chunks (never held in memory whole), capped at resume_upload_max_bytes, and text
+    extraction runs in a worker process off the event loop. Starlette has already
+    spooled the whole form by the time this runs; the body-size middleware
+    (app.core.body_limit) is what stops an oversized or chunked upload mid-stream.
+    """
+    kind = text_extraction.file_type(file.filename or "")
+    if not kind:
+        raise HTTPException(status_code=415, detail="Upload a PDF, DOCX or TXT file")
+    cap = settings.resume_upload_max_bytes
+
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=f".{kind}")
+    try:
+        size = 0
+        while chunk := await file.read(64 * 1024):
+            size += len(chunk)
+            if size > cap:
+                raise HTTPException(status_code=413, detail=f"File larger than {_size_label(cap)}")
+            tmp.write(chunk)
+        tmp.close()
+
+        loop = asyncio.get_running_loop()
+        text = await asyncio.wait_for(
+            loop.run_in_executor(text_extraction.get_pool(), text_extraction.extract_file, tmp.name, kind),
+            timeout=settings.extract_timeout_seconds,
+        )
+    except text_extraction.ExtractionError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except asyncio.TimeoutError:
+        text_extraction.reset_pool()    # the worker may be stuck on a hostile document
+        raise HTTPException(status_code=422, detail="Text extraction took too long")
+    finally:
+        tmp.close()
+        os.unlink(tmp.name)
+
+    return await run_in_threadpool(
+        _analyze_for, ResumeRequest(resume_text=text, target_role=target_role), get_client_id(request)
+    )
@@ -0,0 +1,90 @@
+"""
+Tasks API — status, result and progress for background LLM tasks.
+GET /tasks/{id}          → status + progress
+GET /tasks/{id}/result   → result (202 while still running)
+GET /tasks/{id}/events   → SSE progress stream until the task finishes (or task_events_max_seconds)
+"""
+import asyncio
+import json
+import time
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+from app.core.config import settings
+from app.services.task_service import get_task, TERMINAL_STATES
+
+router = APIRouter(prefix="/tasks", tags=["tasks"])
+
+
+class TaskStatus(BaseModel):
+    task_id: str
+    kind: str
+    status: str         # queued | running | done | failed
+    progress: str
+    error: str = ""
+    created_at: float
+    updated_at: float
+
+
+def _status(task: dict) -> TaskStatus:
+    return TaskStatus(
+        task_id=task["id"],
+        kind=task["kind"],
+        status=task["status"],
+        progress=task["progress"],
+        error=task["error"] or "",
+        created_at=task["created_at"],
+        updated_at=task["updated_at"],
+    )
+
+
+def _get_or_404(task_id: str) -> dict:
+    task = get_task(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found or expired")
+    return task
+
+
+@router.get("/{task_id}", response_model=TaskStatus)
+def task_status(task_id: str):
+    return _status(_get_or_404(task_id))
+
+
+@router.get("/{task_id}/result")
+def task_result(task_id: str):
+    task = _get_or_404(task_id)
+    if task["status"] == "failed":
+        raise HTTPException(status_code=500, detail=task["error"] or "Task failed")
+    if task["status"] != "done":
+        return JSONResponse(status_code=202, content=_status(task).model_dump())
+    return task["result"]
+
+
+@router.get("/{task_id}/events")
+async def task_events(task_id: str):
+    await asyncio.to_thread(_get_or_404, task_id)
+
+    async def events():
+        # Async so a waiting subscriber holds no threadpool thread
+        deadline = time.time() + settings.task_events_max_seconds
+        last = None
+        while True:
+            task = await asyncio.to_thread(get_task, task_id)
+            if task is None:
+                yield 'event: failed\ndata: {"error": "Task expired"}\n\n'
+                return
+            status = _status(task)
+            if (status.status, status.progress) != last:
+                last = (status.status, status.progress)
+                yield f"event: progress\ndata: {status.model_dump_json()}\n\n"
+            if status.status in TERMINAL_STATES:
+                payload = json.dumps(task["result"]) if status.status == "done" else json.dumps({"error": status.error})
+                yield f"event: {status.status}\ndata: {payload}\n\n"
+                return
+            if time.time() > deadline:
+                # Still running: the client falls back to polling GET /tasks/{id}
+                yield f"event: timeout\ndata: {status.model_dump_json()}\n\n"
+                return
+            await asyncio.sleep(0.5)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
@@ -0,0 +1,52 @@
+"""
+Request-body size limits for upload routes, enforced while the body is received.
+Starlette parses (and spools) a multipart form completely before the endpoint
+runs, so a cap checked in the endpoint only applies once the whole body is in —
+and a chunked upload has no Content-Length to reject up front. This ASGI
+middleware counts body bytes as they arrive and fails the request with 413 as
+soon as a route's limit is crossed.
+"""
+from typing import Callable
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from app.core.config import settings
+
+MULTIPART_OVERHEAD = 64 * 1024      # form boundaries and the other form fields
+
+# path → limit in bytes (read per request so settings changes apply)
+UPLOAD_LIMITS: dict[str, Callable[[], int]] = {
+    "/resume/upload": lambda: settings.resume_upload_max_bytes + MULTIPART_OVERHEAD,
+    "/resume/analyze/batch/upload": lambda: settings.resume_batch_upload_max_bytes + MULTIPART_OVERHEAD,
+}
+
+
+def _too_large(limit: int) -> str:
+    return f"Upload larger than {(limit - MULTIPART_OVERHEAD) // (1024 * 1024)} MB"
+
+
+class BodySizeLimit:
+    def __init__(self, app, limits: dict[str, Callable[[], int]] | None = None):
+        self.app = app
+        self.limits = UPLOAD_LIMITS if limits is None else limits
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.limits:
+            return await self.app(scope, receive, send)
+        limit = self.limits[scope["path"]]()
+        declared = dict(scope["headers"]).get(b"content-length", b"")
+        if declared.isdigit() and int(declared) > limit:
+            return await JSONResponse({"detail": _too_large(limit)}, status_code=413)(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Raised inside body parsing, so the app's exception handling turns it into a 413
+                    raise HTTPException(status_code=413, detail=_too_large(limit))
+            return message
+
+        await self.app(scope, limited_receive, send)
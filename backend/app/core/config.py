@@ -10,6 +10,17 @@ class Settings(BaseSettings):
     # Groq
     groq_api_key: str = ""
     groq_model: str = "llama-3.3-70b-versatile"
+    groq_timeout_seconds: float = 30.0     # total budget per call, retries included
+    groq_feature_timeouts: dict[str, float] = {
+        "chat": 20, "interview": 20, "jobs": 15, "resume": 25, "quiz": 30, "career": 30, "learn": 30,
+    }
+    groq_max_retries: int = 2              # extra attempts on 429 / 5xx / connection errors
+    groq_retry_base_ms: int = 250          # full-jitter exponential backoff: U(0, base * 2^n)
+    groq_retry_cap_ms: int = 4000
+    groq_hedge_percentile: float = 0       # send a duplicate request past this latency percentile; 0 disables
+    groq_hedge_min_samples: int = 20       # recent calls per feature needed before hedging
+    groq_breaker_failures: int = 5         # consecutive failures that open the circuit
+    groq_breaker_reset_seconds: int = 30   # open time before a single trial call is let through
 
     # Database
     database_url: str = ""
@@ -17,6 +28,19 @@ class Settings(BaseSettings):
     # Adzuna (Job API)
     adzuna_app_id: str = ""
     adzuna_app_key: str = ""
+    adzuna_base_url: str = "https://api.adzuna.com/v1/api/jobs/in"   # India; point at a stand-in for local testing
+    jobs_cache_ttl_minutes: int = 15         # served as fresh
+    jobs_cache_stale_minutes: int = 24 * 60  # served while a background refresh runs
+    job_sync_interval_minutes: int = 6 * 60  # 0 disables the scheduled listing sync
+    job_sync_roles: list[str] = [
+        "software engineer", "frontend developer", "backend developer", "full stack developer",
+        "data scientist", "data analyst", "machine learning engineer", "devops engineer",
+        "android developer", "qa engineer",
+    ]
+    job_sync_pages: int = 5                  # pages pulled per role
+    job_sync_per_page: int = 50
+    job_sync_concurrency: int = 4            # concurrent Adzuna page requests
+    job_listing_ttl_days: int = 14           # listings not seen again are dropped
 
     # JWT
     jwt_secret: str = "change-this-secret-in-production"
@@ -26,6 +50,56 @@ class Settings(BaseSettings):
     # CORS
     cors_origin: str = "http://localhost:3000"
 
+    # Quiz
+    quiz_chunk_size: int = 3        # questions per LLM call
+    quiz_max_concurrency: int = 4   # concurrent LLM calls per quiz
+    quiz_session_ttl_hours: int = 24   # how long answer keys are kept for /quiz/submit
+    quiz_legacy_submit: bool = False   # accept client-posted answer keys in /quiz/submit (trusts the client)
+
+    # Career plans
+    career_plan_page_weeks: int = 4     # weeks generated per LLM call (initial plan and each page)
+    career_plan_ttl_days: int = 30
+    career_plan_max_weeks: int = 52     # longest timeline a plan may request
+    career_plan_max_pages: int = 2      # LLM calls one /plan/{id}/weeks request may make (gap filling included)
+
+    # Interview
+    interview_batch_size: int = 5          # questions generated per LLM call
+    interview_refill_threshold: int = 2    # refill when a user has fewer unseen questions
+    interview_score_concurrency: int = 4   # concurrent LLM calls in /interview/score-session
+
+    # Resume analysis
+    resume_cache_ttl_hours: int = 24 * 7
+    resume_batch_workers: int = 4        # concurrent analyses in /resume/analyze/batch
+    resume_batch_max: int = 500          # resumes per batch request
+    resume_upload_max_bytes: int = 5 * 1024 * 1024
+    resume_batch_upload_max_bytes: int = 50 * 1024 * 1024   # whole .zip for /resume/analyze/batch/upload
+    extract_workers: int = 2             # processes for PDF/DOCX text extraction
+    extract_timeout_seconds: int = 20
+
+    # Link verification (learning resources)
+    link_verify_timeout_seconds: float = 3.0
+    link_verify_max_connections: int = 20
+    link_verify_per_host: int = 4        # concurrent checks against one host
+    link_cache_ok_hours: int = 24 * 7
+    link_cache_fail_hours: int = 6       # retry broken links sooner; they may be transient
+
+    # Admin (resource catalog import); empty disables admin endpoints
+    admin_token: str = ""
+
+    # Background tasks (/career/plan/async, /learn/*/async, /resume/analyze/async)
+    task_workers: int = 4
+    task_result_ttl_minutes: int = 60
+    task_stale_seconds: int = 120   # queued/running tasks without a heartbeat this long are orphans
+    task_events_max_seconds: int = 300   # SSE progress streams end after this; clients then poll
+
+    # Tracing
+    trace_slow_request_ms: int = 3000    # log a JSON span breakdown above this; 0 disables
+
+    # Profiling (X-Profile: 1 or ?profile=1 with the admin token profiles one request)
+    profile_sample_every: int = 0        # also profile 1 in N requests automatically; 0 disables
+    profile_interval_ms: int = 5         # stack sampling interval
+    profile_keep_files: int = 200        # oldest .collapsed files beyond this are deleted
+
     # Server
     host: str = "0.0.0.0"
     port: int = 8000
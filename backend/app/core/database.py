@@ -3,21 +3,44 @@ import psycopg2.extras
 import os
 import sys
 from app.core.config import settings
+from app.core.tracing import span
 
 from fastapi import HTTPException
 
+
+class _TracedCursorMixin:
+    """Times every query as a `db` span."""
+
+    def execute(self, query, vars=None):
+        with span("db"):
+            return super().execute(query, vars)
+
+    def executemany(self, query, vars_list):
+        with span("db"):
+            return super().executemany(query, vars_list)
+
+
+class _TracedCursor(_TracedCursorMixin, psycopg2.extensions.cursor):
+    pass
+
+
+class _TracedDictCursor(_TracedCursorMixin, psycopg2.extras.RealDictCursor):
+    pass
+
+
 def get_db():
     url = settings.database_url
     if not url:
         raise HTTPException(status_code=500, detail="DATABASE_URL is not set. Please configure it in your environment.")
     try:
-        conn = psycopg2.connect(url)
+        with span("db_connect"):
+            conn = psycopg2.connect(url, cursor_factory=_TracedCursor)
         return conn
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database connection failed. Please check your DATABASE_URL. Error: {str(e)}")
 
 def get_db_cursor(conn):
-    return conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+    return conn.cursor(cursor_factory=_TracedDictCursor)
 
 def init_db():
     """Create tables if they don't exist. Logs errors but doesn't crash the server."""
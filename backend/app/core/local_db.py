@@ -0,0 +1,220 @@
+"""
+Local SQLite store for server-side state that must work without DATABASE_URL
+(quiz sessions, caches, background results). Lives under data/ next to the
+memory store; user accounts and progress stay in Postgres (see database.py).
+"""
+import os
+import sqlite3
+import threading
+
+CORE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_PATH = os.path.join(CORE_DIR, "..", "..", "data")
+os.makedirs(DATA_PATH, exist_ok=True)
+
+LOCAL_DB_FILE = os.path.join(DATA_PATH, "local.db")
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = False
+
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS quiz_sessions (
+        id TEXT PRIMARY KEY,
+        domain TEXT NOT NULL,
+        difficulty TEXT NOT NULL,
+        questions_json TEXT NOT NULL,
+        created_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS quiz_feedback (
+        id TEXT PRIMARY KEY,
+        status TEXT NOT NULL,
+        result_json TEXT NOT NULL,
+        created_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS tasks (
+        id TEXT PRIMARY KEY,
+        kind TEXT NOT NULL,
+        fingerprint TEXT NOT NULL,
+        status TEXT NOT NULL,
+        progress TEXT NOT NULL DEFAULT '',
+        result_json TEXT,
+        error TEXT,
+        created_at REAL NOT NULL,
+        updated_at REAL NOT NULL,
+        expires_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_tasks_fingerprint ON tasks (fingerprint)",
+    # One live (non-failed) task per fingerprint; drop duplicates left by older versions first
+    """
+    DELETE FROM tasks WHERE status != 'failed' AND rowid NOT IN (
+        SELECT MAX(rowid) FROM tasks WHERE status != 'failed' GROUP BY fingerprint
+    )
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_tasks_live_fingerprint ON tasks (fingerprint) WHERE status != 'failed'",
+    """
+    CREATE TABLE IF NOT EXISTS resume_analyses (
+        key TEXT PRIMARY KEY,
+        role TEXT NOT NULL,
+        section_hashes_json TEXT NOT NULL,
+        result_json TEXT NOT NULL,
+        created_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS resume_sections (
+        section_hash TEXT NOT NULL,
+        analysis_key TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_resume_sections_hash ON resume_sections (section_hash)",
+    """
+    CREATE TABLE IF NOT EXISTS resume_versions (
+        owner TEXT NOT NULL,
+        analysis_key TEXT NOT NULL,
+        PRIMARY KEY (owner, analysis_key)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS career_plans (
+        id TEXT PRIMARY KEY,
+        target_role TEXT NOT NULL,
+        timeline_weeks INTEGER NOT NULL,
+        context_json TEXT NOT NULL,
+        created_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS career_plan_weeks (
+        plan_id TEXT NOT NULL,
+        week INTEGER NOT NULL,
+        week_json TEXT NOT NULL,
+        PRIMARY KEY (plan_id, week)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS learning_paths (
+        user_id TEXT PRIMARY KEY,
+        version INTEGER NOT NULL,
+        fingerprint TEXT NOT NULL,
+        inputs_json TEXT NOT NULL,
+        path_json TEXT NOT NULL,
+        updated_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS link_checks (
+        url TEXT PRIMARY KEY,
+        ok INTEGER NOT NULL,
+        status INTEGER NOT NULL,
+        checked_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS link_verifications (
+        id TEXT PRIMARY KEY,
+        status TEXT NOT NULL,
+        urls_json TEXT NOT NULL,
+        results_json TEXT NOT NULL,
+        created_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS resource_catalog (
+        url TEXT PRIMARY KEY,
+        resource_json TEXT NOT NULL,
+        topics_json TEXT NOT NULL,
+        source TEXT NOT NULL,
+        updated_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS job_listings (
+        id TEXT PRIMARY KEY,
+        title TEXT NOT NULL,
+        company TEXT NOT NULL,
+        location TEXT NOT NULL,
+        location_key TEXT NOT NULL,
+        salary TEXT NOT NULL,
+        salary_min REAL,
+        salary_max REAL,
+        type TEXT NOT NULL,
+        url TEXT NOT NULL,
+        skills_json TEXT NOT NULL,
+        posted_at TEXT NOT NULL,
+        last_seen REAL NOT NULL,
+        experience TEXT NOT NULL DEFAULT '',
+        experience_level TEXT NOT NULL DEFAULT '',
+        experience_years INTEGER
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_job_listings_location ON job_listings (location_key)",
+    "CREATE INDEX IF NOT EXISTS idx_job_listings_last_seen ON job_listings (last_seen)",
+    """
+    CREATE TABLE IF NOT EXISTS job_listing_skills (
+        skill TEXT NOT NULL,
+        job_id TEXT NOT NULL,
+        PRIMARY KEY (skill, job_id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_job_listing_skills_job ON job_listing_skills (job_id)",
+    """
+    CREATE TABLE IF NOT EXISTS job_sync_state (
+        name TEXT PRIMARY KEY,
+        next_run_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS learned_roles (
+        role TEXT PRIMARY KEY,
+        skills_json TEXT NOT NULL,
+        taxonomy_version TEXT NOT NULL,
+        created_at REAL NOT NULL
+    )
+    """,
+]
+
+
+# Columns added after their table first shipped: (table, column, definition)
+_ADDED_COLUMNS = [
+    ("job_listings", "experience", "TEXT NOT NULL DEFAULT ''"),
+    ("job_listings", "experience_level", "TEXT NOT NULL DEFAULT ''"),
+    ("job_listings", "experience_years", "INTEGER"),
+]
+
+
+def get_local_db() -> sqlite3.Connection:
+    """Return this thread's connection to the local store (created lazily)."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        init_local_db()
+        conn = sqlite3.connect(LOCAL_DB_FILE, timeout=10)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        _local.conn = conn
+    return conn
+
+
+def init_local_db():
+    """Create tables if they don't exist. Safe to call repeatedly."""
+    global _initialized
+    with _init_lock:
+        if _initialized:
+            return
+        conn = sqlite3.connect(LOCAL_DB_FILE, timeout=10)
+        try:
+            for stmt in _SCHEMA:
+                conn.execute(stmt)
+            for table, column, definition in _ADDED_COLUMNS:
+                existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            conn.commit()
+            _initialized = True
+        finally:
+            conn.close()
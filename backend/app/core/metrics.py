@@ -0,0 +1,107 @@
+"""
+In-process metrics registry rendered in the Prometheus text format at /metrics.
+Hand-rolled (counters and histograms with labels) to avoid a client-library
+dependency; values are per worker process and reset on restart.
+"""
+import threading
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_registry: list["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, doc: str, labels: tuple[str, ...] = ()):
+        self.name, self.doc, self.label_names = name, doc, labels
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels.get(n, "") for n in self.label_names)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}", *self._samples()]
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, doc: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, doc, labels)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            return [f"{self.name}{_labels(self.label_names, k)} {v}" for k, v in sorted(self._values.items())]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, doc: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, doc, labels)
+        self.buckets = buckets
+        self._values: dict[tuple, list] = {}    # key -> [bucket counts..., sum, count]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._values.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def _samples(self) -> list[str]:
+        lines = []
+        with self._lock:
+            for key, series in sorted(self._values.items()):
+                labels = _labels(self.label_names, key)
+                for bound, count in [*zip(self.buckets, series), ("+Inf", series[-1])]:
+                    le = 'le="%s"' % bound
+                    lines.append(f"{self.name}_bucket{_labels(self.label_names, key, le)} {count}")
+                lines.append(f"{self.name}_sum{labels} {series[-2]}")
+                lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+def render() -> str:
+    return "\n".join(line for metric in _registry for line in metric.render()) + "\n"
+
+
+# ── Application metrics ─────────────────────────────────────────────────────
+
+llm_requests = Counter("vidyamitra_llm_requests_total", "Groq calls by feature and outcome (ok|error).", ("feature", "outcome"))
+llm_tokens = Counter("vidyamitra_llm_tokens_total", "Groq tokens by feature and kind (prompt|completion).", ("feature", "kind"))
+llm_latency = Histogram("vidyamitra_llm_latency_seconds", "Groq call wall time, to the last token for streams.", ("feature",))
+llm_fallbacks = Counter("vidyamitra_llm_fallbacks_total", "Responses served from a static/local fallback after an LLM failure.", ("feature",))
+llm_retries = Counter("vidyamitra_llm_retries_total", "Groq retries by feature and reason (429|5xx|connection).", ("feature", "reason"))
+llm_hedges = Counter("vidyamitra_llm_hedges_total", "Duplicate Groq requests sent after the hedge percentile.", ("feature",))
+llm_rejected = Counter("vidyamitra_llm_circuit_rejections_total", "Groq calls refused while the circuit breaker was open.", ("feature",))
+http_latency = Histogram("vidyamitra_http_request_duration_seconds", "Request latency by route template.", ("method", "route", "status"))
+
+
+def record_fallback(feature: str):
+    llm_fallbacks.inc(feature=feature)
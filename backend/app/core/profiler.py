@@ -0,0 +1,101 @@
+"""
+Opt-in sampling profiler for individual requests.
+While a profiled request runs, a daemon thread snapshots every thread's Python
+stack via sys._current_frames() at a fixed interval, skipping threads parked
+in idle waits (event loop select, idle pool workers). The samples are written
+as collapsed stacks ("root;...;leaf count" — the input format of
+flamegraph.pl and speedscope) under data/profiles/, oldest files rotated out.
+Being process-wide, concurrent requests can show up in the same profile.
+"""
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from app.core.config import settings
+
+CORE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROFILE_DIR = os.path.join(CORE_DIR, "..", "..", "data", "profiles")
+
+# (file basename, function) of leaf frames that mean "this thread is waiting, not working"
+IDLE_LEAVES = {
+    ("threading.py", "wait"), ("selectors.py", "select"), ("queue.py", "get"),
+    ("thread.py", "_worker"), ("_base.py", "wait"), ("socket.py", "accept"),
+    ("threading.py", "_wait_for_tstate_lock"),
+}
+
+
+def _label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class Sampler:
+    def __init__(self, interval_ms: int | None = None):
+        self.interval = (interval_ms or settings.profile_interval_ms) / 1000
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self) -> "Sampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+    def _run(self):
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in IDLE_LEAVES:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_label(frame))
+                    frame = frame.f_back
+                if ident not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self.samples[";".join(reversed(stack))] += 1
+
+
+def collapsed(samples: Counter) -> str:
+    return "".join(f"{stack} {count}\n" for stack, count in samples.most_common())
+
+
+def save(samples: Counter, method: str, path: str) -> str:
+    """Write a profile and rotate old ones; returns the file name."""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_")[:60] or "root"
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{int(time.time() * 1000) % 1000:03d}-{method}-{slug}.collapsed"
+    with open(os.path.join(PROFILE_DIR, name), "w", encoding="utf-8") as f:
+        f.write(collapsed(samples))
+    profiles = list_profiles()
+    for old in profiles[settings.profile_keep_files:]:
+        try:
+            os.remove(os.path.join(PROFILE_DIR, old))
+        except OSError:
+            pass
+    return name
+
+
+def list_profiles() -> list[str]:
+    """Stored profile file names, newest first."""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    return sorted((f for f in os.listdir(PROFILE_DIR) if f.endswith(".collapsed")), reverse=True)
+
+
+def read_profile(name: str) -> str | None:
+    if name not in list_profiles():     # also rejects path traversal
+        return None
+    with open(os.path.join(PROFILE_DIR, name), "r", encoding="utf-8") as f:
+        return f.read()
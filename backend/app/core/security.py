@@ -0,0 +1,68 @@
+"""
+Request identity helpers shared by the API routers.
+"""
+import re
+import secrets
+import uuid
+from fastapi import HTTPException, Request
+from jose import jwt, JWTError
+from app.core.config import settings
+
+
+def get_user_id(request: Request) -> str:
+    """Extract user email (sub) from JWT, or return 'anonymous'."""
+    auth = request.headers.get("Authorization", "")
+    if auth.startswith("Bearer "):
+        token = auth[7:]
+        try:
+            payload = jwt.decode(
+                token,
+                settings.jwt_secret,
+                algorithms=[settings.jwt_algorithm],
+            )
+            return payload.get("sub", "anonymous")
+        except JWTError:
+            pass
+    return "anonymous"
+
+
+CLIENT_ID_HEADER = "X-Client-Id"
+_CLIENT_ID = re.compile(r"^[A-Za-z0-9_-]{8,64}$")
+
+
+def get_client_id(request: Request) -> str:
+    """
+    Per-client identity for state kept for anonymous callers too (seen questions,
+    resume versions): the user id when authenticated, else the X-Client-Id the
+    client echoes back. A missing/invalid id gets a fresh one, which the
+    client-id middleware returns in the X-Client-Id response header.
+    """
+    user = get_user_id(request)
+    if user != "anonymous":
+        return user
+    client = request.headers.get(CLIENT_ID_HEADER, "")
+    if not _CLIENT_ID.match(client):
+        client = getattr(request.state, "client_id", None) or uuid.uuid4().hex
+        request.state.client_id = client
+    return f"client:{client}"
+
+
+def get_known_client_id(request: Request) -> str | None:
+    """
+    Like get_client_id, but None for a caller with no identity yet (no valid JWT
+    or X-Client-Id): a fresh id is still issued for next time, but state keyed on
+    it now would be thrown away after this one request.
+    """
+    client = get_client_id(request)
+    return None if getattr(request.state, "client_id", None) else client
+
+
+def is_admin(request: Request) -> bool:
+    token = request.headers.get("X-Admin-Token", "")
+    return bool(settings.admin_token) and secrets.compare_digest(token, settings.admin_token)
+
+
+def require_admin(request: Request):
+    """Dependency for admin-only endpoints: X-Admin-Token must match settings.admin_token."""
+    if not is_admin(request):
+        raise HTTPException(status_code=403, detail="Admin token required")
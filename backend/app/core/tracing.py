@@ -0,0 +1,70 @@
+"""
+Lightweight per-request tracing.
+The tracing middleware opens a span collector in a context variable; code on
+the request path wraps slow steps (memory recall, Groq, Postgres, link checks,
+Adzuna) in `span(name)`. The per-name totals are returned as a Server-Timing
+header and, for requests slower than trace_slow_request_ms, logged as JSON.
+Work outside a request (background tasks, pools that don't copy context) is
+simply not recorded.
+"""
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger("vidyamitra.trace")
+
+_spans: ContextVar[list | None] = ContextVar("trace_spans", default=None)
+
+
+def start() -> list:
+    """Begin collecting spans for the current request; returns the collector."""
+    spans: list = []
+    _spans.set(spans)
+    return spans
+
+
+def record(name: str, seconds: float):
+    spans = _spans.get()
+    if spans is not None:
+        spans.append((name, seconds))
+
+
+@contextmanager
+def span(name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
+
+
+def summarize(spans: list) -> dict[str, dict]:
+    """{name: {"ms": total, "count": n}} in first-seen order."""
+    summary: dict[str, dict] = {}
+    for name, seconds in spans:
+        entry = summary.setdefault(name, {"ms": 0.0, "count": 0})
+        entry["ms"] += seconds * 1000
+        entry["count"] += 1
+    return summary
+
+
+def server_timing(summary: dict[str, dict], total_ms: float) -> str:
+    parts = [
+        f'{name};dur={e["ms"]:.1f}' + (f';desc="{e["count"]} calls"' if e["count"] > 1 else "")
+        for name, e in summary.items()
+    ]
+    parts.append(f"total;dur={total_ms:.1f}")
+    return ", ".join(parts)
+
+
+def log_slow(method: str, path: str, status: int, total_ms: float, summary: dict[str, dict]):
+    logger.warning(json.dumps({
+        "event": "slow_request",
+        "method": method,
+        "path": path,
+        "status": status,
+        "total_ms": round(total_ms, 1),
+        "spans": {name: {"ms": round(e["ms"], 1), "count": e["count"]} for name, e in summary.items()},
+    }))
@@ -2,9 +2,17 @@
 VidyāMitra — FastAPI Backend
 Entry point: uvicorn app.main:app --reload
 """
-from fastapi import FastAPI
+import asyncio
+import itertools
+import time
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from app.core.config import settings
+from app.core import metrics, tracing, profiler
+from app.core.body_limit import BodySizeLimit
+from app.core.security import CLIENT_ID_HEADER, is_admin, require_admin
+from app.services.groq_service import CircuitOpenError
 
 # Import all routers
 from app.api.auth import router as auth_router
@@ -16,7 +24,10 @@ from app.api.career import router as career_router
 from app.api.jobs import router as jobs_router
 from app.api.progress import router as progress_router
 from app.api.learn import router as learn_router
+from app.api.tasks import router as tasks_router
 from app.core.database import init_db
+from app.core.local_db import init_local_db
+from app.services import skill_taxonomy, link_verifier, resource_catalog, adzuna_service, job_listings, task_service
 
 app = FastAPI(
     title="VidyāMitra API",
@@ -39,12 +50,110 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[CLIENT_ID_HEADER],
 )
 
+# ── Upload size limits ──────────────────
+# Enforced while the body streams in, before multipart parsing spools it
+app.add_middleware(BodySizeLimit)
+
+# ── Client id ───────────────────────────
+@app.middleware("http")
+async def issue_client_id(request: Request, call_next):
+    response = await call_next(request)
+    # Set by get_client_id when an anonymous caller had no (valid) X-Client-Id yet
+    client_id = getattr(request.state, "client_id", None)
+    if client_id:
+        response.headers[CLIENT_ID_HEADER] = client_id
+    return response
+
+# ── Request metrics ─────────────────────
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template (/tasks/{task_id}), not raw path, to keep cardinality bounded
+        route = request.scope.get("route")
+        metrics.http_latency.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=str(status),
+        )
+
+@app.middleware("http")
+async def trace_request(request: Request, call_next):
+    spans = tracing.start()
+    started = time.perf_counter()
+    response = await call_next(request)
+    # Streaming bodies are still being produced here; their spans aren't included
+    total_ms = (time.perf_counter() - started) * 1000
+    summary = tracing.summarize(spans)
+    response.headers["Server-Timing"] = tracing.server_timing(summary, total_ms)
+    if settings.trace_slow_request_ms and total_ms >= settings.trace_slow_request_ms:
+        tracing.log_slow(request.method, request.url.path, response.status_code, total_ms, summary)
+    return response
+
+# ── Groq circuit breaker ────────────────
+@app.exception_handler(CircuitOpenError)
+async def groq_unavailable(request: Request, exc: CircuitOpenError):
+    # Routes with a static fallback catch this themselves; the rest fail fast here
+    return JSONResponse(
+        {"detail": "AI service temporarily unavailable, please retry shortly"},
+        status_code=503,
+        headers={"Retry-After": str(int(exc.retry_after))},
+    )
+
+# ── Profiling ───────────────────────────
+_request_counter = itertools.count(1)
+
+@app.middleware("http")
+async def profile_request(request: Request, call_next):
+    requested = request.headers.get("X-Profile") == "1" or request.query_params.get("profile") == "1"
+    if requested and not is_admin(request):
+        return JSONResponse({"detail": "Admin token required"}, status_code=403)
+    sampled = settings.profile_sample_every > 0 and next(_request_counter) % settings.profile_sample_every == 0
+    if not (requested or sampled):
+        return await call_next(request)
+    sampler = profiler.Sampler().start()
+    try:
+        response = await call_next(request)
+    finally:
+        samples = sampler.stop()
+    # Written off the event loop; like tracing, a streaming body's generation isn't covered
+    name = await asyncio.to_thread(profiler.save, samples, request.method, request.url.path)
+    if requested:
+        response.headers["X-Profile-File"] = name
+    return response
+
 # Initialize database
 @app.on_event("startup")
 def startup_event():
     init_db()
+    init_local_db()
+    skill_taxonomy.load()
+    resource_catalog.load()
+    task_service.recover()
+
+
+@app.on_event("startup")
+async def start_job_sync():
+    # Scheduled Adzuna ingestion for /jobs/list; every worker runs the loop, one claims each run
+    if adzuna_service.is_configured() and settings.job_sync_interval_minutes > 0:
+        app.state.job_sync = asyncio.create_task(job_listings.run_schedule())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if getattr(app.state, "job_sync", None):
+        app.state.job_sync.cancel()
+    await link_verifier.aclose()
+    await adzuna_service.aclose()
 
 # ── Routers ─────────────────────────────
 app.include_router(auth_router)
@@ -56,6 +165,7 @@ app.include_router(career_router)
 app.include_router(learn_router)
 app.include_router(jobs_router)
 app.include_router(progress_router)
+app.include_router(tasks_router)
 
 
 # ── Health check ─────────────────────────
@@ -75,6 +185,24 @@ def health():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", tags=["health"], include_in_schema=False)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/admin/profiles", tags=["health"], include_in_schema=False, dependencies=[Depends(require_admin)])
+def list_profiles():
+    return {"profiles": profiler.list_profiles()}
+
+
+@app.get("/admin/profiles/{name}", tags=["health"], include_in_schema=False, dependencies=[Depends(require_admin)])
+def get_profile(name: str):
+    content = profiler.read_profile(name)
+    if content is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(content)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app.main:app", host=settings.host, port=settings.port, reload=True)
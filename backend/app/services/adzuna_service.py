@@ -0,0 +1,154 @@
+"""
+Adzuna job search client shared by the Jobs API.
+One pooled httpx client per event loop, and a stale-while-revalidate TTL cache
+keyed by normalized (role, location, page): fresh entries are served as-is,
+stale ones are served immediately while a background refresh runs, and only a
+true cold miss waits on Adzuna. In-process only, like the question cache.
+"""
+import asyncio
+import time
+import weakref
+from collections import OrderedDict
+import httpx
+from app.core.config import settings
+from app.core.tracing import span
+
+RESULTS_PER_PAGE = 6
+MAX_CACHE_ENTRIES = 500
+
+_cache: "OrderedDict[tuple, tuple[float, list[dict]]]" = OrderedDict()   # key -> (fetched_at, jobs)
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_inflight: dict[tuple, asyncio.Future] = {}     # de-duplicates concurrent fetches of one key
+_background: set[asyncio.Task] = set()           # strong refs so refresh tasks aren't GC'd
+
+
+def is_configured() -> bool:
+    return bool(settings.adzuna_app_id and settings.adzuna_app_key)
+
+
+def _client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    if loop not in _clients:
+        _clients[loop] = httpx.AsyncClient(timeout=10.0)
+    return _clients[loop]
+
+
+async def aclose():
+    """Close the current loop's client (called on app shutdown)."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client:
+        await client.aclose()
+
+
+def cache_key(role: str, location: str, page: int) -> tuple:
+    role = " ".join(role.lower().split()) or "software engineer"
+    location = " ".join(location.lower().split())
+    return (role, "" if location == "india" else location, page)
+
+
+def normalize_job(r: dict) -> dict:
+    """Map an Adzuna result onto the Job model's fields."""
+    # Adzuna's category is one object: {"tag": "it-jobs", "label": "IT Jobs"}
+    category = r.get("category") or {}
+    label = category.get("label", "") if isinstance(category, dict) else ""
+    return {
+        "title": r.get("title", "Untitled Role").replace("<strong>", "").replace("</strong>", ""),
+        "company": r.get("company", {}).get("display_name", "Unknown Company"),
+        "location": r.get("location", {}).get("display_name", "Remote / India"),
+        "salary": f"₹{r.get('salary_min', 'N/A')} - {r.get('salary_max', '')}",
+        "experience": "Verified listing",
+        "skills": [label] if label else [],
+        "type": "Remote" if "remote" in r.get("title", "").lower() else "Full Time",
+        "url": r.get("redirect_url", ""),
+    }
+
+
+async def fetch_raw(role: str, location: str, page: int = 1, per_page: int = RESULTS_PER_PAGE) -> list[dict]:
+    """One live Adzuna search returning raw results (no cache). Raises on HTTP/network errors."""
+    params = {
+        "app_id": settings.adzuna_app_id,
+        "app_key": settings.adzuna_app_key,
+        "results_per_page": per_page,
+        "what": role or "software engineer",
+        "content-type": "application/json",
+    }
+    if location and location.lower() != "india":
+        params["where"] = location
+    with span("adzuna"):
+        res = await _client().get(f"{settings.adzuna_base_url.rstrip('/')}/search/{page}", params=params)
+    res.raise_for_status()
+    return res.json().get("results", [])
+
+
+async def fetch(role: str, location: str, page: int = 1, per_page: int = RESULTS_PER_PAGE) -> list[dict]:
+    """One live Adzuna search, normalized to Job fields (malformed listings are skipped)."""
+    jobs = []
+    for r in await fetch_raw(role, location, page, per_page):
+        try:
+            jobs.append(normalize_job(r))
+        except Exception as e:
+            print(f"Adzuna: skipping malformed listing: {e}")
+    return jobs
+
+
+async def _refresh(key: tuple, role: str, location: str, page: int) -> list[dict]:
+    """Fetch and cache one key; concurrent callers for the same key share one request."""
+    if key in _inflight:
+        return await _inflight[key]
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        jobs = await fetch(role, location, page)
+        _cache[key] = (time.time(), jobs)
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_CACHE_ENTRIES:
+            _cache.popitem(last=False)
+        future.set_result(jobs)
+        return jobs
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()      # mark retrieved so an unawaited future doesn't log a warning
+        raise
+    finally:
+        del _inflight[key]
+
+
+def _refresh_in_background(key: tuple, role: str, location: str, page: int):
+    if key in _inflight:
+        return
+
+    async def run():
+        try:
+            await _refresh(key, role, location, page)
+        except Exception as e:
+            print(f"Adzuna background refresh failed for {key}: {e}")
+
+    task = asyncio.create_task(run())
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+
+
+async def search(role: str, location: str = "India", page: int = 1) -> tuple[list[dict], str] | None:
+    """
+    Cached search → (jobs, freshness) where freshness is "fresh", "stale" or
+    "live"; None if Adzuna isn't configured or a cold fetch fails.
+    """
+    if not is_configured():
+        return None
+    key = cache_key(role, location, page)
+    entry = _cache.get(key)
+    if entry:
+        fetched_at, jobs = entry
+        age = time.time() - fetched_at
+        if age < settings.jobs_cache_ttl_minutes * 60:
+            return jobs, "fresh"
+        if age < settings.jobs_cache_stale_minutes * 60:
+            _refresh_in_background(key, role, location, page)
+            return jobs, "stale"
+    try:
+        return await _refresh(key, role, location, page), "live"
+    except Exception as e:
+        print(f"Adzuna search failed for {key}: {e}")
+        if entry:   # too old to serve normally, but better than inventing listings
+            return entry[1], "stale"
+        return None
@@ -1,11 +1,74 @@
 """
 Groq AI Service — wraps the Groq Python SDK.
-All AI calls go through this service.
+All AI calls go through this service. Every call is tagged with the calling
+`feature` (resume, quiz, interview, career, learn, jobs, chat) and records
+token usage, latency and errors in app.core.metrics.
+
+Calls are bounded and failure-aware: each has a total time budget (per
+feature, or an explicit `timeout=` from the call site); 429, 5xx and
+connection errors are retried with full-jitter exponential backoff inside that
+budget (the SDK's own retries are off); slow non-streaming calls can be hedged
+with a duplicate request past a latency percentile; and a circuit breaker
+fails calls immediately with CircuitOpenError after repeated upstream
+failures, so routes drop to their fallbacks instead of waiting out timeouts.
 """
-from groq import Groq
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Iterator
+from groq import APIConnectionError, APIStatusError, Groq
 from app.core.config import settings
+from app.core import metrics, tracing
 
 _client: Groq | None = None
+_latencies: dict[str, deque] = {}     # feature -> recent successful call durations (hedge threshold)
+_hedge_pool = ThreadPoolExecutor(max_workers=32, thread_name_prefix="groq-hedge")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling Groq while the circuit breaker is open."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Groq circuit open; retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class _CircuitBreaker:
+    """
+    Closed → open after groq_breaker_failures consecutive failures; after
+    groq_breaker_reset_seconds one trial call is let through (half-open) and
+    its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial = False
+
+    def check(self):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            remaining = self._opened_at + settings.groq_breaker_reset_seconds - time.monotonic()
+            if remaining > 0 or self._trial:
+                raise CircuitOpenError(max(remaining, 1))
+            self._trial = True
+
+    def record(self, ok: bool):
+        with self._lock:
+            if ok:
+                self._failures, self._opened_at = 0, None
+            else:
+                self._failures += 1
+                if self._trial or self._failures >= settings.groq_breaker_failures:
+                    self._opened_at = time.monotonic()
+            self._trial = False
+
+
+_breaker = _CircuitBreaker()
 
 
 def get_groq_client() -> Groq:
@@ -18,20 +81,123 @@ def get_groq_client() -> Groq:
             print(f"DEBUG: Groq API Key loaded: {masked}")
         else:
             print("ERROR: Groq API Key is EMPTY!")
-        _client = Groq(api_key=key)
+        # Retries are done here (jittered, budgeted, breaker-aware), not by the SDK
+        _client = Groq(api_key=key, max_retries=0)
     return _client
 
 
+def _record(feature: str, started: float, usage=None, ok: bool = True):
+    elapsed = time.perf_counter() - started
+    metrics.llm_requests.inc(feature=feature, outcome="ok" if ok else "error")
+    metrics.llm_latency.observe(elapsed, feature=feature)
+    tracing.record("groq", elapsed)
+    if usage is not None:
+        metrics.llm_tokens.inc(usage.prompt_tokens or 0, feature=feature, kind="prompt")
+        metrics.llm_tokens.inc(usage.completion_tokens or 0, feature=feature, kind="completion")
+
+
+def _retry_reason(e: Exception) -> str | None:
+    """Why an error is worth retrying, or None if it isn't (4xx other than 429, bad output...)."""
+    if isinstance(e, APIStatusError):
+        if e.status_code == 429:
+            return "429"
+        return "5xx" if e.status_code >= 500 else None
+    if isinstance(e, APIConnectionError):     # includes timeouts
+        return "connection"
+    return None
+
+
+def _backoff(attempt: int, e: Exception) -> float:
+    cap = settings.groq_retry_cap_ms / 1000
+    if isinstance(e, APIStatusError) and e.status_code == 429:
+        try:
+            return min(float(e.response.headers.get("retry-after", "")), cap)
+        except ValueError:
+            pass
+    return random.uniform(0, min(cap, settings.groq_retry_base_ms / 1000 * 2 ** attempt))
+
+
+def _hedge_delay(feature: str) -> float | None:
+    window = _latencies.get(feature)
+    if not settings.groq_hedge_percentile or not window or len(window) < settings.groq_hedge_min_samples:
+        return None
+    ordered = sorted(window)
+    return ordered[min(int(len(ordered) * settings.groq_hedge_percentile / 100), len(ordered) - 1)]
+
+
+def _hedged(feature: str, call: Callable):
+    """Run `call`; if it outlives the feature's hedge percentile, race a duplicate and take the first success."""
+    delay = _hedge_delay(feature)
+    if delay is None:
+        return call()
+    first = _hedge_pool.submit(call)
+    done, _ = wait([first], timeout=delay)
+    if done:
+        return first.result()
+    metrics.llm_hedges.inc(feature=feature)
+    # The loser can't be cancelled mid-request; it finishes in the pool and is discarded
+    pending = {first, _hedge_pool.submit(call)}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+    raise first.exception()
+
+
+def _call(feature: str, timeout: float | None, create: Callable[[float], object], hedge: bool = True):
+    """
+    Run `create(attempt_timeout)` under the breaker with budgeted, jittered
+    retries; the whole call counts as one breaker success or failure.
+    Raises CircuitOpenError without calling Groq while the circuit is open.
+    """
+    try:
+        _breaker.check()
+    except CircuitOpenError:
+        metrics.llm_rejected.inc(feature=feature)
+        raise
+    budget = timeout or settings.groq_feature_timeouts.get(feature, settings.groq_timeout_seconds)
+    deadline = time.monotonic() + budget
+    attempt = 0
+    while True:
+        started = time.perf_counter()
+        remaining = max(deadline - time.monotonic(), 1.0)
+        try:
+            if hedge and attempt == 0:
+                result = _hedged(feature, lambda: create(remaining))
+            else:
+                result = create(remaining)
+        except Exception as e:
+            reason = _retry_reason(e)
+            delay = _backoff(attempt, e)
+            if reason is None or attempt >= settings.groq_max_retries or time.monotonic() + delay >= deadline:
+                # One breaker outcome per call, once retries are spent. Only 5xx and
+                # connection errors mean an outage; 429 and other API errors (400,
+                # 401...) still mean Groq answered.
+                _breaker.record(reason not in ("5xx", "connection"))
+                raise
+            metrics.llm_retries.inc(feature=feature, reason=reason)
+            time.sleep(delay)
+            attempt += 1
+            continue
+        _breaker.record(True)
+        _latencies.setdefault(feature, deque(maxlen=200)).append(time.perf_counter() - started)
+        return result
+
+
 def chat_completion(
     messages: list[dict],
     system: str = "",
     model: str | None = None,
     max_tokens: int = 1024,
     temperature: float = 0.7,
+    feature: str = "other",
+    timeout: float | None = None,
 ) -> str:
     """
     Send a chat completion request to Groq.
     Returns the assistant reply as a plain string.
+    `timeout` overrides the feature's total budget (seconds, retries included).
     """
     client = get_groq_client()
     full_messages = []
@@ -40,32 +206,126 @@ def chat_completion(
         full_messages.append({"role": "system", "content": system})
     full_messages.extend(messages)
 
-    response = client.chat.completions.create(
-        model=model or settings.groq_model,
-        messages=full_messages,
-        max_tokens=max_tokens,
-        temperature=temperature,
-    )
+    started = time.perf_counter()
+    try:
+        response = _call(feature, timeout, lambda attempt_timeout: client.chat.completions.create(
+            model=model or settings.groq_model,
+            messages=full_messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            timeout=attempt_timeout,
+        ))
+    except CircuitOpenError:
+        raise
+    except Exception:
+        _record(feature, started, ok=False)
+        raise
+    _record(feature, started, response.usage)
     return response.choices[0].message.content
 
 
+def stream_completion(
+    messages: list[dict],
+    system: str = "",
+    model: str | None = None,
+    max_tokens: int = 1024,
+    temperature: float = 0.7,
+    feature: str = "other",
+    timeout: float | None = None,
+) -> Iterator[str]:
+    """
+    Streaming variant of chat_completion.
+    Yields the assistant reply as text deltas while Groq generates it.
+    Retries only cover opening the stream; `timeout` then bounds each read.
+    """
+    client = get_groq_client()
+    full_messages = []
+
+    if system:
+        full_messages.append({"role": "system", "content": system})
+    full_messages.extend(messages)
+
+    started = time.perf_counter()
+    usage, ok, rejected = None, False, False
+    stream = None
+    try:
+        stream = _call(feature, timeout, lambda attempt_timeout: client.chat.completions.create(
+            model=model or settings.groq_model,
+            messages=full_messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True,
+            timeout=attempt_timeout,
+        ), hedge=False)
+        for chunk in stream:
+            # Groq reports usage on the final chunk
+            x_groq = getattr(chunk, "x_groq", None)
+            if x_groq is not None and getattr(x_groq, "usage", None) is not None:
+                usage = x_groq.usage
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+        ok = True
+    except GeneratorExit:
+        ok = True       # consumer stopped reading; not an upstream error
+        raise
+    except CircuitOpenError:
+        rejected = True
+        raise
+    except Exception:
+        if stream is not None:
+            _breaker.record(False)      # failed mid-stream, after _call counted the open as a success
+        raise
+    finally:
+        if not rejected:
+            _record(feature, started, usage, ok)
+
+
+def _json_system(system: str) -> str:
+    return (system + "\n\n" if system else "") + \
+        "IMPORTANT: Respond ONLY with valid JSON. No markdown, no explanation, no backticks."
+
+
 def json_completion(
     prompt: str,
     system: str = "",
     model: str | None = None,
     max_tokens: int = 2048,
+    feature: str = "other",
+    timeout: float | None = None,
 ) -> str:
     """
     Request a JSON-only response from Groq.
     Returns raw string — caller must parse JSON.
     """
-    json_system = (system + "\n\n" if system else "") + \
-        "IMPORTANT: Respond ONLY with valid JSON. No markdown, no explanation, no backticks."
-
     return chat_completion(
         messages=[{"role": "user", "content": prompt}],
-        system=json_system,
+        system=_json_system(system),
+        model=model,
+        max_tokens=max_tokens,
+        temperature=0.3,
+        feature=feature,
+        timeout=timeout,
+    )
+
+
+def json_stream_completion(
+    prompt: str,
+    system: str = "",
+    model: str | None = None,
+    max_tokens: int = 2048,
+    feature: str = "other",
+    timeout: float | None = None,
+) -> Iterator[str]:
+    """
+    Streaming variant of json_completion.
+    Yields raw JSON text deltas — pair with utils.iter_json_array_items to parse incrementally.
+    """
+    return stream_completion(
+        messages=[{"role": "user", "content": prompt}],
+        system=_json_system(system),
         model=model,
         max_tokens=max_tokens,
         temperature=0.3,
+        feature=feature,
+        timeout=timeout,
     )
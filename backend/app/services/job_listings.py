@@ -0,0 +1,225 @@
+"""
+Local job listings — scheduled ingestion from Adzuna plus indexed search.
+A sync pulls several pages per popular role concurrently, normalizes each
+listing (canonical skills from the taxonomy, numeric salary), de-duplicates on
+company + title + location and upserts into the local store, with a skill
+table and a location column indexed for /jobs/list filters and pagination.
+Experience (level and minimum years) is inferred from the title and description.
+Listings not seen again within job_listing_ttl_days are dropped. Every worker
+runs the schedule, but a shared next-run time in the local store lets only one
+of them sync per interval, also across restarts.
+"""
+import asyncio
+import hashlib
+import json
+import re
+import time
+from app.core.config import settings
+from app.core.local_db import get_local_db
+from app.services import adzuna_service, skill_taxonomy
+
+_TAGS = re.compile(r"</?strong>")
+_YEARS = re.compile(r"\b(\d{1,2})\s*(?:\+|(?:-|–|to)\s*\d{1,2})?\s*\+?\s*(?:years?|yrs?)\b")
+ENTRY_WORDS = {"intern", "internship", "fresher", "freshers", "graduate", "trainee", "junior", "jr", "entry"}
+SENIOR_WORDS = {"senior", "sr", "lead", "principal", "staff", "manager", "head", "architect", "director"}
+EXPERIENCE_LEVELS = ("entry", "mid", "senior")
+
+
+def _key(*parts: str) -> str:
+    return " ".join(" ".join(parts).lower().split())
+
+
+def listing_id(company: str, title: str, location: str) -> str:
+    """Dedupe key: the same role at the same company and place is one listing."""
+    return hashlib.sha1("\x00".join(_key(p) for p in (company, title, location)).encode("utf-8")).hexdigest()
+
+
+def experience(title: str, description: str) -> tuple[str, int | None, str]:
+    """(level, minimum years or None, display label) for a listing."""
+    match = _YEARS.search(description.lower()) or _YEARS.search(title.lower())
+    years = int(match.group(1)) if match else None
+    words = set(_key(title).replace("/", " ").replace(".", " ").split())
+    if words & ENTRY_WORDS:
+        level = "entry"
+    elif words & SENIOR_WORDS:
+        level = "senior"
+    elif years is not None:
+        level = "entry" if years < 2 else "mid" if years < 5 else "senior"
+    else:
+        level = "mid"
+    label = f"{years}+ years" if years is not None else f"{level.capitalize()} level"
+    return level, years, label
+
+
+def normalize(raw: dict) -> dict:
+    job = adzuna_service.normalize_job(raw)
+    description = _TAGS.sub("", raw.get("description", ""))
+    skills = skill_taxonomy.extract_skills(f"{job['title']} {description}") or [s for s in job["skills"] if s]
+    level, years, label = experience(job["title"], description)
+    job.update(
+        id=listing_id(job["company"], job["title"], job["location"]),
+        skills=skills,
+        experience=label,
+        experience_level=level,
+        experience_years=years,
+        salary_min=raw.get("salary_min"),
+        salary_max=raw.get("salary_max"),
+        posted_at=raw.get("created", ""),
+    )
+    return job
+
+
+def store(jobs: list[dict]) -> int:
+    """Upsert normalized listings and their skill index rows; returns the number of unique listings."""
+    unique = {j["id"]: j for j in jobs}
+    now = time.time()
+    conn = get_local_db()
+    conn.executemany(
+        """
+        INSERT INTO job_listings (id, title, company, location, location_key, salary, salary_min, salary_max,
+                                  type, url, skills_json, posted_at, last_seen,
+                                  experience, experience_level, experience_years)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (id) DO UPDATE SET
+            salary = excluded.salary, salary_min = excluded.salary_min, salary_max = excluded.salary_max,
+            type = excluded.type, url = excluded.url, skills_json = excluded.skills_json,
+            posted_at = excluded.posted_at, last_seen = excluded.last_seen, experience = excluded.experience,
+            experience_level = excluded.experience_level, experience_years = excluded.experience_years
+        """,
+        [
+            (j["id"], j["title"], j["company"], j["location"], _key(j["location"]), j["salary"], j["salary_min"],
+             j["salary_max"], j["type"], j["url"], json.dumps(j["skills"]), j["posted_at"], now,
+             j["experience"], j["experience_level"], j["experience_years"])
+            for j in unique.values()
+        ],
+    )
+    conn.executemany("DELETE FROM job_listing_skills WHERE job_id = ?", [(i,) for i in unique])
+    conn.executemany(
+        "INSERT OR IGNORE INTO job_listing_skills (skill, job_id) VALUES (?, ?)",
+        [(s.lower(), j["id"]) for j in unique.values() for s in j["skills"]],
+    )
+    expired = now - settings.job_listing_ttl_days * 86400
+    conn.execute("DELETE FROM job_listing_skills WHERE job_id IN (SELECT id FROM job_listings WHERE last_seen < ?)", (expired,))
+    conn.execute("DELETE FROM job_listings WHERE last_seen < ?", (expired,))
+    conn.commit()
+    return len(unique)
+
+
+async def sync(roles: list[str] | None = None) -> dict:
+    """Pull job_sync_pages pages for each role concurrently and store them."""
+    roles = roles or settings.job_sync_roles
+    limit = asyncio.Semaphore(settings.job_sync_concurrency)
+    failures = 0
+
+    async def pull(role: str, page: int) -> list[dict]:
+        nonlocal failures
+        async with limit:
+            try:
+                return await adzuna_service.fetch_raw(role, "India", page, settings.job_sync_per_page)
+            except Exception as e:
+                failures += 1
+                print(f"Job sync: {role} page {page} failed: {e}")
+                return []
+
+    started = time.time()
+    pages = await asyncio.gather(*(pull(r, p) for r in roles for p in range(1, settings.job_sync_pages + 1)))
+    jobs, malformed = [], 0
+    for raw in (raw for results in pages for raw in results):
+        try:
+            jobs.append(normalize(raw))
+        except Exception as e:     # one odd listing must not abort the whole sync
+            malformed += 1
+            print(f"Job sync: skipping malformed listing: {e}")
+    stored = await asyncio.to_thread(store, jobs)
+    return {
+        "roles": len(roles),
+        "pages": len(pages),
+        "failed_pages": failures,
+        "fetched": len(jobs),
+        "malformed": malformed,
+        "stored": stored,
+        "seconds": round(time.time() - started, 2),
+    }
+
+
+def claim_run(interval_seconds: float) -> float:
+    """
+    Atomically claim the next scheduled sync across all worker processes.
+    Returns 0 if this caller should sync now, else the seconds until the next run is due.
+    """
+    now = time.time()
+    conn = get_local_db()
+    conn.execute("INSERT OR IGNORE INTO job_sync_state (name, next_run_at) VALUES ('job_sync', 0)")
+    claimed = conn.execute(
+        "UPDATE job_sync_state SET next_run_at = ? WHERE name = 'job_sync' AND next_run_at <= ?",
+        (now + interval_seconds, now),
+    ).rowcount
+    next_run_at = conn.execute("SELECT next_run_at FROM job_sync_state WHERE name = 'job_sync'").fetchone()[0]
+    conn.commit()
+    return 0 if claimed else max(next_run_at - now, 1)
+
+
+async def run_schedule():
+    """
+    Background loop started with each worker: sync whenever this worker claims
+    the due run, otherwise sleep until the next one (every job_sync_interval_minutes).
+    """
+    interval = settings.job_sync_interval_minutes * 60
+    while True:
+        wait = await asyncio.to_thread(claim_run, interval)
+        if wait:
+            await asyncio.sleep(min(wait, interval))
+            continue
+        try:
+            print(f"Job sync finished: {await sync()}")
+        except Exception as e:
+            print(f"Job sync failed: {e}")
+
+
+def search(role: str = "", location: str = "", skills: list[str] | None = None, min_salary: float | None = None,
+           job_type: str = "", page: int = 1, page_size: int = 6, experience_level: str = "",
+           max_years: int | None = None) -> tuple[list[dict], int]:
+    """
+    Filtered, paginated listings from the local store → (jobs, total matches).
+    `max_years` keeps listings asking for at most that many years (or not saying).
+    """
+    where, params = [], []
+    for word in _key(role).split():
+        where.append("j.title LIKE ?")
+        params.append(f"%{word}%")
+    location = _key(location)
+    if location and location != "india":
+        where.append("j.location_key LIKE ?")
+        params.append(f"%{location}%")
+    for skill in skills or []:
+        where.append("j.id IN (SELECT job_id FROM job_listing_skills WHERE skill = ?)")
+        params.append(skill_taxonomy.normalize_skill(skill).lower())
+    if min_salary:
+        where.append("COALESCE(j.salary_max, j.salary_min) >= ?")
+        params.append(min_salary)
+    if job_type:
+        where.append("j.type = ?")
+        params.append(job_type)
+    if experience_level:
+        where.append("j.experience_level = ?")
+        params.append(experience_level)
+    if max_years is not None:
+        where.append("(j.experience_years IS NULL OR j.experience_years <= ?)")
+        params.append(max_years)
+    clause = f"WHERE {' AND '.join(where)}" if where else ""
+
+    conn = get_local_db()
+    total = conn.execute(f"SELECT COUNT(*) FROM job_listings j {clause}", params).fetchone()[0]
+    rows = conn.execute(
+        f"SELECT * FROM job_listings j {clause} ORDER BY j.posted_at DESC, j.last_seen DESC LIMIT ? OFFSET ?",
+        (*params, page_size, (page - 1) * page_size),
+    ).fetchall()
+    jobs = [
+        {
+            "title": r["title"], "company": r["company"], "location": r["location"], "salary": r["salary"],
+            "experience": r["experience"] or "Verified listing", "skills": json.loads(r["skills_json"]),
+            "type": r["type"], "url": r["url"],
+        }
+        for r in rows
+    ]
+    return jobs, total
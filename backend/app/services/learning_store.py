@@ -0,0 +1,92 @@
+"""
+Per-user store for generated learning paths.
+Each user has one current path with a version counter and the fingerprint of
+the inputs it was generated from (role, quiz scores, skills, weekly hours), so
+/learn/generate only calls the LLM again when those inputs actually change.
+"""
+import hashlib
+import json
+import threading
+import time
+from typing import Callable
+from app.core.local_db import get_local_db
+from app.services import skill_taxonomy
+
+_modify_lock = threading.Lock()
+
+
+def fingerprint(inputs: dict) -> str:
+    """Order- and case-insensitive hash of the inputs that shape a learning path."""
+    canonical = {
+        "target_role": " ".join(inputs.get("target_role", "").lower().split()),
+        "quiz_scores": sorted(
+            (" ".join(q["domain"].lower().split()), q["score"], q.get("difficulty", "medium").lower())
+            for q in inputs.get("quiz_scores", [])
+        ),
+        "current_skills": sorted({skill_taxonomy.normalize_skill(s).lower() for s in inputs.get("current_skills", []) if s.strip()}),
+        "weekly_hours": inputs.get("weekly_hours", 10),
+    }
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def get(user_id: str) -> dict | None:
+    """The user's current path record: {version, fingerprint, inputs, path, updated_at}."""
+    row = get_local_db().execute(
+        "SELECT version, fingerprint, inputs_json, path_json, updated_at FROM learning_paths WHERE user_id = ?",
+        (user_id,),
+    ).fetchone()
+    if not row:
+        return None
+    return {
+        "version": row["version"],
+        "fingerprint": row["fingerprint"],
+        "inputs": json.loads(row["inputs_json"]),
+        "path": json.loads(row["path_json"]),
+        "updated_at": row["updated_at"],
+    }
+
+
+def update(user_id: str, version: int, path: dict) -> bool:
+    """Overwrite the stored path in place, only if it is still at `version`."""
+    conn = get_local_db()
+    cur = conn.execute(
+        "UPDATE learning_paths SET path_json = ?, updated_at = ? WHERE user_id = ? AND version = ?",
+        (json.dumps(path), time.time(), user_id, version),
+    )
+    conn.commit()
+    return cur.rowcount > 0
+
+
+def modify(user_id: str, fn: Callable[[dict], dict | None], version: int | None = None) -> bool:
+    """
+    Read-modify-write the stored path in place (no version bump), e.g. to record
+    link checks or rewritten reasons. `fn` returns the new path, or None to skip.
+    With `version`, only applies while that version is still current.
+    """
+    with _modify_lock:
+        stored = get(user_id)
+        if not stored or (version is not None and stored["version"] != version):
+            return False
+        path = fn(stored["path"])
+        return path is not None and update(user_id, stored["version"], path)
+
+
+def save(user_id: str, inputs: dict, path: dict) -> int:
+    """Store a new version of the user's path and return its version number."""
+    conn = get_local_db()
+    conn.execute(
+        """
+        INSERT INTO learning_paths (user_id, version, fingerprint, inputs_json, path_json, updated_at)
+        VALUES (?, 1, ?, ?, ?, ?)
+        ON CONFLICT (user_id) DO UPDATE SET
+            version = version + 1,
+            fingerprint = excluded.fingerprint,
+            inputs_json = excluded.inputs_json,
+            path_json = excluded.path_json,
+            updated_at = excluded.updated_at
+        """,
+        (user_id, fingerprint(inputs), json.dumps(inputs), json.dumps(path), time.time()),
+    )
+    version = conn.execute("SELECT version FROM learning_paths WHERE user_id = ?", (user_id,)).fetchone()["version"]
+    conn.commit()
+    return version
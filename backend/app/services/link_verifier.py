@@ -0,0 +1,194 @@
+"""
+Link verification for recommended learning resources.
+One pooled httpx client per event loop (keep-alive + TLS reuse), HEAD first
+with a GET fallback for servers that reject HEAD, a concurrency cap per host,
+and results persisted in the local store with separate TTLs for reachable and
+unreachable links, so a popular playlist is checked once for everyone.
+Background jobs record each outcome as it completes, for polling or SSE.
+"""
+import asyncio
+import json
+import time
+import uuid
+import weakref
+from urllib.parse import urlsplit
+import httpx
+from app.core.config import settings
+from app.core.local_db import get_local_db
+from app.core.tracing import span
+
+# Mask user-agent to avoid simple bot blocks
+HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"}
+HEAD_FALLBACK_STATUSES = {400, 403, 405, 429, 501}   # servers that refuse or throttle HEAD but may serve GET
+JOB_TTL_HOURS = 24
+
+
+class _LoopState:
+    """Client and per-host semaphores bound to one event loop (asyncio primitives can't cross loops)."""
+
+    def __init__(self):
+        self.client = httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=settings.link_verify_timeout_seconds,
+            headers=HEADERS,
+            limits=httpx.Limits(max_connections=settings.link_verify_max_connections, max_keepalive_connections=10),
+        )
+        self.host_limits: dict[str, asyncio.Semaphore] = {}
+
+    def host_limit(self, host: str) -> asyncio.Semaphore:
+        if host not in self.host_limits:
+            self.host_limits[host] = asyncio.Semaphore(settings.link_verify_per_host)
+        return self.host_limits[host]
+
+
+# The API loop lives for the whole process; background tasks run their own
+# short-lived loops via run_sync(), which closes that loop's client at the end.
+_states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
+
+
+def _state() -> _LoopState:
+    loop = asyncio.get_running_loop()
+    if loop not in _states:
+        _states[loop] = _LoopState()
+    return _states[loop]
+
+
+async def aclose():
+    """Close the current loop's client (called on app shutdown)."""
+    state = _states.pop(asyncio.get_running_loop(), None)
+    if state:
+        await state.client.aclose()
+
+
+def run_sync(coro):
+    """asyncio.run() for verification work in worker threads, closing the loop's client afterwards."""
+    async def main():
+        try:
+            return await coro
+        finally:
+            await aclose()
+    return asyncio.run(main())
+
+
+def cached(url: str) -> bool | None:
+    """The cached outcome for a URL, or None if it has not been checked recently."""
+    row = get_local_db().execute("SELECT ok, checked_at FROM link_checks WHERE url = ?", (url,)).fetchone()
+    if not row:
+        return None
+    ttl_hours = settings.link_cache_ok_hours if row["ok"] else settings.link_cache_fail_hours
+    if row["checked_at"] < time.time() - ttl_hours * 3600:
+        return None
+    return bool(row["ok"])
+
+
+def _remember(url: str, ok: bool, status: int):
+    conn = get_local_db()
+    conn.execute(
+        "INSERT OR REPLACE INTO link_checks (url, ok, status, checked_at) VALUES (?, ?, ?, ?)",
+        (url, int(ok), status, time.time()),
+    )
+    conn.commit()
+
+
+async def _status(client: httpx.AsyncClient, url: str) -> int:
+    """Final status code after redirects; 0 if the host could not be reached."""
+    try:
+        r = await client.head(url)
+        if r.status_code not in HEAD_FALLBACK_STATUSES:
+            return r.status_code
+        # Stream so only the headers are read, not the whole page
+        async with client.stream("GET", url) as r:
+            return r.status_code
+    except (httpx.HTTPError, httpx.InvalidURL, ValueError):
+        return 0
+
+
+async def verify_url(url: str) -> bool:
+    """True if the URL answers 200 (cached)."""
+    if not url or not url.startswith("http"):
+        return False
+    try:
+        host = urlsplit(url).netloc.lower()
+    except ValueError:      # malformed, e.g. "http://[bad"
+        return False
+    if not host:
+        return False
+    hit = cached(url)
+    if hit is not None:
+        return hit
+    state = _state()
+    async with state.host_limit(host):
+        with span("verify_url"):
+            status = await _status(state.client, url)
+    ok = status == 200
+    _remember(url, ok, status)
+    return ok
+
+
+async def verify_urls(urls: list[str]) -> dict[str, bool]:
+    """Verify many URLs concurrently (duplicates checked once)."""
+    unique = list(dict.fromkeys(urls))
+    results = await asyncio.gather(*(verify_url(u) for u in unique))
+    return dict(zip(unique, results))
+
+
+# ── Background verification jobs ─────────────────────────────────────────────
+# Callers return their response first and verify afterwards; each outcome is
+# recorded as it arrives so clients can poll the job or follow it over SSE.
+
+def start_job(urls: list[str]) -> str:
+    job_id = uuid.uuid4().hex
+    now = time.time()
+    conn = get_local_db()
+    conn.execute(
+        "INSERT INTO link_verifications (id, status, urls_json, results_json, created_at) VALUES (?, 'pending', ?, '{}', ?)",
+        (job_id, json.dumps(list(dict.fromkeys(urls))), now),
+    )
+    conn.execute("DELETE FROM link_verifications WHERE created_at < ?", (now - JOB_TTL_HOURS * 3600,))
+    conn.commit()
+    return job_id
+
+
+def get_job(job_id: str) -> dict | None:
+    row = get_local_db().execute(
+        "SELECT status, urls_json, results_json FROM link_verifications WHERE id = ?", (job_id,)
+    ).fetchone()
+    if not row:
+        return None
+    return {"status": row["status"], "urls": json.loads(row["urls_json"]), "results": json.loads(row["results_json"])}
+
+
+def _record(job_id: str, url: str, ok: bool):
+    # Updated in Python: a URL is not safe to splice into a JSON path (quotes, brackets...)
+    conn = get_local_db()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute("SELECT results_json FROM link_verifications WHERE id = ?", (job_id,)).fetchone()
+        if row:
+            results = json.loads(row["results_json"])
+            results[url] = ok
+            conn.execute("UPDATE link_verifications SET results_json = ? WHERE id = ?", (json.dumps(results), job_id))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+async def run_job(job_id: str) -> dict[str, bool]:
+    """Verify a job's URLs, recording each result as soon as it completes."""
+    job = get_job(job_id)
+    results: dict[str, bool] = {}
+
+    async def check(url: str) -> tuple[str, bool]:
+        return url, await verify_url(url)
+
+    try:
+        for next_result in asyncio.as_completed([check(u) for u in job["urls"] if u not in job["results"]]):
+            url, ok = await next_result
+            results[url] = ok
+            _record(job_id, url, ok)
+    finally:
+        conn = get_local_db()
+        conn.execute("UPDATE link_verifications SET status = 'done' WHERE id = ?", (job_id,))
+        conn.commit()
+    return {**job["results"], **results}
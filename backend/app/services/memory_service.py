@@ -4,6 +4,7 @@ Stores memories as JSON lines under data/memories/, one file per query.
 """
 import os
 import json
+from app.core.tracing import span
 
 SERVICE_DIR = os.path.dirname(os.path.abspath(__file__))
 MEM_PATH = os.path.join(SERVICE_DIR, "..", "..", "data", "memories")
@@ -21,19 +22,21 @@ def _load():
 def retain_memory(text: str):
     """Store a fact or interaction."""
     try:
-        _load()
-        _memories.append(text)
-        with open(_MEM_FILE, "a", encoding="utf-8") as f:
-            f.write(text.replace("\n", " ") + "\n")
+        with span("memory_retain"):
+            _load()
+            _memories.append(text)
+            with open(_MEM_FILE, "a", encoding="utf-8") as f:
+                f.write(text.replace("\n", " ") + "\n")
     except Exception as e:
         print(f"Memory Retain Error: {e}")
 
 def recall_memories(query: str) -> list[str]:
     """Return memories that contain any of the query words."""
     try:
-        _load()
-        words = set(query.lower().split())
-        results = [m for m in _memories if any(w in m.lower() for w in words)]
+        with span("memory_recall"):
+            _load()
+            words = set(query.lower().split())
+            results = [m for m in _memories if any(w in m.lower() for w in words)]
         return results[-10:]  # return at most last 10 relevant memories
     except Exception as e:
         print(f"Memory Recall Error: {e}")
@@ -0,0 +1,73 @@
+"""
+Interview question cache — pools of pre-generated questions per (role, mode, difficulty).
+Each user draws questions they have not seen yet; callers refill a pool in the
+background when a user's unseen supply runs low. In-process only: a restart
+simply starts with empty pools.
+"""
+import threading
+from collections import OrderedDict
+
+MAX_POOL_SIZE = 60        # questions kept per (role, mode, difficulty)
+MAX_TRACKED_VIEWERS = 5000
+
+_lock = threading.Lock()
+_pools: dict[tuple, list[dict]] = {}
+_seen: "OrderedDict[tuple, set[str]]" = OrderedDict()   # (viewer, pool key) -> question texts
+_refilling: set[tuple] = set()
+
+
+def pool_key(role: str, mode: str, difficulty: str) -> tuple:
+    return (role.strip().lower(), mode.strip().lower(), difficulty.strip().lower())
+
+
+def _text_key(question: dict) -> str:
+    return " ".join(question.get("question", "").lower().split())
+
+
+def _seen_for(viewer: str, key: tuple) -> set[str]:
+    seen = _seen.setdefault((viewer, key), set())
+    _seen.move_to_end((viewer, key))
+    while len(_seen) > MAX_TRACKED_VIEWERS:
+        _seen.popitem(last=False)
+    return seen
+
+
+def add_questions(key: tuple, questions: list[dict]):
+    """Add freshly generated questions to a pool, skipping duplicates."""
+    with _lock:
+        pool = _pools.setdefault(key, [])
+        known = {_text_key(q) for q in pool}
+        for q in questions:
+            if _text_key(q) and _text_key(q) not in known:
+                pool.append(q)
+                known.add(_text_key(q))
+        del pool[:-MAX_POOL_SIZE]
+
+
+def take_unseen(key: tuple, viewer: str, n: int) -> list[dict]:
+    """Return up to n questions this viewer has not seen, marking them as seen."""
+    with _lock:
+        seen = _seen_for(viewer, key)
+        picked = [q for q in _pools.get(key, []) if _text_key(q) not in seen][:n]
+        seen.update(_text_key(q) for q in picked)
+        return picked
+
+
+def unseen_count(key: tuple, viewer: str) -> int:
+    with _lock:
+        seen = _seen.get((viewer, key), set())
+        return sum(1 for q in _pools.get(key, []) if _text_key(q) not in seen)
+
+
+def start_refill(key: tuple) -> bool:
+    """Claim the refill slot for a pool; False if a refill is already running."""
+    with _lock:
+        if key in _refilling:
+            return False
+        _refilling.add(key)
+        return True
+
+
+def finish_refill(key: tuple):
+    with _lock:
+        _refilling.discard(key)
@@ -0,0 +1,130 @@
+"""
+Local catalog of verified learning resources, served by /learn/resources.
+Seeded from resources that passed link verification in learning paths (and
+from /learn/resources' own LLM fallback) and bulk-importable by admins.
+Rows live in the local store; an in-memory inverted index over topic words
+and canonical skills, with level and platform filters, answers searches
+without touching SQLite or the LLM.
+"""
+import json
+import threading
+import time
+from app.core.local_db import get_local_db
+from app.services import skill_taxonomy
+
+FIELDS = ("title", "type", "platform", "search_query", "duration", "difficulty", "why")
+STOPWORDS = {
+    "a", "an", "and", "the", "for", "to", "of", "in", "on", "with", "by", "from", "how",
+    "course", "tutorial", "tutorials", "full", "complete", "guide", "introduction", "intro",
+    "learn", "learning", "beginner", "beginners", "intermediate", "advanced", "playlist",
+}
+
+_lock = threading.Lock()
+_records: dict[str, dict] = {}          # url → resource fields + topics
+_index: dict[str, set[str]] = {}        # term → urls
+_record_terms: dict[str, set[str]] = {} # url → terms
+_loaded = False
+
+
+def _terms(text: str) -> set[str]:
+    """Index terms: canonical skills (as "skill:<name>") plus plain topic words."""
+    words = {w for w in skill_taxonomy.normalize_text(text).split() if len(w) > 1 and w not in STOPWORDS}
+    skills = {"skill:" + s.lower() for s in skill_taxonomy.extract_skills(text)}
+    return words | skills
+
+
+def _index_record(record: dict):
+    url = record["url"]
+    for term in _record_terms.get(url, ()):
+        _index[term].discard(url)
+    _records[url] = record
+    _record_terms[url] = _terms(" ".join([record["title"], *record["topics"]]))
+    for term in _record_terms[url]:
+        _index.setdefault(term, set()).add(url)
+
+
+def load():
+    """Build the in-memory index from the local store. Idempotent."""
+    global _loaded
+    with _lock:
+        if _loaded:
+            return
+        for row in get_local_db().execute("SELECT url, resource_json, topics_json FROM resource_catalog"):
+            _index_record({**json.loads(row["resource_json"]), "url": row["url"], "topics": json.loads(row["topics_json"])})
+        _loaded = True
+
+
+def add(resources: list[dict], topics: list[str], source: str) -> int:
+    """
+    Insert or refresh verified resources, merging their topics (`topics` plus any
+    per-resource "topics" key) with those already recorded. `resources` are
+    Resource-shaped dicts. Returns how many were written.
+    """
+    load()
+    now = time.time()
+    rows = []
+    with _lock:
+        for r in resources:
+            url = (r.get("url") or "").strip()
+            if not url.startswith("http"):
+                continue
+            entry_topics = [" ".join(t.split()) for t in [*topics, *r.get("topics", [])] if t and t.strip()]
+            merged = list(_records.get(url, {}).get("topics", []))
+            for t in entry_topics:
+                if t.lower() not in {k.lower() for k in merged}:
+                    merged.append(t)
+            record = {**{f: r.get(f) or "" for f in FIELDS}, "url": url, "topics": merged}
+            _index_record(record)
+            rows.append((url, json.dumps({f: record[f] for f in FIELDS}), json.dumps(merged), source, now))
+    if rows:
+        conn = get_local_db()
+        conn.executemany(
+            """
+            INSERT INTO resource_catalog (url, resource_json, topics_json, source, updated_at) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (url) DO UPDATE SET
+                resource_json = excluded.resource_json,
+                topics_json = excluded.topics_json,
+                updated_at = excluded.updated_at
+            """,
+            rows,
+        )
+        conn.commit()
+    return len(rows)
+
+
+def search(topic: str, level: str = "", platform: str = "", limit: int = 4) -> list[dict]:
+    """
+    Best catalog matches for a topic. Every skill named in the query must match;
+    otherwise at least half the query words must. Level and platform are exact
+    filters when given; an entry with no difficulty counts as any level.
+    """
+    load()
+    terms = _terms(topic)
+    if not terms:
+        return []
+    skills = {t for t in terms if t.startswith("skill:")}
+    words = terms - skills
+    with _lock:
+        hits: dict[str, int] = {}
+        for term in terms:
+            for url in _index.get(term, ()):
+                hits[url] = hits.get(url, 0) + (2 if term in skills else 1)
+        matches = []
+        for url, score in hits.items():
+            record, record_terms = _records[url], _record_terms[url]
+            if skills and not skills <= record_terms:
+                continue
+            if not skills and len(words & record_terms) * 2 < len(words):
+                continue
+            if level and record["difficulty"] and record["difficulty"].lower() != level.lower():
+                continue
+            if platform and platform.lower() not in (record["platform"].lower(), record["type"].lower()):
+                continue
+            matches.append((score, record))
+    matches.sort(key=lambda m: m[0], reverse=True)
+    return [{f: r[f] for f in (*FIELDS, "url")} for _, r in matches[:limit]]
+
+
+def size() -> int:
+    load()
+    return len(_records)
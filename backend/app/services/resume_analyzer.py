@@ -0,0 +1,121 @@
+"""
+Local resume pre-analysis — the deterministic half of /resume/analyze.
+Splits a resume into sections, detects skills against the bundled taxonomy,
+computes present/missing keywords for the target role and builds a compact
+digest, so the LLM only has to judge the subjective parts.
+"""
+import re
+from pydantic import BaseModel
+from app.services import skill_taxonomy
+
+SECTION_ALIASES = {
+    "summary": ["summary", "professional summary", "profile", "about me", "about", "objective", "career objective"],
+    "experience": ["experience", "work experience", "professional experience", "employment", "employment history",
+                   "work history", "internships", "internship", "internship experience"],
+    "education": ["education", "academics", "academic background", "qualifications", "educational qualifications"],
+    "skills": ["skills", "technical skills", "key skills", "core competencies", "technologies", "tech stack", "tools"],
+    "projects": ["projects", "personal projects", "academic projects", "key projects"],
+    "certifications": ["certifications", "certificates", "courses", "achievements", "awards", "achievements and awards"],
+}
+_HEADING_TO_SECTION = {alias: name for name, aliases in SECTION_ALIASES.items() for alias in aliases}
+
+ACTION_VERBS = {
+    "built", "developed", "designed", "led", "implemented", "created", "improved", "reduced", "increased",
+    "optimized", "launched", "automated", "architected", "deployed", "migrated", "delivered", "managed",
+    "mentored", "scaled", "owned", "shipped", "streamlined", "analyzed", "engineered", "integrated",
+}
+
+_BULLET = re.compile(r"^\s*(?:[-*•▪●◦‣]|\d+[.)])\s+")
+_METRIC = re.compile(r"\d+(?:\.\d+)?\s*(?:%|x\b|k\b|m\b|\+|users|ms\b|hrs?\b|hours|lpa|crore|lakh|₹|\$)|[₹$]\s*\d", re.I)
+
+
+class ResumeDigest(BaseModel):
+    matched_role: str = ""
+    word_count: int
+    sections: dict[str, int]          # section → word count ("header" = text before the first heading)
+    missing_sections: list[str]
+    skills_found: list[str]
+    present_keywords: list[str]
+    missing_keywords: list[str]
+    keyword_score: int
+    bullet_count: int
+    quantified_bullets: int
+    action_verb_bullets: int
+    has_email: bool
+    has_phone: bool
+    has_links: bool
+
+
+def split_sections(text: str) -> dict[str, str]:
+    """Split resume text on recognised headings; text before the first heading goes to "header"."""
+    sections: dict[str, list[str]] = {"header": []}
+    current = "header"
+    for line in text.splitlines():
+        heading = re.sub(r"[^a-z& ]+", " ", line.lower()).replace("&", "and")
+        heading = " ".join(heading.split())
+        if heading in _HEADING_TO_SECTION and len(line.strip()) <= 40:
+            current = _HEADING_TO_SECTION[heading]
+            sections.setdefault(current, [])
+            continue
+        sections[current].append(line)
+    return {name: "\n".join(lines).strip() for name, lines in sections.items() if "\n".join(lines).strip()}
+
+
+def _bullets(section_text: str) -> list[str]:
+    lines = [l.strip() for l in section_text.splitlines() if l.strip()]
+    marked = [_BULLET.sub("", l) for l in lines if _BULLET.match(l)]
+    return marked or [l for l in lines if len(l.split()) >= 5]
+
+
+def analyze(text: str, target_role: str = "", required: list[str] | None = None) -> tuple[ResumeDigest, dict[str, str]]:
+    """
+    Return the digest plus the raw section texts (used to build the LLM excerpt).
+    `required` overrides the role's keywords (e.g. learned for a role the taxonomy
+    doesn't know); by default they come from the taxonomy.
+    """
+    sections = split_sections(text)
+    skills = skill_taxonomy.extract_skills(text)
+    if required is None:
+        required = skill_taxonomy.role_skills(target_role) if target_role else []
+
+    if required:
+        present = [s for s in required if s in skills]
+        missing = [s for s in required if s not in skills]
+        keyword_score = round(len(present) / len(required) * 100)
+    else:
+        present, missing = skills, []
+        keyword_score = min(100, len(skills) * 8)
+
+    bullets = [b for name in ("experience", "projects") for b in _bullets(sections.get(name, ""))]
+    digest = ResumeDigest(
+        matched_role=skill_taxonomy.match_role(target_role) or "",
+        word_count=len(text.split()),
+        sections={name: len(body.split()) for name, body in sections.items()},
+        missing_sections=[s for s in ("summary", "experience", "education", "skills") if s not in sections],
+        skills_found=skills,
+        present_keywords=present,
+        missing_keywords=missing,
+        keyword_score=keyword_score,
+        bullet_count=len(bullets),
+        quantified_bullets=sum(1 for b in bullets if _METRIC.search(b)),
+        action_verb_bullets=sum(1 for b in bullets if b.split() and b.split()[0].lower().strip(",.") in ACTION_VERBS),
+        has_email=bool(re.search(r"[\w.+-]+@[\w-]+\.[\w.]+", text)),
+        has_phone=bool(re.search(r"(?:\+91[\s-]?)?[6-9]\d{4}[\s-]?\d{5}\b|\+?\d[\d\s-]{8,}\d", text)),
+        has_links=bool(re.search(r"linkedin\.com|github\.com|https?://", text, re.I)),
+    )
+    return digest, sections
+
+
+def excerpt(sections: dict[str, str], max_bullets: int = 6) -> str:
+    """A short, representative slice of the resume for the LLM's subjective judgement."""
+    parts = []
+    if sections.get("summary"):
+        parts.append("Summary: " + sections["summary"][:300])
+    bullets = [b for name in ("experience", "projects") for b in _bullets(sections.get(name, ""))]
+    # Prefer quantified bullets, then keep original order
+    bullets.sort(key=lambda b: 0 if _METRIC.search(b) else 1)
+    for b in bullets[:max_bullets]:
+        parts.append("- " + b[:160])
+    if sections.get("education"):
+        parts.append("Education: " + " ".join(sections["education"].split())[:200])
+    return "\n".join(parts)
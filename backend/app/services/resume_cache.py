@@ -0,0 +1,108 @@
+"""
+Content-addressed cache for resume analyses.
+Results are keyed by a hash of the normalized resume text + target role, and
+every analysis also records a hash per scored section so an edited resume can
+be matched to its previous version and only the changed sections re-scored.
+Previous versions are only looked up among the submitting client's own
+analyses (`resume_versions`), never across users.
+"""
+import hashlib
+import json
+import time
+from app.core.config import settings
+from app.core.local_db import get_local_db
+
+# A previous version must share this fraction of scored sections (and at least two)
+MIN_SHARED_FRACTION = 0.75
+
+
+def normalize(text: str) -> str:
+    """Whitespace-insensitive form of a resume (or section) used for hashing."""
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _hash(*parts: str) -> str:
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+
+def _role_key(target_role: str) -> str:
+    return " ".join(target_role.lower().split())
+
+
+def cache_key(resume_text: str, target_role: str) -> str:
+    return _hash(normalize(resume_text), _role_key(target_role))
+
+
+def section_hashes(sections: dict[str, str]) -> dict[str, str]:
+    return {name: _hash(name, normalize(body)) for name, body in sections.items()}
+
+
+def get(key: str) -> dict | None:
+    row = get_local_db().execute(
+        "SELECT result_json, created_at FROM resume_analyses WHERE key = ?", (key,)
+    ).fetchone()
+    if not row or row["created_at"] < time.time() - settings.resume_cache_ttl_hours * 3600:
+        return None
+    return json.loads(row["result_json"])
+
+
+def find_previous_version(owner: str, target_role: str, hashes: dict[str, str]) -> tuple[dict, dict[str, str]] | None:
+    """
+    `owner`'s cached analysis (same role) sharing the most scored sections with
+    this resume, as (result, its section hashes). Needs MIN_SHARED_FRACTION of
+    them unchanged.
+    """
+    if len(hashes) < 2:
+        return None
+    conn = get_local_db()
+    placeholders = ",".join("?" * len(hashes))
+    row = conn.execute(
+        f"""
+        SELECT a.key, a.section_hashes_json, a.result_json, COUNT(*) AS shared
+        FROM resume_versions v
+        JOIN resume_analyses a ON a.key = v.analysis_key
+        JOIN resume_sections s ON s.analysis_key = a.key
+        WHERE v.owner = ? AND s.section_hash IN ({placeholders}) AND a.role = ? AND a.created_at >= ?
+        GROUP BY a.key ORDER BY shared DESC, a.created_at DESC LIMIT 1
+        """,
+        (owner, *hashes.values(), _role_key(target_role), time.time() - settings.resume_cache_ttl_hours * 3600),
+    ).fetchone()
+    if not row:
+        return None
+    previous_hashes = json.loads(row["section_hashes_json"])
+    # Measured against both versions, so dropping most sections doesn't count as a match
+    if row["shared"] < 2 or row["shared"] < MIN_SHARED_FRACTION * max(len(hashes), len(previous_hashes)):
+        return None
+    return json.loads(row["result_json"]), previous_hashes
+
+
+def put(key: str, target_role: str, hashes: dict[str, str], result: dict, owner: str | None = None):
+    """Store an analysis; with an `owner` it also becomes a candidate previous version for them."""
+    now = time.time()
+    conn = get_local_db()
+    conn.execute(
+        """
+        INSERT OR REPLACE INTO resume_analyses (key, role, section_hashes_json, result_json, created_at)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        (key, _role_key(target_role), json.dumps(hashes), json.dumps(result), now),
+    )
+    conn.execute("DELETE FROM resume_sections WHERE analysis_key = ?", (key,))
+    conn.executemany(
+        "INSERT INTO resume_sections (section_hash, analysis_key) VALUES (?, ?)",
+        [(h, key) for h in hashes.values()],
+    )
+    if owner:
+        conn.execute("INSERT OR IGNORE INTO resume_versions (owner, analysis_key) VALUES (?, ?)", (owner, key))
+    expired = now - settings.resume_cache_ttl_hours * 3600
+    conn.execute(
+        "DELETE FROM resume_sections WHERE analysis_key IN (SELECT key FROM resume_analyses WHERE created_at < ?)",
+        (expired,),
+    )
+    conn.execute(
+        "DELETE FROM resume_versions WHERE analysis_key IN (SELECT key FROM resume_analyses WHERE created_at < ?)",
+        (expired,),
+    )
+    conn.execute("DELETE FROM resume_analyses WHERE created_at < ?", (expired,))
+    conn.commit()
@@ -0,0 +1,248 @@
+"""
+Skill taxonomy — bundled skills lexicon (canonical name → aliases) and
+role → required skills map, loaded from app/data/skills_taxonomy.json into an
+in-memory index at startup. Roles the bundle doesn't know are learned from the
+LLM once and persisted in the local store (`learned_roles`). Learned roles come
+from free-text input, so they are validated before being stored and only ever
+match exactly (after normalization), never as a substring of another query.
+"""
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from app.core.local_db import get_local_db
+from app.services.groq_service import json_completion
+from app.utils import clean_json_str
+
+SERVICE_DIR = os.path.dirname(os.path.abspath(__file__))
+TAXONOMY_FILE = os.path.join(SERVICE_DIR, "..", "data", "skills_taxonomy.json")
+
+_alias_to_skill: dict[str, str] = {}
+_canonical: dict[str, str] = {}     # normalized canonical name → skill, for explicit skill lists
+_role_skills: dict[str, list[str]] = {}
+_role_aliases: dict[str, str] = {}      # bundled roles and aliases (substring-matchable)
+_learned_roles: dict[str, str] = {}     # normalized learned role → role (exact match only)
+_implies: dict[str, list[str]] = {}
+_unlearnable: "OrderedDict[str, list[str]]" = OrderedDict()   # LLM answers for roles not worth persisting
+_version = ""
+_load_lock = threading.Lock()
+
+# Canonical names shorter than this ("C", "R", "Go") are ordinary words or letters
+# in prose; they are matched only through their qualified aliases ("golang").
+MIN_BARE_NAME_LEN = 3
+
+MAX_LEARNED_ROLES = 5000
+MAX_UNLEARNABLE_CACHED = 500
+# A role made only of these words is too generic to learn ("Developer", "Senior Engineer")
+GENERIC_ROLE_WORDS = {
+    "developer", "engineer", "manager", "analyst", "designer", "consultant", "specialist", "architect",
+    "intern", "trainee", "lead", "head", "senior", "junior", "sr", "jr", "associate", "assistant",
+    "staff", "principal", "executive", "officer", "job", "role", "position", "fresher", "it", "tech",
+}
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, keep skill-ish punctuation (c++, c#, node.js, ci/cd), pad with spaces."""
+    text = re.sub(r"[^a-z0-9+#./-]+", " ", text.lower())
+    text = re.sub(r"[./-](?=\s|$)|(?<=\s)[./-]", " ", " " + text + " ")   # sentence punctuation
+    return " " + " ".join(text.split()) + " "
+
+
+def load():
+    """Build the in-memory index (bundled taxonomy + learned roles). Idempotent."""
+    _load()
+
+
+def _load():
+    global _version
+    if _version:
+        return
+    with _load_lock:
+        if _version:
+            return
+        with open(TAXONOMY_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for skill, aliases in data["skills"].items():
+            bare = normalize_text(skill).strip()
+            _canonical[bare] = skill
+            for alias in aliases:
+                _alias_to_skill[normalize_text(alias).strip()] = skill
+            if len(bare) >= MIN_BARE_NAME_LEN:
+                _alias_to_skill.setdefault(bare, skill)
+        _implies.update(data.get("implies", {}))
+        for role, spec in data["roles"].items():
+            _role_skills[role] = spec["skills"]
+            for alias in [role, *spec.get("aliases", [])]:
+                _role_aliases[normalize_text(alias).strip()] = role
+        try:
+            for row in get_local_db().execute("SELECT role, skills_json FROM learned_roles"):
+                if learnable_role(row["role"]):     # rows learned before validation existed
+                    _index_role(row["role"], json.loads(row["skills_json"]))
+        except Exception as e:
+            print(f"WARNING: could not load learned roles: {e}")
+        _version = data.get("version") or "unversioned"
+
+
+def _index_role(role: str, skills: list[str]):
+    key = normalize_text(role).strip()
+    if key and key not in _role_aliases:     # bundled roles always win
+        _role_skills[role] = skills
+        _learned_roles[key] = role
+
+
+def _generic(key: str) -> bool:
+    return all(w in GENERIC_ROLE_WORDS for w in key.split())
+
+
+def learnable_role(role: str) -> bool:
+    """Whether a free-text role is specific and clean enough to persist."""
+    key = normalize_text(role).strip()
+    words = key.split()
+    if not 1 <= len(words) <= 6 or not 3 <= len(key) <= 60:
+        return False
+    if not re.fullmatch(r"[a-z0-9+#./ -]+", key) or not any(len(w) >= 3 and w.isalpha() for w in words):
+        return False
+    return not _generic(key)
+
+
+def taxonomy_version() -> str:
+    _load()
+    return _version
+
+
+def extract_skills(text: str) -> list[str]:
+    """Canonical skills mentioned in `text` (plus skills they imply, e.g. PostgreSQL → SQL)."""
+    _load()
+    haystack = normalize_text(text)
+    found = []
+    for alias, skill in _alias_to_skill.items():
+        if skill not in found and f" {alias} " in haystack:
+            found.append(skill)
+    for skill in found:     # grows while iterating, so implications chain
+        found.extend(s for s in _implies.get(skill, []) if s not in found)
+    return found
+
+
+def match_role(role: str) -> str | None:
+    """Map a free-text role ("Sr. React Developer") to a taxonomy role, if any."""
+    _load()
+    key = normalize_text(role).strip()
+    if not key:
+        return None
+    if key in _role_aliases:
+        return _role_aliases[key]
+    if key in _learned_roles:
+        return _learned_roles[key]
+    # Longest bundled alias contained in the query wins ("senior backend developer" → Backend Developer).
+    # Aliases made only of generic words ("analyst") would claim unrelated roles
+    # ("Financial Analyst"), so they only ever match exactly.
+    contained = [alias for alias in _role_aliases if f" {alias} " in f" {key} " and not _generic(alias)]
+    return _role_aliases[max(contained, key=len)] if contained else None
+
+
+def role_skills(role: str) -> list[str]:
+    """Required skills for a role (empty if the role is unknown)."""
+    matched = match_role(role)
+    return list(_role_skills[matched]) if matched else []
+
+
+def normalize_skill(name: str) -> str:
+    """Canonical name for a skill ("JS" → "JavaScript"); unknown skills are returned tidied."""
+    _load()
+    key = normalize_text(name).strip()
+    # A skill list item is unambiguous, so bare short names ("Go", "C") are resolved here too
+    return _alias_to_skill.get(key) or _canonical.get(key) or " ".join(name.split())
+
+
+def _expand(skills: list[str]) -> set[str]:
+    """Canonicalize and add implied skills (knowing FastAPI implies Python)."""
+    found = [normalize_skill(s) for s in skills if s.strip()]
+    for skill in found:
+        found.extend(s for s in _implies.get(skill, []) if s not in found)
+    return {s.lower() for s in found}
+
+
+def skill_gap(current_skills: list[str], role: str) -> dict | None:
+    """
+    Pure in-memory gap analysis against the index; None if the role is unknown.
+    Required skills are stored most-important-first, so the first missing ones are the priorities.
+    """
+    required = role_skills(role)
+    return compare_skills(current_skills, required) if required else None
+
+
+def compare_skills(current_skills: list[str], required: list[str]) -> dict:
+    """Gap analysis of `current_skills` against an explicit required-skills list."""
+    have = _expand(current_skills)
+    present = [s for s in required if s.lower() in have]
+    missing = [s for s in required if s.lower() not in have]
+    return {
+        "required_skills": required,
+        "present_skills": present,
+        "missing_skills": missing,
+        "priority_skills": missing[:3],
+        "match_percentage": round(len(present) / len(required) * 100),
+        "estimated_weeks": math.ceil(len(missing) * 1.5),
+    }
+
+
+def learn_role(role: str, skills: list[str]) -> list[str]:
+    """
+    Canonicalize an LLM-provided role → skills mapping and, if the role is
+    learnable and the skill list plausible, add it to the index and persist it.
+    Returns the canonical skills either way.
+    """
+    _load()
+    canonical = []
+    for s in skills[:15]:
+        skill = normalize_skill(s)
+        if skill and len(skill) <= 40 and skill not in canonical:
+            canonical.append(skill)
+    if len(canonical) < 3 or match_role(role) or not learnable_role(role) or len(_learned_roles) >= MAX_LEARNED_ROLES:
+        return canonical
+    role = " ".join(role.split())
+    with _load_lock:
+        _index_role(role, canonical)
+    conn = get_local_db()
+    conn.execute(
+        "INSERT OR REPLACE INTO learned_roles (role, skills_json, taxonomy_version, created_at) VALUES (?, ?, ?, ?)",
+        (role, json.dumps(canonical), _version, time.time()),
+    )
+    conn.commit()
+    return canonical
+
+
+def resolve_role_skills(role: str, feature: str = "career", timeout: float = 10) -> tuple[list[str], str]:
+    """
+    Required skills for any role → (skills, source). Known roles come from the
+    index ("taxonomy"); unknown ones are asked from the LLM once and learned
+    ("llm"). LLM and parse errors propagate to the caller.
+    """
+    required = role_skills(role)
+    if required:
+        return required, "taxonomy"
+    key = normalize_text(role).strip()
+    if key in _unlearnable:     # generic roles aren't learned; don't ask again for every resume in a batch
+        return list(_unlearnable[key]), "llm"
+    prompt = f"""
+List the skills required for this role, most important first.
+Target Role: {role}
+
+Return JSON:
+{{
+  "required_skills": ["<skill 1>", "<skill 2>", ...]
+}}
+Give 8-12 concise skill names (e.g. "Python", "System Design"), no descriptions.
+"""
+    data = json.loads(clean_json_str(json_completion(prompt, max_tokens=300, feature=feature, timeout=timeout)))
+    required = learn_role(role, [str(s) for s in data["required_skills"]])
+    if not required:
+        raise ValueError("no usable skills returned")
+    if not match_role(role):
+        _unlearnable[key] = required
+        while len(_unlearnable) > MAX_UNLEARNABLE_CACHED:
+            _unlearnable.popitem(last=False)
+    return required, "llm"
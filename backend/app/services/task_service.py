@@ -0,0 +1,171 @@
+"""
+Background task runner — runs long LLM work off the request path.
+Tasks execute on a bounded thread pool; state and results live in the local
+SQLite `tasks` table so status survives page reloads until the TTL expires.
+Identical submissions (same kind + payload) reuse the live task instead of
+re-running the LLM; a partial unique index makes that atomic. Queued/running
+tasks are heartbeated by the process that owns them, so rows orphaned by a
+restart are failed (at startup, or on the next identical submit) instead of
+being handed out forever.
+"""
+import hashlib
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+from fastapi import HTTPException
+from pydantic import BaseModel
+from app.core.config import settings
+from app.core.local_db import get_local_db
+
+_executor = ThreadPoolExecutor(max_workers=settings.task_workers, thread_name_prefix="task")
+
+TERMINAL_STATES = {"done", "failed"}
+HEARTBEAT_SECONDS = 30
+
+_active: set[str] = set()       # this process's queued/running task ids
+_heartbeat: threading.Thread | None = None
+_heartbeat_lock = threading.Lock()
+
+
+class TaskAccepted(BaseModel):
+    task_id: str
+    status: str
+    status_url: str
+    result_url: str
+    events_url: str
+
+
+def _fingerprint(kind: str, payload: dict) -> str:
+    return hashlib.sha256((kind + json.dumps(payload, sort_keys=True, default=str)).encode("utf-8")).hexdigest()
+
+
+def submit_task(kind: str, payload: dict, fn: Callable[[Callable[[str], None]], Any]) -> TaskAccepted:
+    """
+    Queue `fn(report)` for `kind` unless an unexpired, non-failed task with the same
+    payload already exists. `report(message)` lets the task publish progress text.
+    """
+    now = time.time()
+    fingerprint = _fingerprint(kind, payload)
+    task_id = uuid.uuid4().hex
+    conn = get_local_db()
+    conn.execute("DELETE FROM tasks WHERE expires_at < ?", (now,))
+    _fail_orphans(conn, now)
+    inserted = conn.execute(
+        """
+        INSERT INTO tasks (id, kind, fingerprint, status, progress, created_at, updated_at, expires_at)
+        VALUES (?, ?, ?, 'queued', 'queued', ?, ?, ?)
+        ON CONFLICT DO NOTHING
+        """,
+        (task_id, kind, fingerprint, now, now, now + settings.task_result_ttl_minutes * 60),
+    ).rowcount
+    conn.commit()
+    if not inserted:
+        row = conn.execute(
+            "SELECT id, status FROM tasks WHERE fingerprint = ? AND status != 'failed'", (fingerprint,)
+        ).fetchone()
+        if row:
+            return _accepted(row["id"], row["status"])
+        return submit_task(kind, payload, fn)     # the live row failed in between; try again
+
+    _active.add(task_id)
+    _ensure_heartbeat()
+    _executor.submit(_run, task_id, fn)
+    return _accepted(task_id, "queued")
+
+
+def _fail_orphans(conn, now: float):
+    conn.execute(
+        """
+        UPDATE tasks SET status = 'failed', progress = 'failed', error = 'Task was interrupted; please resubmit',
+                         updated_at = ?, expires_at = ?
+        WHERE status IN ('queued', 'running') AND updated_at < ?
+        """,
+        (now, now + settings.task_result_ttl_minutes * 60, now - settings.task_stale_seconds),
+    )
+
+
+def recover():
+    """Fail tasks whose owning process died (called on startup)."""
+    conn = get_local_db()
+    _fail_orphans(conn, time.time())
+    conn.commit()
+
+
+def _ensure_heartbeat():
+    global _heartbeat
+    with _heartbeat_lock:
+        if _heartbeat is None:
+            _heartbeat = threading.Thread(target=_beat, name="task-heartbeat", daemon=True)
+            _heartbeat.start()
+
+
+def _beat():
+    while True:
+        time.sleep(HEARTBEAT_SECONDS)
+        ids = list(_active)
+        if not ids:
+            continue
+        try:
+            conn = get_local_db()
+            conn.execute(
+                f"UPDATE tasks SET updated_at = ? WHERE id IN ({','.join('?' * len(ids))}) AND status IN ('queued', 'running')",
+                (time.time(), *ids),
+            )
+            conn.commit()
+        except Exception as e:
+            print(f"Task heartbeat failed: {e}")
+
+
+def get_task(task_id: str) -> dict | None:
+    """Return the task row as a dict (result decoded), or None if unknown/expired."""
+    row = get_local_db().execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+    if not row or row["expires_at"] < time.time():
+        return None
+    task = dict(row)
+    task["result"] = json.loads(task.pop("result_json")) if task["result_json"] else None
+    return task
+
+
+def _accepted(task_id: str, status: str) -> TaskAccepted:
+    return TaskAccepted(
+        task_id=task_id,
+        status=status,
+        status_url=f"/tasks/{task_id}",
+        result_url=f"/tasks/{task_id}/result",
+        events_url=f"/tasks/{task_id}/events",
+    )
+
+
+def _update(task_id: str, **fields):
+    fields["updated_at"] = time.time()
+    if fields.get("status") in TERMINAL_STATES:
+        # TTL counts from completion so a slow task doesn't expire right after finishing
+        fields["expires_at"] = fields["updated_at"] + settings.task_result_ttl_minutes * 60
+    cols = ", ".join(f"{k} = ?" for k in fields)
+    conn = get_local_db()
+    conn.execute(f"UPDATE tasks SET {cols} WHERE id = ?", (*fields.values(), task_id))
+    conn.commit()
+
+
+def _run(task_id: str, fn: Callable[[Callable[[str], None]], Any]):
+    try:
+        _run_task(task_id, fn)
+    finally:
+        _active.discard(task_id)
+
+
+def _run_task(task_id: str, fn: Callable[[Callable[[str], None]], Any]):
+    _update(task_id, status="running", progress="running")
+    try:
+        result = fn(lambda message: _update(task_id, progress=message))
+        if isinstance(result, BaseModel):
+            result = result.model_dump()
+        _update(task_id, status="done", progress="done", result_json=json.dumps(result))
+    except HTTPException as e:
+        _update(task_id, status="failed", progress="failed", error=str(e.detail))
+    except Exception as e:
+        print(f"Task {task_id} failed: {e}")
+        _update(task_id, status="failed", progress="failed", error=str(e))
@@ -0,0 +1,114 @@
+"""
+Resume text extraction for PDF / DOCX / TXT uploads.
+Extraction is CPU-bound (PDF parsing especially), so it runs in a small
+process pool instead of on the event loop or the request thread pool.
+"""
+import io
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from app.core.config import settings
+
+SUPPORTED_TYPES = {"pdf", "docx", "txt"}
+MAX_CHARS = 50_000    # far beyond any real resume; keeps prompts and hashing bounded
+MAX_DOCX_XML_BYTES = 20 * 1024 * 1024   # decompressed word/document.xml; guards against zip bombs
+
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+_pool: ProcessPoolExecutor | None = None
+
+
+class ExtractionError(Exception):
+    """Raised when a file can't be read as the declared type."""
+
+
+def get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=settings.extract_workers)
+    return _pool
+
+
+def reset_pool():
+    """
+    Terminate the workers and start a fresh pool on next use. Used after an
+    extraction timeout: a future's timeout doesn't stop the worker process, so a
+    hostile PDF would otherwise keep a worker busy indefinitely. Extractions still
+    running in the old pool fail with BrokenProcessPool.
+    """
+    global _pool
+    pool, _pool = _pool, None
+    if pool is None:
+        return
+    for process in list((pool._processes or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def file_type(filename: str) -> str | None:
+    ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    return ext if ext in SUPPORTED_TYPES else None
+
+
+def _pdf_text(f) -> str:
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise ExtractionError("PDF support requires the 'pypdf' package")
+    try:
+        reader = PdfReader(f)
+        parts, size = [], 0
+        for page in reader.pages:
+            text = page.extract_text() or ""
+            parts.append(text)
+            size += len(text)
+            if size >= MAX_CHARS:
+                break
+        return "\n".join(parts)
+    except Exception as e:
+        raise ExtractionError(f"Could not read PDF: {e}")
+
+
+def _docx_text(f) -> str:
+    try:
+        with zipfile.ZipFile(f) as zf:
+            info = zf.getinfo("word/document.xml")
+            if info.file_size > MAX_DOCX_XML_BYTES:
+                raise ExtractionError("DOCX content too large")
+            # The declared size can lie; never decompress more than the cap either way
+            with zf.open(info) as member:
+                xml = member.read(MAX_DOCX_XML_BYTES + 1)
+            if len(xml) > MAX_DOCX_XML_BYTES:
+                raise ExtractionError("DOCX content too large")
+            root = ET.fromstring(xml)
+    except (zipfile.BadZipFile, KeyError, ET.ParseError, RuntimeError, EOFError) as e:
+        raise ExtractionError(f"Could not read DOCX: {e}")
+    paragraphs = []
+    for p in root.iter(f"{_WORD_NS}p"):
+        text = "".join(t.text or "" for t in p.iter(f"{_WORD_NS}t"))
+        if text.strip():
+            paragraphs.append(text)
+    return "\n".join(paragraphs)
+
+
+def _extract(f, kind: str) -> str:
+    if kind == "pdf":
+        text = _pdf_text(f)
+    elif kind == "docx":
+        text = _docx_text(f)
+    elif kind == "txt":
+        text = f.read(MAX_CHARS * 4).decode("utf-8", errors="ignore")
+    else:
+        raise ExtractionError(f"Unsupported file type: {kind}")
+    return text[:MAX_CHARS]
+
+
+def extract_file(path: str, kind: str) -> str:
+    """Extract text from a file on disk. Runs inside a pool worker process."""
+    with open(path, "rb") as f:
+        return _extract(f, kind)
+
+
+def extract_bytes(data: bytes, kind: str) -> str:
+    """Extract text from an in-memory document (e.g. a zip archive member)."""
+    return _extract(io.BytesIO(data), kind)
@@ -1,7 +1,10 @@
 """
 Shared utility helpers.
 """
+import asyncio
+import json
 import re
+from typing import AsyncIterator, Iterable, Iterator
 
 
 def clean_json_str(raw: str) -> str:
@@ -11,3 +14,78 @@ def clean_json_str(raw: str) -> str:
     so we use a proper regex instead.
     """
     return re.sub(r'^```(?:json)?\s*|\s*```$', '', raw.strip()).strip()
+
+
+def iter_json_array_items(chunks: Iterable[str]) -> Iterator[dict]:
+    """
+    Incrementally parse a streamed JSON document and yield each object of its
+    top-level array as soon as the object's closing brace arrives.
+
+    Works for both a bare array (`[{...}, ...]`) and an object wrapping one
+    array (`{"questions": [{...}, ...]}`). Anything outside the JSON (markdown
+    fences, preamble) is ignored; objects that fail to parse are skipped.
+    """
+    depth = 0
+    item_depth = None      # depth at which array items live, fixed by the root token
+    in_string = escape = False
+    buf: list[str] = []
+
+    for chunk in chunks:
+        for ch in chunk:
+            if buf:
+                buf.append(ch)
+            if in_string:
+                if escape:
+                    escape = False
+                elif ch == "\\":
+                    escape = True
+                elif ch == '"':
+                    in_string = False
+                continue
+            if ch == '"':
+                in_string = depth > 0
+            elif ch in "{[":
+                if item_depth is None:
+                    item_depth = 1 if ch == "[" else 2
+                if ch == "{" and depth == item_depth and not buf:
+                    buf.append(ch)
+                depth += 1
+            elif ch in "}]" and depth > 0:
+                depth -= 1
+                if buf and depth == item_depth:
+                    try:
+                        item = json.loads("".join(buf))
+                        if isinstance(item, dict):
+                            yield item
+                    except ValueError:
+                        pass
+                    buf = []
+
+
+async def aiter_in_thread(iterator: Iterator) -> AsyncIterator:
+    """
+    Consume a blocking iterator (e.g. a Groq token stream) on a worker thread
+    and yield its items on the event loop as they arrive.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    def pump():
+        try:
+            for item in iterator:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, done)
+
+    worker = loop.run_in_executor(None, pump)
+    while True:
+        item = await queue.get()
+        if item is done:
+            break
+        if isinstance(item, Exception):
+            raise item
+        yield item
+    await worker
@@ -0,0 +1,70 @@
+"""
+Shared fixtures: the app package on sys.path, a throwaway local store, and a
+stub HTTP server standing in for external sites/APIs (link checks, Adzuna).
+"""
+import json
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import local_db  # noqa: E402
+
+# Never touch data/local.db from tests
+local_db.LOCAL_DB_FILE = os.path.join(tempfile.mkdtemp(prefix="vidyamitra-test-"), "local.db")
+
+
+class StubServer:
+    """
+    Routes are `{(method, path): handler}` where a handler takes the parsed query
+    and returns (status, body) — body is JSON-encoded unless it is str/bytes.
+    Every request is recorded as (method, path, query).
+    """
+
+    def __init__(self):
+        self.routes: dict[tuple[str, str], callable] = {}
+        self.requests: list[tuple[str, str, dict]] = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _handle(self):
+                parts = urlsplit(self.path)
+                query = parse_qs(parts.query)
+                stub.requests.append((self.command, parts.path, query))
+                handler = stub.routes.get((self.command, parts.path))
+                status, body = handler(query) if handler else (404, "not found")
+                if not isinstance(body, (str, bytes)):
+                    body = json.dumps(body)
+                data = body.encode("utf-8") if isinstance(body, str) else body
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(data)
+
+            do_GET = do_HEAD = _handle
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def route(self, method: str, path: str, status: int = 200, body="ok"):
+        self.routes[(method, path)] = lambda query: (status, body)
+
+
+@pytest.fixture
+def stub_server():
+    server = StubServer()
+    thread = threading.Thread(target=server.httpd.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
@@ -0,0 +1,150 @@
+"""Groq call resilience: retries, circuit breaker and hedging, against a fake client."""
+import threading
+import time
+from collections import deque
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from groq import APIStatusError
+
+from app.core.config import settings
+from app.services import groq_service
+from app.services.groq_service import CircuitOpenError
+
+
+def _status_error(code: int) -> APIStatusError:
+    response = httpx.Response(code, request=httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions"))
+    return APIStatusError(f"HTTP {code}", response=response, body=None)
+
+
+def _reply(content: str):
+    usage = SimpleNamespace(prompt_tokens=1, completion_tokens=1)
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=usage)
+
+
+class FakeClient:
+    """Stands in for groq.Groq; `behaviour(n)` returns a reply or raises for the n-th create call."""
+
+    def __init__(self, behaviour):
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._behaviour = behaviour
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        with self._lock:
+            n = self.calls
+            self.calls += 1
+        return self._behaviour(n)
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(groq_service, "_breaker", groq_service._CircuitBreaker())
+    monkeypatch.setattr(groq_service, "_latencies", {})
+    monkeypatch.setattr(settings, "groq_max_retries", 2)
+    monkeypatch.setattr(settings, "groq_retry_base_ms", 1)
+    monkeypatch.setattr(settings, "groq_retry_cap_ms", 2)
+    monkeypatch.setattr(settings, "groq_breaker_failures", 5)
+    monkeypatch.setattr(settings, "groq_breaker_reset_seconds", 30)
+    monkeypatch.setattr(settings, "groq_hedge_percentile", 0)
+
+
+def _use(monkeypatch, behaviour) -> FakeClient:
+    client = FakeClient(behaviour)
+    monkeypatch.setattr(groq_service, "_client", client)
+    return client
+
+
+def _failing(code: int):
+    def behaviour(n):
+        raise _status_error(code)
+    return behaviour
+
+
+def _chat() -> str:
+    return groq_service.chat_completion([{"role": "user", "content": "hi"}], feature="test", timeout=5)
+
+
+def test_5xx_is_retried_then_succeeds(monkeypatch):
+    client = _use(monkeypatch, lambda n: _reply("ok") if n == 2 else (_ for _ in ()).throw(_status_error(503)))
+    assert _chat() == "ok"
+    assert client.calls == 3
+
+
+def test_5xx_calls_open_the_circuit_once_retries_are_spent(monkeypatch):
+    client = _use(monkeypatch, _failing(500))
+    for _ in range(settings.groq_breaker_failures):
+        with pytest.raises(APIStatusError):
+            _chat()
+    assert client.calls == settings.groq_breaker_failures * (settings.groq_max_retries + 1)
+    with pytest.raises(CircuitOpenError):
+        _chat()
+    assert client.calls == settings.groq_breaker_failures * (settings.groq_max_retries + 1)   # not called
+
+
+@pytest.mark.parametrize("code, attempts", [(429, 3), (400, 1)])
+def test_429_and_400_do_not_count_as_outages(monkeypatch, code, attempts):
+    client = _use(monkeypatch, _failing(code))
+    for _ in range(settings.groq_breaker_failures * 2):
+        with pytest.raises(APIStatusError):
+            _chat()
+    assert client.calls == settings.groq_breaker_failures * 2 * attempts   # 429 retried, 400 not
+    assert groq_service._breaker._opened_at is None
+
+
+def test_half_open_lets_one_trial_through(monkeypatch):
+    breaker = groq_service._breaker
+    for _ in range(settings.groq_breaker_failures):
+        breaker.record(False)
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+    monkeypatch.setattr(settings, "groq_breaker_reset_seconds", 0)
+    breaker.check()                         # the trial call
+    with pytest.raises(CircuitOpenError):
+        breaker.check()                     # everyone else waits for its outcome
+    breaker.record(False)                   # failed trial re-opens at once
+    assert breaker._opened_at is not None and not breaker._trial
+
+    breaker.check()
+    breaker.record(True)                    # successful trial closes the circuit
+    breaker.check()
+    assert breaker._opened_at is None and breaker._failures == 0
+
+
+def test_failed_trial_call_reopens_the_circuit(monkeypatch):
+    client = _use(monkeypatch, _failing(502))
+    for _ in range(settings.groq_breaker_failures):
+        with pytest.raises(APIStatusError):
+            _chat()
+    monkeypatch.setattr(settings, "groq_breaker_reset_seconds", 0)
+    with pytest.raises(APIStatusError):
+        _chat()                             # the trial, retries included
+    calls = client.calls
+    monkeypatch.setattr(settings, "groq_breaker_reset_seconds", 30)
+    with pytest.raises(CircuitOpenError):
+        _chat()
+    assert client.calls == calls
+
+
+def test_hedge_returns_the_first_success(monkeypatch):
+    monkeypatch.setattr(settings, "groq_hedge_percentile", 50)
+    monkeypatch.setattr(settings, "groq_hedge_min_samples", 5)
+    groq_service._latencies["test"] = deque([0.01] * 10, maxlen=200)
+    release = threading.Event()
+
+    def behaviour(n):
+        if n == 0:                          # the original request is stuck
+            release.wait(5)
+            return _reply("slow")
+        return _reply("fast")
+
+    client = _use(monkeypatch, behaviour)
+    started = time.perf_counter()
+    try:
+        assert _chat() == "fast"
+    finally:
+        release.set()
+    assert client.calls == 2 and time.perf_counter() - started < 2
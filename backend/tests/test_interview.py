@@ -0,0 +1,58 @@
+"""Interview question pools: per-viewer unseen questions, cold-pool latency and callers without an identity."""
+import itertools
+import json
+import re
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import interview
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Fake LLM numbering questions globally; records how many each call asked for."""
+    counter = itertools.count()
+    asked = []
+
+    def fake_completion(prompt, **kwargs):
+        n = int(re.search(r"Generate (\d+) distinct", prompt).group(1))
+        asked.append(n)
+        return json.dumps({"questions": [
+            {"question": f"Q{next(counter)}", "tips": [], "follow_ups": []} for _ in range(n)
+        ]})
+
+    monkeypatch.setattr(interview, "json_completion", fake_completion)
+    return asked
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(interview.router)
+    return TestClient(app)
+
+
+def _role() -> str:
+    return f"Role {uuid.uuid4().hex}"     # a fresh pool per test
+
+
+def test_known_client_gets_unseen_questions(client, llm):
+    role, headers = _role(), {"X-Client-Id": uuid.uuid4().hex}
+    got = [client.post("/interview/question", json={"role": role}, headers=headers).json()["question"]
+           for _ in range(4)]
+    assert len(set(got)) == 4
+
+
+def test_cold_pool_generates_only_what_was_asked_for(client, llm):
+    client.post("/interview/question", json={"role": _role()}, headers={"X-Client-Id": uuid.uuid4().hex})
+    # One question on the request path, the batch in the background refill
+    assert llm == [1, interview.settings.interview_batch_size]
+
+
+def test_caller_without_identity_is_not_served_the_pool_head(client, llm):
+    role = _role()
+    got = [client.post("/interview/question", json={"role": role}).json()["question"] for _ in range(4)]
+    assert len(set(got)) == 4
@@ -0,0 +1,165 @@
+"""Scheduled listing sync, local search and the Adzuna cache against a stub Adzuna API."""
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.core.local_db import get_local_db
+from app.services import adzuna_service, job_listings
+
+
+def _result(title, company, location="Bangalore", salary_min=600000, description=""):
+    return {
+        "title": title,
+        "company": {"display_name": company},
+        "location": {"display_name": location},
+        "salary_min": salary_min,
+        "salary_max": salary_min + 200000,
+        "description": description,
+        "redirect_url": f"https://example.com/{company}/{title}".replace(" ", "-"),
+        "created": "2026-10-01T00:00:00Z",
+        "category": {"__CLASS__": "Adzuna::API::Response::Category", "tag": "it-jobs", "label": "IT Jobs"},
+    }
+
+
+PAGE_1 = [
+    _result("Senior Python Developer", "Acme", description="Django and PostgreSQL, 6+ years."),
+    _result("Junior React Developer", "Globex", "Pune", 300000, "React, JavaScript and CSS."),
+    _result("Data Analyst", "Initech", description="SQL and Excel, 2-4 years of experience."),
+]
+PAGE_2 = [
+    # Same listing as on page 1 (case differs) — must be stored once
+    _result("senior python developer", "ACME", description="Django and PostgreSQL, 6+ years."),
+    _result("Remote Go Engineer", "Hooli", "Remote", 900000, "Golang microservices."),
+]
+
+
+def _run(coro):
+    async def main():
+        try:
+            return await coro
+        finally:
+            await adzuna_service.aclose()
+    return asyncio.run(main())
+
+
+@pytest.fixture
+def adzuna(stub_server, monkeypatch):
+    monkeypatch.setattr(settings, "adzuna_base_url", stub_server.url)
+    monkeypatch.setattr(settings, "adzuna_app_id", "test-id")
+    monkeypatch.setattr(settings, "adzuna_app_key", "test-key")
+    monkeypatch.setattr(settings, "job_sync_pages", 2)
+    stub_server.route("GET", "/search/1", body={"results": PAGE_1})
+    stub_server.route("GET", "/search/2", body={"results": PAGE_2})
+    conn = get_local_db()
+    for table in ("job_listings", "job_listing_skills", "job_sync_state"):
+        conn.execute(f"DELETE FROM {table}")
+    conn.commit()
+    adzuna_service._cache.clear()
+    return stub_server
+
+
+def test_sync_stores_deduplicated_listings(adzuna):
+    result = _run(job_listings.sync(["Software Engineer"]))
+    assert result["pages"] == 2 and result["failed_pages"] == 0
+    assert result["fetched"] == 5 and result["stored"] == 4
+    query = adzuna.requests[0][2]
+    assert query["app_id"] == ["test-id"] and query["what"] == ["Software Engineer"]
+
+
+def test_malformed_listings_are_skipped_not_fatal(adzuna):
+    adzuna.route("GET", "/search/2", body={"results": [{"company": "not an object"}, *PAGE_2]})
+    result = _run(job_listings.sync(["Software Engineer"]))
+    assert result["malformed"] == 1 and result["stored"] == 4
+
+
+def test_failed_pages_are_counted_not_fatal(adzuna):
+    adzuna.route("GET", "/search/2", status=500, body="boom")
+    result = _run(job_listings.sync(["Software Engineer"]))
+    assert result["failed_pages"] == 1 and result["stored"] == 3
+
+
+def test_search_filters(adzuna):
+    _run(job_listings.sync(["Software Engineer"]))
+    jobs, total = job_listings.search(skills=["python"])
+    assert total == 1 and jobs[0]["title"].lower() == "senior python developer"
+    _, total = job_listings.search(location="pune")
+    assert total == 1
+    jobs, total = job_listings.search(min_salary=850000)
+    assert total == 1 and jobs[0]["company"] == "Hooli"
+    jobs, total = job_listings.search(job_type="Remote")
+    assert total == 1 and jobs[0]["company"] == "Hooli"
+
+
+def test_search_by_experience(adzuna):
+    _run(job_listings.sync(["Software Engineer"]))
+    jobs, _ = job_listings.search(experience_level="senior")
+    assert [j["title"].lower() for j in jobs] == ["senior python developer"]
+    assert jobs[0]["experience"] == "6+ years"
+    jobs, _ = job_listings.search(experience_level="entry")
+    assert [j["company"] for j in jobs] == ["Globex"]
+    # Listings that don't state years pass a max_years filter
+    jobs, _ = job_listings.search(max_years=3)
+    assert {j["company"] for j in jobs} == {"Globex", "Initech", "Hooli"}
+
+
+def test_search_paginates(adzuna):
+    _run(job_listings.sync(["Software Engineer"]))
+    first, total = job_listings.search(page=1, page_size=3)
+    second, _ = job_listings.search(page=2, page_size=3)
+    assert total == 4 and len(first) == 3 and len(second) == 1
+    assert not {j["url"] for j in first} & {j["url"] for j in second}
+
+
+def test_only_one_worker_claims_a_due_run(adzuna):
+    assert job_listings.claim_run(3600) == 0
+    wait = job_listings.claim_run(3600)
+    assert 3500 < wait <= 3600
+
+
+def test_adzuna_search_serves_cache_then_stale(adzuna, monkeypatch):
+    jobs, freshness = _run(adzuna_service.search("Software Engineer"))
+    assert freshness == "live" and len(jobs) == 3
+    assert _run(adzuna_service.search("software engineer"))[1] == "fresh"
+    assert len(adzuna.requests) == 1
+    key = adzuna_service.cache_key("Software Engineer", "India", 1)
+    fetched_at, cached = adzuna_service._cache[key]
+    adzuna_service._cache[key] = (fetched_at - settings.jobs_cache_ttl_minutes * 60 - 1, cached)
+    assert _run(adzuna_service.search("Software Engineer"))[1] == "stale"
+
+
+def test_adzuna_search_without_credentials_is_skipped(adzuna, monkeypatch):
+    monkeypatch.setattr(settings, "adzuna_app_id", "")
+    assert _run(adzuna_service.search("Software Engineer")) is None
+    assert adzuna.requests == []
+
+
+# Shape of a real Adzuna search result (abridged)
+ADZUNA_LISTING = {
+    "__CLASS__": "Adzuna::API::Response::Job",
+    "id": "4812345678",
+    "title": "<strong>Python</strong> Developer",
+    "description": "We need a <strong>Python</strong> developer with Django and 3+ years of experience...",
+    "company": {"__CLASS__": "Adzuna::API::Response::Company", "display_name": "Initech"},
+    "location": {"__CLASS__": "Adzuna::API::Response::Location", "display_name": "Bengaluru, Karnataka",
+                 "area": ["India", "Karnataka", "Bengaluru"]},
+    "category": {"__CLASS__": "Adzuna::API::Response::Category", "tag": "it-jobs", "label": "IT Jobs"},
+    "salary_min": 700000,
+    "salary_max": 1200000,
+    "salary_is_predicted": "0",
+    "contract_time": "full_time",
+    "created": "2026-10-10T08:15:00Z",
+    "redirect_url": "https://www.adzuna.in/land/ad/4812345678",
+    "latitude": 12.97,
+    "longitude": 77.59,
+}
+
+
+def test_adzuna_search_caches_realistic_listings(adzuna):
+    adzuna.route("GET", "/search/1", body={"results": [ADZUNA_LISTING, {**ADZUNA_LISTING, "category": "it-jobs"}]})
+    jobs, freshness = _run(adzuna_service.search("Python Developer"))
+    assert freshness == "live" and len(jobs) == 2
+    assert jobs[0]["title"] == "Python Developer" and jobs[0]["skills"] == ["IT Jobs"]
+    assert jobs[1]["skills"] == []
+    assert _run(adzuna_service.search("Python Developer"))[1] == "fresh"
+
@@ -0,0 +1,75 @@
+from app.services import link_verifier
+
+
+def verify(*urls):
+    return link_verifier.run_sync(link_verifier.verify_urls(list(urls)))
+
+
+def test_head_ok_is_verified_and_cached(stub_server):
+    stub_server.route("HEAD", "/ok")
+    url = stub_server.url + "/ok"
+    assert verify(url) == {url: True}
+    assert verify(url) == {url: True}
+    assert [r[0] for r in stub_server.requests] == ["HEAD"]     # second check served from the cache
+    assert link_verifier.cached(url) is True
+
+
+def test_get_fallback_when_head_is_rejected(stub_server):
+    stub_server.route("HEAD", "/no-head", status=405)
+    stub_server.route("GET", "/no-head")
+    url = stub_server.url + "/no-head"
+    assert verify(url) == {url: True}
+    assert [r[0] for r in stub_server.requests] == ["HEAD", "GET"]
+
+
+def test_broken_and_unreachable_links_fail(stub_server):
+    missing = stub_server.url + "/missing"
+    unreachable = "http://127.0.0.1:9/nothing-listens-here"
+    assert verify(missing, unreachable) == {missing: False, unreachable: False}
+    assert link_verifier.cached(missing) is False
+
+
+def test_malformed_urls_are_unverified_not_errors():
+    assert verify("http://[bad", "not a url", "") == {"http://[bad": False, "not a url": False, "": False}
+
+
+def test_run_sync_closes_the_loop_client(stub_server):
+    stub_server.route("HEAD", "/closed")
+    verify(stub_server.url + "/closed")
+    assert not any(not state.client.is_closed for state in list(link_verifier._states.values()))
+
+
+def test_job_records_each_result(stub_server):
+    stub_server.route("HEAD", "/a")
+    urls = [stub_server.url + "/a", stub_server.url + "/b"]
+    job_id = link_verifier.start_job(urls)
+    assert link_verifier.run_sync(link_verifier.run_job(job_id)) == {urls[0]: True, urls[1]: False}
+    job = link_verifier.get_job(job_id)
+    assert job["status"] == "done" and job["results"] == {urls[0]: True, urls[1]: False}
+
+
+def test_job_records_urls_with_json_path_characters(stub_server):
+    stub_server.route("HEAD", "/q")
+    urls = [stub_server.url + '/q?title="intro"&a[0]=1', stub_server.url + "/q?x=$.y*"]
+    job_id = link_verifier.start_job(urls)
+    link_verifier.run_sync(link_verifier.run_job(job_id))
+    assert link_verifier.get_job(job_id)["results"] == {urls[0]: True, urls[1]: True}
+
+
+def test_verification_events_stream_each_link_then_done(stub_server):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.api import learn
+
+    stub_server.route("HEAD", "/a")
+    urls = [stub_server.url + "/a", stub_server.url + "/gone"]
+    job_id = link_verifier.start_job(urls)
+    link_verifier.run_sync(link_verifier.run_job(job_id))
+
+    app = FastAPI()
+    app.include_router(learn.router)
+    client = TestClient(app)
+    with client.stream("GET", f"/learn/verification/{job_id}/events") as res:
+        events = [line.split(": ", 1)[1] for line in res.iter_lines() if line.startswith("event:")]
+    assert events == ["link", "link", "done"]
+    assert client.get("/learn/verification/nope/events").status_code == 404
@@ -0,0 +1,58 @@
+"""Quiz sessions: the answer key stays server-side until a question is checked or the quiz submitted."""
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import quiz
+
+QUESTIONS = {
+    "questions": [
+        {"id": 1, "question": "What is 2 + 2?", "options": ["3", "4", "5", "6"], "correct_index": 1,
+         "explanation": "Basic addition."},
+        {"id": 2, "question": "Which is a Python keyword?", "options": ["def", "func", "fn", "sub"],
+         "correct_index": 0, "explanation": "def defines a function."},
+    ]
+}
+FEEDBACK = {"feedback": "Solid work.", "weak_areas": ["Syntax"], "recommendations": ["Practice"]}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    def fake_completion(prompt, **kwargs):
+        return json.dumps(FEEDBACK if "A student scored" in prompt else QUESTIONS)
+
+    monkeypatch.setattr(quiz, "json_completion", fake_completion)
+    app = FastAPI()
+    app.include_router(quiz.router)
+    return TestClient(app)
+
+
+def test_generate_hides_the_answer_key(client):
+    d = client.post("/quiz/generate", json={"domain": "Python", "count": 2}).json()
+    assert d["quiz_id"] and len(d["questions"]) == 2
+    assert all("correct_index" not in q and "explanation" not in q for q in d["questions"])
+
+
+def test_check_reveals_one_answer(client):
+    quiz_id = client.post("/quiz/generate", json={"domain": "Python", "count": 2}).json()["quiz_id"]
+    r = client.post("/quiz/check", json={"quiz_id": quiz_id, "question_id": 1, "answer": 2}).json()
+    assert r["correct_index"] == 1 and not r["is_correct"] and r["explanation"] == "Basic addition."
+    assert client.post("/quiz/check", json={"quiz_id": quiz_id, "question_id": 9, "answer": 0}).status_code == 404
+    assert client.post("/quiz/check", json={"quiz_id": "nope", "question_id": 1, "answer": 0}).status_code == 404
+
+
+def test_submit_grades_against_the_stored_key(client):
+    quiz_id = client.post("/quiz/generate", json={"domain": "Python", "count": 2}).json()["quiz_id"]
+    d = client.post("/quiz/submit", json={"quiz_id": quiz_id, "answers": [1, 3]}).json()
+    assert (d["correct"], d["total"], d["score"]) == (1, 2, 50)
+    assert [r["is_correct"] for r in d["review"]] == [True, False]
+    # The background task has run by the time TestClient returns
+    feedback = client.get(f"/quiz/feedback/{d['feedback_id']}").json()
+    assert feedback["status"] == "ready" and feedback["feedback"] == "Solid work."
+
+
+def test_submit_requires_a_quiz_id(client):
+    body = {"questions": QUESTIONS["questions"], "answers": [1, 0]}
+    assert client.post("/quiz/submit", json=body).status_code == 400
@@ -0,0 +1,67 @@
+"""Skill taxonomy: role matching, and roles learned from the LLM for resume keywords."""
+import json
+import uuid
+
+import pytest
+
+from app.api import resume
+from app.services import resume_analyzer, skill_taxonomy
+
+RESUME = """
+Skills
+Java, Spring Boot, MySQL
+
+Experience
+- Built REST APIs in Java with Spring Boot serving 10k users
+"""
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    calls = []
+
+    def fake_completion(prompt, **kwargs):
+        calls.append(prompt)
+        return json.dumps({"required_skills": ["Java", "Spring Boot", "Microservices", "Kafka", "Docker"]})
+
+    monkeypatch.setattr(skill_taxonomy, "json_completion", fake_completion)
+    return calls
+
+
+def test_unknown_role_keywords_are_learned_once(llm):
+    role = f"Java Platform Developer {uuid.uuid4().hex[:6]}"
+    first = resume._required_skills(role)
+    assert "Kafka" in first and resume._required_skills(role) == first
+    assert len(llm) == 1
+
+
+def test_resume_digest_lists_missing_keywords_for_a_learned_role(llm):
+    role = f"Java Platform Specialist {uuid.uuid4().hex[:6]}"
+    digest, _ = resume_analyzer.analyze(RESUME, role, resume._required_skills(role))
+    assert "Kafka" in digest.missing_keywords and "Java" in digest.present_keywords
+    assert digest.keyword_score < 100
+
+
+def test_generic_roles_are_asked_once_but_not_learned(llm):
+    skills, source = skill_taxonomy.resolve_role_skills("Senior Engineer")
+    assert source == "llm" and skills
+    skill_taxonomy.resolve_role_skills("senior engineer")
+    assert len(llm) == 1 and skill_taxonomy.match_role("Senior Engineer") is None
+
+
+@pytest.mark.parametrize("role, expected", [
+    ("Senior Backend Developer", "Backend Developer"),
+    ("Data Analyst", "Data Analyst"),
+    ("BI Analyst", "Data Analyst"),
+    ("Financial Analyst", None),
+    ("Marketing Analyst", None),
+    ("HR Business Analyst", None),
+])
+def test_match_role(role, expected):
+    assert skill_taxonomy.match_role(role) == expected
+
+
+def test_generic_aliases_do_not_match_as_substrings(monkeypatch):
+    monkeypatch.setitem(skill_taxonomy._role_aliases, "analyst", "Data Analyst")
+    assert skill_taxonomy.match_role("analyst") == "Data Analyst"
+    assert skill_taxonomy.match_role("Financial Analyst") is None
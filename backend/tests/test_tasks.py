@@ -0,0 +1,56 @@
+"""Background tasks: dedupe of identical submissions and the SSE progress stream."""
+import threading
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import tasks
+from app.core.config import settings
+from app.services.task_service import submit_task
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(tasks.router)
+    return TestClient(app)
+
+
+def _events(client, task_id) -> list[str]:
+    with client.stream("GET", f"/tasks/{task_id}/events") as res:
+        return [line.split(": ", 1)[1] for line in res.iter_lines() if line.startswith("event:")]
+
+
+def test_identical_submissions_share_a_task():
+    release = threading.Event()
+    payload = {"n": uuid.uuid4().hex}
+    first = submit_task("test", payload, lambda report: release.wait(5) and {"ok": True})
+    second = submit_task("test", payload, lambda report: {"ok": False})
+    release.set()
+    assert first.task_id == second.task_id
+
+
+def test_events_stream_until_done(client):
+    def work(report):
+        report("halfway")
+        return {"answer": 42}
+
+    accepted = submit_task("test", {"n": uuid.uuid4().hex}, work)
+    events = _events(client, accepted.task_id)
+    assert events[0] == "progress" and events[-1] == "done"
+
+
+def test_events_stream_ends_at_the_deadline(client, monkeypatch):
+    monkeypatch.setattr(settings, "task_events_max_seconds", 0)
+    release = threading.Event()
+    accepted = submit_task("test", {"n": uuid.uuid4().hex}, lambda report: release.wait(5))
+    try:
+        assert _events(client, accepted.task_id)[-1] == "timeout"
+    finally:
+        release.set()
+
+
+def test_unknown_task_is_404(client):
+    assert client.get("/tasks/nope/events").status_code == 404
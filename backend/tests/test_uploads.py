@@ -0,0 +1,62 @@
+"""Upload limits: DOCX decompression cap and request-body limits enforced while the body streams in."""
+import io
+import zipfile
+
+import pytest
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from app.core.body_limit import BodySizeLimit, MULTIPART_OVERHEAD
+from app.services import text_extraction
+
+
+def _docx(xml: bytes) -> io.BytesIO:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("word/document.xml", xml)
+    buf.seek(0)
+    return buf
+
+
+def test_docx_text_is_extracted():
+    ns = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    xml = f'<w:document xmlns:w="{ns}"><w:body><w:p><w:r><w:t>Python developer</w:t></w:r></w:p></w:body></w:document>'
+    assert text_extraction._docx_text(_docx(xml.encode())) == "Python developer"
+
+
+def test_docx_zip_bomb_is_rejected(monkeypatch):
+    monkeypatch.setattr(text_extraction, "MAX_DOCX_XML_BYTES", 1024)
+    with pytest.raises(text_extraction.ExtractionError, match="too large"):
+        text_extraction._docx_text(_docx(b"<a>" + b"x" * 100_000 + b"</a>"))
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        return {"size": len(await file.read())}
+
+    app.add_middleware(BodySizeLimit, limits={"/upload": lambda: 1024 + MULTIPART_OVERHEAD})
+    return TestClient(app)
+
+
+def test_body_under_the_limit_is_accepted(client):
+    res = client.post("/upload", files={"file": ("cv.txt", b"x" * 1000)})
+    assert res.status_code == 200 and res.json()["size"] == 1000
+
+
+def test_chunked_body_over_the_limit_is_rejected_mid_stream(client):
+    def chunks():
+        for _ in range(200):
+            yield b"x" * 1024
+
+    # A generator body is sent with Transfer-Encoding: chunked, i.e. no Content-Length
+    res = client.post("/upload", content=chunks(), headers={"Content-Type": "multipart/form-data; boundary=b"})
+    assert res.status_code == 413
+
+
+def test_declared_length_over_the_limit_is_rejected_up_front(client):
+    res = client.post("/upload", files={"file": ("cv.txt", b"x" * 200_000)})
+    assert res.status_code == 413
@@ -19,12 +19,21 @@ function getAuthToken() {
   return _authToken;
 }
 
+// Anonymous client id — issued by the backend, scopes per-visitor state (seen questions, resume versions)
+let _clientId = localStorage.getItem('vm_client_id');
+
 // Generic fetch wrapper
 async function apiFetch(path, options = {}) {
   const headers = { 'Content-Type': 'application/json', ...options.headers };
   if (_authToken) headers['Authorization'] = `Bearer ${_authToken}`;
+  if (_clientId) headers['X-Client-Id'] = _clientId;
 
   const res = await fetch(`${API_BASE}${path}`, { ...options, headers });
+  const issued = res.headers.get('X-Client-Id');
+  if (issued && issued !== _clientId) {
+    _clientId = issued;
+    localStorage.setItem('vm_client_id', issued);
+  }
   if (!res.ok) {
     const err = await res.json().catch(() => ({ detail: 'Unknown error' }));
     throw new Error(err.detail || `HTTP ${res.status}`);
@@ -88,11 +97,28 @@ const QuizAPI = {
       body: JSON.stringify({ domain, difficulty, count }),
     }),
 
-  submit: (questions, answers) =>
+  // quizId comes from generate(); the server holds the answer key
+  check: (quizId, questionId, answer) =>
+    apiFetch('/quiz/check', {
+      method: 'POST',
+      body: JSON.stringify({ quiz_id: quizId, question_id: questionId, answer }),
+    }),
+
+  submit: (quizId, answers) =>
     apiFetch('/quiz/submit', {
       method: 'POST',
-      body: JSON.stringify({ questions, answers }),
+      body: JSON.stringify({ quiz_id: quizId, answers }),
     }),
+
+  // AI feedback for a submission (submit returns a local summary first): poll until it is no longer pending
+  feedback: async (feedbackId, interval = 1000, timeout = 30000) => {
+    const deadline = Date.now() + timeout;
+    for (;;) {
+      const f = await apiFetch(`/quiz/feedback/${encodeURIComponent(feedbackId)}`);
+      if (f.status !== 'pending' || Date.now() + interval > deadline) return f;
+      await new Promise((resolve) => setTimeout(resolve, interval));
+    }
+  },
 };
 
 // ── Career ──────────────────────────────